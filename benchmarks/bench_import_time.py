@@ -0,0 +1,90 @@
+"""
+Benchmark the import time of drf_social_oauth2.
+
+Runs ``python -X importtime`` in fresh interpreters, after django.setup(),
+and reports the cumulative import cost of each drf_social_oauth2 module
+along with the slowest third-party imports they pull in.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs N] [--top N] [module ...]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    'drf_social_oauth2.authentication',
+    'drf_social_oauth2.backends',
+    'drf_social_oauth2.views',
+    'drf_social_oauth2.urls',
+]
+
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$')
+
+
+def measure(modules: list[str]) -> list[tuple[str, int, int, int]]:
+    """Import ``modules`` after django.setup() in a fresh interpreter.
+
+    Returns:
+        A list of (module, self_us, cumulative_us, depth) in import order.
+    """
+    code = 'import django; django.setup(); ' + '; '.join(f'import {m}' for m in modules)
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'drf_social_oauth2.test_settings')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative), len(indent) // 2))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters to run')
+    parser.add_argument('--top', type=int, default=10, help='slowest imports to list')
+    args = parser.parse_args()
+
+    # Modules loaded by django.setup() alone are not attributed to the package.
+    baseline = {row[0] for row in measure([])}
+
+    package: dict[str, list[int]] = {}
+    imports: dict[str, list[int]] = {}
+    totals: list[int] = []
+    for _ in range(args.runs):
+        rows = [row for row in measure(args.modules) if row[0] not in baseline]
+        totals.append(sum(row[1] for row in rows))
+        for name, self_us, cumulative, _depth in rows:
+            if name.startswith('drf_social_oauth2'):
+                package.setdefault(name, []).append(cumulative)
+            else:
+                imports.setdefault(name, []).append(self_us)
+
+    print(f'{"drf_social_oauth2 module":<50} {"cumulative ms":>14}')
+    for name, values in sorted(package.items()):
+        print(f'{name:<50} {statistics.median(values) / 1000:>14.1f}')
+
+    print(f'\n{"slowest imports pulled in (self)":<50} {"ms":>14}')
+    slowest = sorted(imports.items(), key=lambda item: -statistics.median(item[1]))
+    for name, values in slowest[:args.top]:
+        print(f'{name:<50} {statistics.median(values) / 1000:>14.1f}')
+
+    print(f'\n{"total import time after django.setup()":<50} {statistics.median(totals) / 1000:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
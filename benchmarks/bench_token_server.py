@@ -0,0 +1,69 @@
+"""
+Benchmark the construction of the convert-token oauthlib stack.
+
+SocialTokenServer used to keep the Django request on the instance, so the
+server, its SocialTokenGrant, the OAuth2Validator, the BearerToken and the
+KeepRequestCore backend had to be built for every request to be safe. The
+request now travels in a context variable, and the stack built once by
+ConvertTokenView.get_oauthlib_core() is shared. This measures the
+construction cost that sharing saves on every request.
+
+Usage:
+    python benchmarks/bench_token_server.py [--number N] [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure(
+        SECRET_KEY='benchmark-secret-key',
+        INSTALLED_APPS=[
+            'django.contrib.auth',
+            'django.contrib.contenttypes',
+            'oauth2_provider',
+            'social_django',
+            'rest_framework',
+            'drf_social_oauth2',
+        ],
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    )
+django.setup()
+
+from drf_social_oauth2.views import ConvertTokenView
+
+
+def build() -> object:
+    server = ConvertTokenView.get_server()
+    return ConvertTokenView.get_oauthlib_backend_class()(server)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000, help='requests per run')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per case')
+    args = parser.parse_args()
+
+    cases = {
+        'build per request': build,
+        'shared instance': ConvertTokenView.get_oauthlib_core,
+    }
+    costs = {}
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=args.number, repeat=args.repeat))
+        costs[name] = best / args.number * 1e6
+        print(f'{name:<20} {costs[name]:>10.2f} us/request')
+
+    saved = costs['build per request'] - costs['shared instance']
+    print(f'{"saved":<20} {saved:>10.2f} us/request')
+
+
+if __name__ == '__main__':
+    main()
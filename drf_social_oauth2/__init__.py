@@ -7,7 +7,10 @@ By using drf-social-oauth2 you can authenticate with major vendors such as Googl
 Instagram, Github, Twitter and a ton more!
 """
 
-from secrets import SystemRandom
+import hmac
+from base64 import urlsafe_b64encode
+from hashlib import sha256
+from secrets import SystemRandom, token_bytes
 from typing import Any
 
 __version__ = '3.2.0'
@@ -15,6 +18,7 @@ __version__ = '3.2.0'
 __all__ = [
     '__version__',
     'generate_token',
+    'generate_fast_token',
     'UNICODE_ASCII_CHARACTER_SET',
 ]
 
@@ -52,3 +56,49 @@ def generate_token(
     token = ''.join(rand.choice(chars) for _ in range(length))
     jwtted_token: str = jwt.encode({'token': token}, secret, algorithm='HS256')
     return jwtted_token
+
+
+def _b64encode(data: bytes) -> bytes:
+    """Encode bytes as unpadded base64url, as required by JWS."""
+    return urlsafe_b64encode(data).rstrip(b'=')
+
+
+# The JOSE header never changes, so it is serialized once. Matches what
+# jwt.encode produces for HS256.
+_JWT_HEADER: bytes = _b64encode(b'{"alg":"HS256","typ":"JWT"}') + b'.'
+
+# (secret, prepared HMAC) pair, rebuilt only when SECRET_KEY changes.
+_jwt_signer: tuple[str, hmac.HMAC] | None = None
+
+
+def _get_jwt_signer() -> hmac.HMAC:
+    """Return an HMAC-SHA256 object keyed with settings.SECRET_KEY."""
+    global _jwt_signer
+    from django.conf import settings
+
+    secret: str = settings.SECRET_KEY
+    if _jwt_signer is None or _jwt_signer[0] != secret:
+        _jwt_signer = (secret, hmac.new(secret.encode('utf-8'), digestmod=sha256))
+    return _jwt_signer[1]
+
+
+def generate_fast_token(request: Any, length: int = 30) -> str:
+    """Generate a non-guessable OAuth JSON Web Token at high throughput.
+
+    Produces the same HS256 token shape as generate_token, verifiable with
+    jwt.decode, but draws entropy in a single secrets.token_bytes call and
+    encodes it with base64url instead of picking characters one by one.
+    The HMAC key and the JOSE header are prepared once and reused.
+
+    Args:
+        request: The HTTP request object (unused but required by oauth2_provider).
+        length: The length of the random token string. Defaults to 30.
+
+    Returns:
+        A JWT-encoded token string.
+    """
+    token = _b64encode(token_bytes((length * 3 + 3) // 4))[:length]
+    signing_input = _JWT_HEADER + _b64encode(b'{"token":"' + token + b'"}')
+    mac = _get_jwt_signer().copy()
+    mac.update(signing_input)
+    return (signing_input + b'.' + _b64encode(mac.digest())).decode('ascii')
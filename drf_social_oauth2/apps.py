@@ -0,0 +1,30 @@
+"""
+Application configuration for drf-social-oauth2.
+"""
+
+from django.apps import AppConfig
+
+
+class DrfSocialOauth2Config(AppConfig):
+    """App config applying the package settings once Django is set up."""
+
+    name = 'drf_social_oauth2'
+    verbose_name = 'DRF Social OAuth2'
+
+    def ready(self) -> None:
+        from django.db.models.signals import post_delete
+        from oauth2_provider.models import get_access_token_model
+
+        from drf_social_oauth2 import token_cache
+        from drf_social_oauth2.settings import (
+            DRFSO2_TOKEN_CACHE_ENABLED,
+            configure_token_generators,
+        )
+
+        configure_token_generators()
+        if DRFSO2_TOKEN_CACHE_ENABLED:
+            post_delete.connect(
+                token_cache.forget_deleted,
+                sender=get_access_token_model(),
+                dispatch_uid='drfso2_token_cache',
+            )
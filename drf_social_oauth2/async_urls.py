@@ -0,0 +1,47 @@
+"""
+URL configuration for the async drf-social-oauth2 views.
+
+A drop-in replacement for drf_social_oauth2.urls, with the same URL names,
+routing the token endpoints to the views of drf_social_oauth2.async_views.
+"""
+
+from django.urls import include, re_path
+from oauth2_provider.views import AuthorizationView, IntrospectTokenView
+
+from drf_social_oauth2.async_views import (
+    AsyncConvertTokenView,
+    AsyncDisconnectBackendView,
+    AsyncInvalidateRefreshTokens,
+    AsyncInvalidateSessions,
+    AsyncRevokeTokenView,
+    AsyncTokenView,
+)
+from drf_social_oauth2.views import JwksView, MetricsView
+
+app_name = 'drf'
+
+urlpatterns = [
+    re_path(r'^authorize/?$', AuthorizationView.as_view(), name='authorize'),
+    re_path(r'^token/?$', AsyncTokenView.as_view(), name='token'),
+    re_path(r'^introspect/?$', IntrospectTokenView.as_view(), name='introspect'),
+    re_path('', include('social_django.urls', namespace='social')),
+    re_path(r'^convert-token/?$', AsyncConvertTokenView.as_view(), name='convert_token'),
+    re_path(r'^revoke-token/?$', AsyncRevokeTokenView.as_view(), name='revoke_token'),
+    re_path(
+        r'^invalidate-sessions/?$',
+        AsyncInvalidateSessions.as_view(),
+        name='invalidate_sessions',
+    ),
+    re_path(
+        r'^invalidate-refresh-tokens/?$',
+        AsyncInvalidateRefreshTokens.as_view(),
+        name='invalidate_refresh_tokens',
+    ),
+    re_path(
+        r'^disconnect-backend/?$',
+        AsyncDisconnectBackendView.as_view(),
+        name='disconnect_backend',
+    ),
+    re_path(r'^\.well-known/jwks\.json$', JwksView.as_view(), name='jwks'),
+    re_path(r'^metrics/?$', MetricsView.as_view(), name='metrics'),
+]
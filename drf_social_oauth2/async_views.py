@@ -0,0 +1,411 @@
+"""
+Async variants of the drf-social-oauth2 views.
+
+Under ASGI, the sync views are run through Django's thread-sensitive
+adapter, which serializes them on a single thread per request. The views in
+this module are native coroutines: database reads and deletes use Django's
+async ORM, and the blocking oauthlib and social-core work (token creation,
+provider calls, revocation) runs in a bounded thread pool of
+DRFSO2_ASYNC_EXECUTOR_WORKERS threads, so one worker process can serve many
+concurrent requests.
+
+Route them with ``drf_social_oauth2.async_urls``, which uses the same URL
+names as ``drf_social_oauth2.urls``:
+    urlpatterns = [
+        path('auth/', include('drf_social_oauth2.async_urls', namespace='drf')),
+    ]
+"""
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from inspect import isawaitable
+from json import loads as json_loads
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AbstractBaseUser
+from django.db import close_old_connections
+from django.http import HttpRequest
+from django.urls import reverse
+from oauth2_provider.models import AccessToken, Application, RefreshToken
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import HTTP_204_NO_CONTENT, HTTP_400_BAD_REQUEST
+from social_core.exceptions import MissingBackend
+from social_django.utils import load_backend
+
+from drf_social_oauth2 import metrics, tracing
+from drf_social_oauth2.oauth2_validators import trusted_client
+from drf_social_oauth2.serializers import (
+    ConvertTokenSerializer,
+    DisconnectBackendSerializer,
+    InvalidateRefreshTokenSerializer,
+    InvalidateSessionsSerializer,
+    RevokeTokenSerializer,
+    get_user_serializer_class,
+)
+from drf_social_oauth2.settings import DRFSO2_ASYNC_EXECUTOR_WORKERS
+from drf_social_oauth2.strategy import load_strategy
+from drf_social_oauth2.views import (
+    ConvertTokenView,
+    DisconnectBackendView,
+    InvalidateRefreshTokens,
+    InvalidateSessions,
+    RevokeTokenView,
+    TokenView,
+    logger,
+    user_token_queryset,
+)
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the thread pool running the blocking work of the async views."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=DRFSO2_ASYNC_EXECUTOR_WORKERS,
+            thread_name_prefix='drfso2-async',
+        )
+    return _executor
+
+
+def _closing_connections(function: Callable) -> Callable:
+    # Pool threads outlive requests, so they drop stale connections the way
+    # Django does at the start and end of each request.
+    @wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        close_old_connections()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return wrapper
+
+
+async def run_blocking(function: Callable, *args: Any, **kwargs: Any) -> Any:
+    """Run blocking code in the bounded executor and await its result.
+
+    Context variables, such as the current trace span, are carried over.
+    """
+    return await sync_to_async(
+        _closing_connections(function),
+        thread_sensitive=False,
+        executor=get_executor(),
+    )(*args, **kwargs)
+
+
+async def aget_application(validated_data: dict[str, Any]) -> Application | None:
+    """Async version of drf_social_oauth2.views.get_application."""
+    client_id: str | None = validated_data.get('client_id')
+
+    if not client_id:
+        return None
+
+    try:
+        return await Application.objects.aget(client_id=client_id)
+    except Application.DoesNotExist:
+        return None
+
+
+class AsyncAPIViewMixin:
+    """Mixin running an APIView's dispatch as a coroutine.
+
+    Authentication, permission and throttling checks may query the database,
+    so they run in the executor; the handler is then awaited. It must be the
+    left-most base class, and every HTTP method handler of the view must be
+    a coroutine function.
+    """
+
+    async def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Response:
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await run_blocking(self.initial, request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncTokenView(AsyncAPIViewMixin, TokenView):
+    """Async variant of TokenView."""
+
+    @metrics.instrument('token')
+    async def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Handle POST request to generate access tokens.
+
+        Args:
+            request: The DRF request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Response containing the access token or error details.
+        """
+        mutable_data = request.data.copy()
+        request._request.POST = request._request.POST.copy()
+        for key, value in mutable_data.items():
+            request._request.POST[key] = value
+
+        try:
+            url, headers, body, status = await run_blocking(
+                self.create_token_response, request._request
+            )
+        except AccessToken.DoesNotExist:
+            return Response(
+                data={
+                    'invalid_grant': 'The access token of your Refresh Token does not exist.'
+                },
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(data=json_loads(body), status=status)
+
+
+class AsyncConvertTokenView(AsyncAPIViewMixin, ConvertTokenView):
+    """Async variant of ConvertTokenView.
+
+    The social provider calls run in the executor, as social-core only
+    offers blocking HTTP requests.
+    """
+
+    async def aget_user(self, access_token: str) -> AbstractBaseUser | None:
+        """Async version of ConvertTokenView.get_user."""
+        token = await user_token_queryset().filter(token=access_token).afirst()
+        return token.user if token else None
+
+    async def aprepare_response(
+        self, data: dict[str, Any], user: AbstractBaseUser | None = None
+    ) -> dict[str, Any]:
+        """Async version of ConvertTokenView.prepare_response."""
+        serializer_class = get_user_serializer_class()
+        if serializer_class is None or 'access_token' not in data:
+            return data
+        user = user or await self.aget_user(data['access_token'])
+        if user:
+            data['user'] = serializer_class(user).data
+        return data
+
+    @metrics.instrument('convert_token')
+    @tracing.traced('AsyncConvertTokenView.post')
+    async def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Handle POST request to convert a social provider token.
+
+        Args:
+            request: The DRF request object containing grant_type, backend,
+                client_id, and token.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Response containing the OAuth2 access token or error details.
+        """
+        if 'client_secret' in request.data:
+            logger.warning(
+                'client_secret is present in the request data. '
+                'Consider removing it for better security.'
+            )
+        serializer = ConvertTokenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        tracing.set_attributes(
+            backend=serializer.validated_data['backend'],
+            client_id=serializer.validated_data['client_id'],
+        )
+
+        application = await aget_application(serializer.validated_data)
+        if not application:
+            return Response(
+                {"detail": "The application for this client_id does not exist."},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        request._request.POST = request._request.POST.copy()
+        request._request.POST['client_secret'] = application.client_secret
+        for key, value in serializer.validated_data.items():
+            request._request.POST[key] = value
+
+        try:
+            with trusted_client(application):
+                url, headers, body, status = await run_blocking(
+                    self.create_token_response, request._request
+                )
+        except Exception as e:
+            return self.token_error_response(e)
+
+        data = await self.aprepare_response(
+            json_loads(body), getattr(request._request, 'token_user', None)
+        )
+        return Response(data, status=status)
+
+
+class AsyncRevokeTokenView(AsyncAPIViewMixin, RevokeTokenView):
+    """Async variant of RevokeTokenView."""
+
+    @metrics.instrument('revoke_token')
+    async def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Handle POST request to revoke a token.
+
+        Args:
+            request: The DRF request object containing client_id.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Response with 204 status on success or error details.
+        """
+        if 'client_secret' in request.data:
+            logger.warning(
+                'client_secret is present in the request data. '
+                'Consider removing it for better security.'
+            )
+
+        auth_header: str = request.META.get('HTTP_AUTHORIZATION', "")
+        auth_header = auth_header.replace('Bearer ', '', 1)
+        serializer = RevokeTokenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        application = await aget_application(serializer.validated_data)
+        if not application:
+            return Response(
+                {"detail": "The application for this client_id does not exist."},
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        request._request.POST = request._request.POST.copy()
+        request._request.POST['client_secret'] = application.client_secret
+        request._request.POST['token'] = auth_header
+        for key, value in serializer.validated_data.items():
+            request._request.POST[key] = value
+
+        # The executor thread runs in a copy of this context.
+        with trusted_client(application):
+            url, headers, body, status = await run_blocking(
+                self.create_revocation_response, request._request
+            )
+        return Response(
+            data=json_loads(body) if body else '', status=status if body else 204
+        )
+
+
+class AsyncInvalidateSessions(AsyncAPIViewMixin, InvalidateSessions):
+    """Async variant of InvalidateSessions."""
+
+    @metrics.instrument('invalidate_sessions')
+    async def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Handle POST request to invalidate all sessions.
+
+        Args:
+            request: The DRF request object containing client_id.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Response with 204 status on success or error details.
+        """
+        serializer = InvalidateSessionsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        client_id: str = serializer.validated_data['client_id']
+
+        try:
+            app = await Application.objects.aget(client_id=client_id)
+        except Application.DoesNotExist:
+            return Response(
+                {
+                    "detail": "The application linked to the provided client_id could not be found."
+                },
+                status=HTTP_400_BAD_REQUEST,
+            )
+        await AccessToken.objects.filter(user=self.get_object(), application=app).adelete()
+
+        return Response({}, status=HTTP_204_NO_CONTENT)
+
+
+class AsyncInvalidateRefreshTokens(AsyncAPIViewMixin, InvalidateRefreshTokens):
+    """Async variant of InvalidateRefreshTokens."""
+
+    @metrics.instrument('invalidate_refresh_tokens')
+    async def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Handle POST request to invalidate all refresh tokens.
+
+        Args:
+            request: The DRF request object containing client_id.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Response with 204 status on success or error details.
+        """
+        serializer = InvalidateRefreshTokenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        client_id: str = serializer.validated_data['client_id']
+
+        try:
+            app = await Application.objects.aget(client_id=client_id)
+        except Application.DoesNotExist:
+            return Response(
+                {
+                    "detail": "The application linked to the provided client_id could not be found."
+                },
+                status=HTTP_400_BAD_REQUEST,
+            )
+        await RefreshToken.objects.filter(user=self.get_object(), application=app).adelete()
+        return Response({}, HTTP_204_NO_CONTENT)
+
+
+class AsyncDisconnectBackendView(AsyncAPIViewMixin, DisconnectBackendView):
+    """Async variant of DisconnectBackendView."""
+
+    @metrics.instrument('disconnect_backend')
+    async def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Handle POST request to disconnect a social backend.
+
+        Args:
+            request: The DRF request object containing backend and association_id.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Response with 204 status on success or error details.
+        """
+        serializer = DisconnectBackendSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        backend_name: str = serializer.validated_data['backend']
+        association_id: int = serializer.validated_data['association_id']
+        strategy = load_strategy(request=request)
+        try:
+            namespace = 'drf'
+            backend = load_backend(
+                strategy, backend_name, reverse(namespace + ":complete", args=(backend_name,))
+            )
+        except MissingBackend:
+            return Response(
+                {"backend": ["Invalid backend."]}, status=HTTP_400_BAD_REQUEST
+            )
+
+        await run_blocking(
+            backend.disconnect,
+            user=self.get_object(),
+            association_id=association_id,
+            **kwargs,
+        )
+        return Response(status=HTTP_204_NO_CONTENT)
@@ -9,17 +9,24 @@ from collections.abc import Callable
 from functools import wraps
 from typing import Any, TypeVar
 
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractBaseUser
 from django.urls import reverse
+from oauth2_provider.contrib.rest_framework import OAuth2Authentication
 from rest_framework import HTTP_HEADER_ENCODING
 from rest_framework.authentication import BaseAuthentication, get_authorization_header
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.request import Request
 from social_core.exceptions import MissingBackend
 from social_core.utils import requests
-from social_django.utils import load_backend, load_strategy
+from social_django.utils import load_backend
 from social_django.views import NAMESPACE
 
+from drf_social_oauth2 import metrics, sliding_expiry, token_cache, tracing
+from drf_social_oauth2.introspection import IntrospectedUser, get_introspection_client
+from drf_social_oauth2.provider_calls import apply_policy
+from drf_social_oauth2.strategy import load_strategy
+
 F = TypeVar('F', bound=Callable[..., Any])
 
 
@@ -98,8 +105,24 @@ class SocialAuthentication(BaseAuthentication):
         Raises:
             AuthenticationFailed: When authentication fails.
         """
-        token: str = kwargs['token']
-        backend_name: str = kwargs['backend']
+        return self.authenticate_credentials(request, kwargs['backend'], kwargs['token'])
+
+    def authenticate_credentials(
+        self, request: Request, backend_name: str, token: str
+    ) -> tuple[AbstractBaseUser, str]:
+        """Authenticate a provider token with its social backend.
+
+        Args:
+            request: The DRF request object.
+            backend_name: The name of the social backend.
+            token: The provider access token.
+
+        Returns:
+            A tuple of (user, token).
+
+        Raises:
+            AuthenticationFailed: When authentication fails.
+        """
         strategy = load_strategy(request=request)
 
         try:
@@ -108,10 +131,16 @@ class SocialAuthentication(BaseAuthentication):
                 backend_name,
                 reverse(f"{NAMESPACE}:complete", args=(backend_name,)),
             )
-            user = backend.do_auth(access_token=token)
+            apply_policy(backend)
+            with (
+                tracing.span('social.do_auth', backend=backend_name),
+                metrics.BACKEND_LATENCY.time(backend=backend_name),
+            ):
+                user = backend.do_auth(access_token=token)
         except MissingBackend:
             raise AuthenticationFailed('Invalid token header. Invalid backend.')
         except requests.HTTPError as e:
+            metrics.PROVIDER_ERRORS.inc(backend=backend_name, error='http')
             raise AuthenticationFailed(e.response.text)
 
         if not user:
@@ -128,3 +157,174 @@ class SocialAuthentication(BaseAuthentication):
             The WWW-Authenticate header value for Bearer authentication.
         """
         return f'Bearer backend realm="{self.www_authenticate_realm}"'
+
+
+class IntrospectionAuthentication(BaseAuthentication):
+    """Authentication for resource servers using remote token introspection.
+
+    Validates tokens issued by drf-social-oauth2 by calling the introspection
+    endpoint of the authorization server, configured with
+    DRFSO2_INTROSPECTION_URL. Results are cached in process, so only the
+    first request with a given token leaves the service. Clients pass the
+    token in the Authorization header:
+        Authorization: Bearer <token>
+
+    Headers in the social format (``Bearer <backend> <token>``) are left to
+    SocialAuthentication, so this class should be listed before it.
+
+    Attributes:
+        www_authenticate_realm: The realm name for WWW-Authenticate header.
+
+    Raises:
+        AuthenticationFailed: When the token is inactive or cannot be
+            introspected.
+    """
+
+    www_authenticate_realm: str = 'api'
+
+    def authenticate(self, request: Request) -> tuple[IntrospectedUser, str] | None:
+        """Authenticate the request by introspecting its bearer token.
+
+        Args:
+            request: The DRF request object.
+
+        Returns:
+            A tuple of (user, token) if authentication succeeds, None if the
+            request does not carry a plain bearer token.
+
+        Raises:
+            AuthenticationFailed: When authentication fails.
+        """
+        auth: list[bytes] = get_authorization_header(request).split()
+        if len(auth) != 2 or auth[0].lower() != b'bearer':
+            return None
+
+        try:
+            token = auth[1].decode(HTTP_HEADER_ENCODING)
+        except UnicodeError:
+            raise AuthenticationFailed(
+                'Invalid token header. Token string should not contain invalid characters.'
+            )
+
+        try:
+            claims = get_introspection_client().introspect(token)
+        except (requests.RequestException, ValueError):
+            raise AuthenticationFailed('Unable to introspect token.')
+
+        if not claims.get('active'):
+            raise AuthenticationFailed('Invalid or expired token.')
+        return IntrospectedUser(claims), token
+
+    def authenticate_header(self, request: Request) -> str:
+        """Return the WWW-Authenticate header value.
+
+        Args:
+            request: The DRF request object.
+
+        Returns:
+            The WWW-Authenticate header value for Bearer authentication.
+        """
+        return f'Bearer realm="{self.www_authenticate_realm}"'
+
+
+class SlidingExpiryAuthentication(OAuth2Authentication):
+    """OAuth2Authentication extending the access tokens it authenticates.
+
+    With DRFSO2_SLIDING_EXPIRY_ENABLED, tokens about to expire are extended
+    by drf_social_oauth2.sliding_expiry, in batched writes. Otherwise it
+    behaves exactly as OAuth2Authentication.
+    """
+
+    def authenticate(self, request: Request) -> tuple[Any, Any] | None:
+        """Authenticate the request and buffer the extension of its token.
+
+        Args:
+            request: The DRF request object.
+
+        Returns:
+            A tuple of (user, access token) if authentication succeeds, None
+            otherwise.
+        """
+        result = super().authenticate(request)
+        if result is not None:
+            sliding_expiry.touch(result[1])
+        return result
+
+
+class HybridAuthentication(SlidingExpiryAuthentication):
+    """Authentication for both local tokens and social provider tokens.
+
+    The Authorization header is classified in a single parse:
+        Authorization: Bearer <token>             (issued by drf-social-oauth2)
+        Authorization: Bearer <backend> <token>   (issued by a social provider)
+
+    Local tokens are resolved from drf_social_oauth2.token_cache, then with
+    the indexed lookup of django-oauth-toolkit, whose result is cached.
+    Only provider tokens are sent to the social backend, as
+    SocialAuthentication does, so clients that converted their token no
+    longer cause outbound calls. Tokens close to expiry are checked against
+    the database, where sliding expiry extends them.
+
+    Raises:
+        AuthenticationFailed: When a provider token is invalid, or the
+            header is malformed.
+    """
+
+    def authenticate(self, request: Request) -> tuple[Any, Any] | None:
+        """Authenticate the request with a local or a provider token.
+
+        Args:
+            request: The DRF request object.
+
+        Returns:
+            A tuple of (user, token) if authentication succeeds, None if the
+            request carries no bearer token or an unknown local token.
+
+        Raises:
+            AuthenticationFailed: When authentication fails.
+        """
+        auth: list[bytes] = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != b'bearer':
+            return None
+        if len(auth) == 1:
+            raise AuthenticationFailed('Invalid token header. No credentials provided.')
+        if len(auth) > 3:
+            raise AuthenticationFailed(
+                'Invalid token header. Token string should not contain spaces.'
+            )
+        try:
+            credentials = [part.decode(HTTP_HEADER_ENCODING) for part in auth[1:]]
+        except UnicodeError:
+            raise AuthenticationFailed(
+                'Invalid token header. Token string should not contain invalid characters.'
+            )
+
+        if len(credentials) == 2:
+            return SocialAuthentication().authenticate_credentials(request, *credentials)
+        return self.authenticate_local(request, credentials[0])
+
+    def authenticate_local(self, request: Request, token: str) -> tuple[Any, Any] | None:
+        """Authenticate a token issued by drf-social-oauth2.
+
+        Args:
+            request: The DRF request object.
+            token: The access token.
+
+        Returns:
+            A tuple of (user, token record or AccessToken), or None if the
+            token is unknown or expired.
+        """
+        record = token_cache.get(token)
+        if (
+            record is not None
+            and record.user_id is not None
+            and not sliding_expiry.is_due(record.expires)
+        ):
+            user = get_user_model()._default_manager.filter(pk=record.user_id).first()
+            if user is not None:
+                return user, record
+
+        result = super().authenticate(request)
+        if result is not None:
+            token_cache.fill(result[1])
+        return result
@@ -12,12 +12,38 @@ from social_core.backends.google import GooglePlusAuth
 from social_core.backends.linkedin import LinkedinOpenIdConnect
 from social_core.backends.oauth import BaseOAuth2
 
+from drf_social_oauth2 import tracing, user_data_cache
 from drf_social_oauth2.settings import (
     DRFSO2_PROPRIETARY_BACKEND_NAME,
     DRFSO2_URL_NAMESPACE,
 )
 
 
+class LazyReverse:
+    """Descriptor resolving a URL name on first access.
+
+    Calling reverse() in a class body loads the whole URLconf as soon as
+    the module is imported. This defers the lookup until the attribute is
+    read and caches the result.
+
+    Args:
+        view_name: The URL name to reverse, without namespace.
+    """
+
+    def __init__(self, view_name: str) -> None:
+        self.view_name = view_name
+        self.url: str | None = None
+
+    def __get__(self, instance: Any, owner: type | None = None) -> str:
+        if self.url is None:
+            self.url = reverse(
+                f'{DRFSO2_URL_NAMESPACE}:{self.view_name}'
+                if DRFSO2_URL_NAMESPACE
+                else self.view_name
+            )
+        return self.url
+
+
 class DjangoOAuth2(BaseOAuth2):
     """Default OAuth2 authentication backend used by this package.
 
@@ -31,12 +57,8 @@ class DjangoOAuth2(BaseOAuth2):
     """
 
     name: str = DRFSO2_PROPRIETARY_BACKEND_NAME
-    AUTHORIZATION_URL: str = reverse(
-        f'{DRFSO2_URL_NAMESPACE}:authorize' if DRFSO2_URL_NAMESPACE else 'authorize'
-    )
-    ACCESS_TOKEN_URL: str = reverse(
-        f'{DRFSO2_URL_NAMESPACE}:token' if DRFSO2_URL_NAMESPACE else 'token'
-    )
+    AUTHORIZATION_URL = LazyReverse('authorize')
+    ACCESS_TOKEN_URL = LazyReverse('token')
 
 
 class GoogleIdentityBackend(GooglePlusAuth):
@@ -51,6 +73,7 @@ class GoogleIdentityBackend(GooglePlusAuth):
 
     name: str = "google-identity"
 
+    @user_data_cache.cached
     def user_data(
         self, access_token: str, *args: Any, **kwargs: Any
     ) -> dict[str, Any]:
@@ -64,10 +87,12 @@ class GoogleIdentityBackend(GooglePlusAuth):
         Returns:
             Dictionary containing user information from Google.
         """
-        response: dict[str, Any] = self.get_json(
-            "https://www.googleapis.com/oauth2/v3/tokeninfo",
-            params={"id_token": access_token},
-        )
+        with tracing.span('social.user_data', backend=self.name):
+            response: dict[str, Any] = self.get_json(
+                "https://www.googleapis.com/oauth2/v3/tokeninfo",
+                params={"id_token": access_token},
+                headers=tracing.inject_headers(),
+            )
         self.process_error(response)
         return response
 
@@ -78,6 +103,7 @@ class LinkedInOpenIDUserInfo(LinkedinOpenIdConnect):
     Fetches user information from LinkedIn's userinfo endpoint.
     """
 
+    @user_data_cache.cached
     def user_data(
         self, access_token: str, *args: Any, **kwargs: Any
     ) -> dict[str, Any]:
@@ -91,10 +117,13 @@ class LinkedInOpenIDUserInfo(LinkedinOpenIdConnect):
         Returns:
             Dictionary containing user information from LinkedIn.
         """
-        response: dict[str, Any] = self.get_json(
-            "https://api.linkedin.com/v2/userinfo",
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
+        with tracing.span('social.user_data', backend=self.name):
+            response: dict[str, Any] = self.get_json(
+                "https://api.linkedin.com/v2/userinfo",
+                headers=tracing.inject_headers(
+                    {"Authorization": f"Bearer {access_token}"}
+                ),
+            )
         self.process_error(response)
         return response
 
@@ -0,0 +1,177 @@
+"""
+Per-backend concurrency limits for social provider calls.
+
+A spike of convert-token requests for one slow provider can tie up every
+worker thread. A bulkhead caps the concurrent ``do_auth`` calls of each
+backend, per process with a semaphore and, optionally, per node with a
+counter in a Django cache shared by the processes of the node. A request
+that finds the backend at its limit waits up to the queue timeout for a
+slot, then fails fast with 'temporarily_unavailable', so other backends and
+endpoints keep their capacity.
+
+Example configuration in settings.py:
+    DRFSO2_BULKHEAD_ENABLED = True
+    DRFSO2_BULKHEAD_MAX_CONCURRENT = 8
+    DRFSO2_BULKHEAD_BACKENDS = {
+        'linkedin-openidconnect': {'max_concurrent': 2, 'node_max_concurrent': 6},
+    }
+"""
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from typing import Any
+
+from django.core.cache import caches
+
+from drf_social_oauth2.settings import (
+    DRFSO2_BULKHEAD_BACKENDS,
+    DRFSO2_BULKHEAD_CACHE,
+    DRFSO2_BULKHEAD_ENABLED,
+    DRFSO2_BULKHEAD_LEASE_SECONDS,
+    DRFSO2_BULKHEAD_MAX_CONCURRENT,
+    DRFSO2_BULKHEAD_NODE_MAX_CONCURRENT,
+    DRFSO2_BULKHEAD_QUEUE_TIMEOUT,
+)
+
+log = logging.getLogger(__name__)
+
+# Upper bound of the pause between attempts to take a node slot.
+POLL_INTERVAL: float = 0.02
+
+
+class BulkheadFullError(Exception):
+    """Raised when no slot frees up within the queue timeout."""
+
+    def __init__(self, backend: str) -> None:
+        super().__init__(f"Too many concurrent calls to backend '{backend}'.")
+        self.backend = backend
+
+
+class Bulkhead:
+    """Concurrency limit for the provider calls of one backend.
+
+    Args:
+        backend: The social backend name.
+        max_concurrent: Concurrent calls allowed per process.
+        queue_timeout: Seconds a call may wait for a free slot.
+        node_max_concurrent: Concurrent calls allowed across the processes
+            sharing ``cache``. None disables the node limit.
+        cache: Alias of the Django cache holding the node counter.
+        lease_seconds: Lifetime of the node counter, renewed whenever a
+            slot is taken, which bounds how long slots leaked by killed
+            processes stay taken.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        max_concurrent: int = 10,
+        queue_timeout: float = 0.5,
+        node_max_concurrent: int | None = None,
+        cache: str = 'default',
+        lease_seconds: int = 300,
+    ) -> None:
+        self.backend = backend
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self.node_max_concurrent = node_max_concurrent
+        self.cache = caches[cache]
+        self.lease_seconds = lease_seconds
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._key = f'drfso2:bulkhead:{backend}'
+
+    @contextmanager
+    def limit(self) -> Iterator[None]:
+        """Run a provider call in a slot of the bulkhead.
+
+        Raises:
+            BulkheadFullError: If no slot frees up within the queue timeout.
+        """
+        deadline = time.monotonic() + self.queue_timeout
+        if not self._semaphore.acquire(timeout=self.queue_timeout):
+            raise BulkheadFullError(self.backend)
+        try:
+            if self.node_max_concurrent is None:
+                yield
+                return
+            self._acquire_node_slot(deadline)
+            try:
+                yield
+            finally:
+                self._release_node_slot()
+        finally:
+            self._semaphore.release()
+
+    def _acquire_node_slot(self, deadline: float) -> None:
+        while True:
+            self.cache.add(self._key, 0, timeout=self.lease_seconds)
+            try:
+                taken = self.cache.incr(self._key)
+            except ValueError:
+                # The counter expired between add() and incr(): retry at once.
+                taken = None
+            if taken is not None:
+                if taken <= self.node_max_concurrent:
+                    # add() only sets the lifetime of a new counter. Renew it,
+                    # so a counter in use does not expire and restart from 0
+                    # while slots are taken.
+                    self.cache.touch(self._key, self.lease_seconds)
+                    return
+                self._release_node_slot()
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise BulkheadFullError(self.backend)
+            if taken is not None:
+                time.sleep(min(remaining, random.uniform(POLL_INTERVAL / 2, POLL_INTERVAL)))
+
+    def _release_node_slot(self) -> None:
+        try:
+            taken = self.cache.decr(self._key)
+        except ValueError:
+            # The counter expired, taking the slot with it.
+            return
+        if taken < 0:
+            # The slot was taken on a counter that has since expired, and the
+            # new one never counted it. Undo the decrement rather than let a
+            # negative count admit extra calls.
+            self.cache.incr(self._key)
+
+
+_bulkheads: dict[str, Bulkhead] = {}
+_bulkheads_lock = threading.Lock()
+
+
+def get_bulkhead(backend: str) -> Bulkhead:
+    """Return the bulkhead of a backend, built from settings."""
+    bulkhead = _bulkheads.get(backend)
+    if bulkhead is None:
+        options: dict[str, Any] = {
+            'max_concurrent': DRFSO2_BULKHEAD_MAX_CONCURRENT,
+            'queue_timeout': DRFSO2_BULKHEAD_QUEUE_TIMEOUT,
+            'node_max_concurrent': DRFSO2_BULKHEAD_NODE_MAX_CONCURRENT,
+            'cache': DRFSO2_BULKHEAD_CACHE,
+            'lease_seconds': DRFSO2_BULKHEAD_LEASE_SECONDS,
+        }
+        options.update(DRFSO2_BULKHEAD_BACKENDS.get(backend, {}))
+        # Threads racing here must end up sharing one semaphore.
+        with _bulkheads_lock:
+            bulkhead = _bulkheads.setdefault(backend, Bulkhead(backend, **options))
+    return bulkhead
+
+
+def limit(backend: str) -> Any:
+    """Return a context manager limiting the concurrent calls to ``backend``.
+
+    A no-op context manager is returned when bulkheads are disabled.
+
+    Raises:
+        BulkheadFullError: On entering, if no slot frees up in time.
+    """
+    if not DRFSO2_BULKHEAD_ENABLED:
+        return nullcontext()
+    return get_bulkhead(backend).limit()
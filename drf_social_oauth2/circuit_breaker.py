@@ -0,0 +1,225 @@
+"""
+Per-backend circuit breaker for social provider calls.
+
+When a provider degrades, every convert-token request for it would wait for a
+timeout while holding a worker. The circuit breaker counts failed and slow
+provider calls per backend in Django's cache, so the state is shared by every
+worker using that cache. Once the failure rate crosses the threshold the
+circuit opens and calls fail fast. After a cool-down a single probe call is
+let through (half-open); its outcome closes or re-opens the circuit.
+
+Example configuration in settings.py:
+    DRFSO2_CIRCUIT_BREAKER_ENABLED = True
+    DRFSO2_CIRCUIT_BREAKER_BACKENDS = {
+        'linkedin-openidconnect': {'slow_call_seconds': 2},
+    }
+"""
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from typing import Any
+
+from django.core.cache import caches
+from social_core.exceptions import AuthFailed
+from social_core.utils import requests
+
+from drf_social_oauth2.settings import (
+    DRFSO2_CIRCUIT_BREAKER_BACKENDS,
+    DRFSO2_CIRCUIT_BREAKER_CACHE,
+    DRFSO2_CIRCUIT_BREAKER_ENABLED,
+    DRFSO2_CIRCUIT_BREAKER_FAILURE_RATE,
+    DRFSO2_CIRCUIT_BREAKER_MINIMUM_CALLS,
+    DRFSO2_CIRCUIT_BREAKER_OPEN_SECONDS,
+    DRFSO2_CIRCUIT_BREAKER_SLOW_CALL_SECONDS,
+    DRFSO2_CIRCUIT_BREAKER_WINDOW_SECONDS,
+)
+
+log = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, backend: str) -> None:
+        super().__init__(f"Circuit for backend '{backend}' is open.")
+        self.backend = backend
+
+
+def is_failure(exception: BaseException) -> bool:
+    """Return True if an exception means the provider is unhealthy.
+
+    Connection errors, timeouts and 5xx responses count as failures; 4xx
+    responses and social auth errors are caused by the request, not by the
+    provider.
+    """
+    if isinstance(exception, AuthFailed):
+        # social-core turns connection errors into AuthFailed.
+        exception = exception.__context__
+    if isinstance(exception, requests.HTTPError):
+        response = exception.response
+        return response is None or response.status_code >= 500
+    return isinstance(exception, requests.RequestException)
+
+
+class CircuitBreaker:
+    """Failure-rate and latency based circuit breaker for one backend.
+
+    Calls are counted in fixed windows of ``window_seconds``; the failure
+    rate is computed over the current and the previous window.
+
+    Args:
+        backend: The social backend name.
+        failure_rate: Failure ratio, between 0 and 1, that opens the circuit.
+        minimum_calls: Calls needed in the window before the rate is used.
+        slow_call_seconds: Calls slower than this count as failures.
+        window_seconds: Length of a counting window.
+        open_seconds: Time the circuit stays open before a probe is allowed.
+        cache: Alias of the Django cache holding the shared state.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        failure_rate: float = 0.5,
+        minimum_calls: int = 20,
+        slow_call_seconds: float = 5.0,
+        window_seconds: int = 60,
+        open_seconds: int = 30,
+        cache: str = 'default',
+    ) -> None:
+        self.backend = backend
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.cache = caches[cache]
+        self._prefix = f'drfso2:circuit:{backend}'
+
+    @property
+    def state(self) -> str:
+        """Return 'closed', 'open' or 'half-open'."""
+        open_until = self.cache.get(f'{self._prefix}:open_until')
+        if open_until is None:
+            return 'closed'
+        return 'open' if time.time() < open_until else 'half-open'
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Run a provider call through the circuit.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a
+                probe already running.
+        """
+        probe = self._before_call()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self._record(not is_failure(e), time.monotonic() - started, probe)
+            raise
+        self._record(True, time.monotonic() - started, probe)
+
+    def _before_call(self) -> bool:
+        """Check the circuit, returning True if the call is a probe."""
+        open_until = self.cache.get(f'{self._prefix}:open_until')
+        if open_until is None:
+            return False
+        # The probe lock expires on its own should the probing worker die.
+        if time.time() >= open_until and self.cache.add(
+            f'{self._prefix}:probe', True, timeout=max(self.open_seconds, 1)
+        ):
+            log.info("Circuit for backend '%s' is half-open, probing.", self.backend)
+            return True
+        raise CircuitOpenError(self.backend)
+
+    def _record(self, success: bool, duration: float, probe: bool) -> None:
+        failed = not success or duration >= self.slow_call_seconds
+        if probe:
+            if failed:
+                self._trip()
+            else:
+                self._close()
+            return
+
+        window = int(time.time() // self.window_seconds)
+        calls = self._incr(f'{self._prefix}:{window}:calls')
+        failures = self._incr(f'{self._prefix}:{window}:failures', int(failed))
+
+        previous = self.cache.get_many([
+            f'{self._prefix}:{window - 1}:calls',
+            f'{self._prefix}:{window - 1}:failures',
+        ])
+        calls += previous.get(f'{self._prefix}:{window - 1}:calls', 0)
+        failures += previous.get(f'{self._prefix}:{window - 1}:failures', 0)
+
+        if failed and calls >= self.minimum_calls and failures / calls >= self.failure_rate:
+            self._trip()
+
+    def _incr(self, key: str, delta: int = 1) -> int:
+        # Keys outlive the window so the previous one can still be read.
+        if self.cache.add(key, delta, timeout=self.window_seconds * 2):
+            return delta
+        try:
+            return self.cache.incr(key, delta)
+        except ValueError:
+            # Expired between add() and incr().
+            self.cache.set(key, delta, timeout=self.window_seconds * 2)
+            return delta
+
+    def _trip(self) -> None:
+        log.warning("Opening circuit for backend '%s'.", self.backend)
+        self.cache.set(
+            f'{self._prefix}:open_until', time.time() + self.open_seconds, timeout=None
+        )
+        self.cache.delete(f'{self._prefix}:probe')
+
+    def _close(self) -> None:
+        log.info("Closing circuit for backend '%s'.", self.backend)
+        window = int(time.time() // self.window_seconds)
+        self.cache.delete_many([
+            f'{self._prefix}:open_until',
+            f'{self._prefix}:probe',
+            *(
+                f'{self._prefix}:{w}:{kind}'
+                for w in (window - 1, window)
+                for kind in ('calls', 'failures')
+            ),
+        ])
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(backend: str) -> CircuitBreaker:
+    """Return the circuit breaker of a backend, built from settings."""
+    breaker = _breakers.get(backend)
+    if breaker is None:
+        options: dict[str, Any] = {
+            'failure_rate': DRFSO2_CIRCUIT_BREAKER_FAILURE_RATE,
+            'minimum_calls': DRFSO2_CIRCUIT_BREAKER_MINIMUM_CALLS,
+            'slow_call_seconds': DRFSO2_CIRCUIT_BREAKER_SLOW_CALL_SECONDS,
+            'window_seconds': DRFSO2_CIRCUIT_BREAKER_WINDOW_SECONDS,
+            'open_seconds': DRFSO2_CIRCUIT_BREAKER_OPEN_SECONDS,
+            'cache': DRFSO2_CIRCUIT_BREAKER_CACHE,
+        }
+        options.update(DRFSO2_CIRCUIT_BREAKER_BACKENDS.get(backend, {}))
+        breaker = _breakers[backend] = CircuitBreaker(backend, **options)
+    return breaker
+
+
+def guard(backend: str) -> Any:
+    """Return a context manager guarding a call to ``backend``.
+
+    A no-op context manager is returned when the circuit breaker is
+    disabled.
+
+    Raises:
+        CircuitOpenError: On entering, if the circuit is open.
+    """
+    if not DRFSO2_CIRCUIT_BREAKER_ENABLED:
+        return nullcontext()
+    return get_circuit_breaker(backend).guard()
@@ -0,0 +1,40 @@
+"""
+Functions run in the processes of the password hashing pool.
+
+Worker processes import this module before Django is set up, so it must not
+import models, directly or through other drf_social_oauth2 modules.
+"""
+
+import time
+
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+
+
+def setup_django() -> None:
+    """Set Django up in a worker process.
+
+    Workers are spawned, so they load the settings of the parent from
+    DJANGO_SETTINGS_MODULE.
+    """
+    import django
+
+    django.setup()
+
+
+def check(password: str, encoded: str) -> tuple[bool, bool, float]:
+    """Check a password against its hash.
+
+    Returns:
+        Whether it matches, whether the hash must be updated, and the time
+        the check took.
+    """
+    started = time.perf_counter()
+    valid = check_password(password, encoded)
+    must_update = valid and identify_hasher(encoded).must_update(encoded)
+    return valid, must_update, time.perf_counter() - started
+
+
+def hash_password(password: str) -> tuple[str, float]:
+    """Hash a password, returning the hash and the time hashing took."""
+    started = time.perf_counter()
+    return make_password(password), time.perf_counter() - started
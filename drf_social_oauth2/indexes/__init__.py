@@ -0,0 +1,17 @@
+"""
+Optional indexes for the token queries of drf-social-oauth2.
+
+django-oauth-toolkit only indexes the foreign keys of its token tables one
+column at a time. Add 'drf_social_oauth2.indexes' to INSTALLED_APPS and run
+migrate to create composite and partial indexes matching the queries of
+InvalidateSessions, InvalidateRefreshTokens, the per-user token cap and
+expired-token purges. On PostgreSQL they are created concurrently, without
+locking the token tables against writes. The migration depends on the
+migrations of django-oauth-toolkit 3.4.1, and the app declares the indexes
+on the token models, matching the migration state.
+
+The explain_token_indexes management command prints the plans of these
+queries. Its --check option is only meaningful on PostgreSQL, with
+populated and analyzed tables, as other planners may prefer the
+single-column foreign key indexes.
+"""
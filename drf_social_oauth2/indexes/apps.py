@@ -0,0 +1,26 @@
+"""
+Application configuration for the optional token indexes.
+"""
+
+from importlib import import_module
+
+from django.apps import AppConfig, apps
+
+
+class TokenIndexesConfig(AppConfig):
+    """App config of the optional token indexes. It has no models."""
+
+    name = 'drf_social_oauth2.indexes'
+    label = 'drfso2_indexes'
+    verbose_name = 'DRF Social OAuth2 token indexes'
+
+    def ready(self) -> None:
+        # The migration adds the indexes to the state of the token models.
+        # Declare them on the models too, so that makemigrations does not
+        # propose to drop them from django-oauth-toolkit.
+        migration = import_module(f'{self.name}.migrations.0001_token_indexes')
+        for operation in migration.Migration.operations:
+            meta = apps.get_model(operation.model)._meta
+            if all(index.name != operation.index.name for index in meta.indexes):
+                meta.indexes = [*meta.indexes, operation.index.clone()]
+                meta.original_attrs['indexes'] = meta.indexes
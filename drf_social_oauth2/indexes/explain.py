@@ -0,0 +1,85 @@
+"""
+EXPLAIN plans of the token queries served by the optional indexes.
+"""
+
+from typing import NamedTuple
+
+from django.db import connections, router, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from oauth2_provider.models import get_access_token_model, get_refresh_token_model
+
+
+class QueryPlan(NamedTuple):
+    """The plan of a token query and the index expected to serve it."""
+
+    name: str
+    index: str
+    plan: str
+
+    @property
+    def uses_index(self) -> bool:
+        return self.index in self.plan
+
+
+def token_queries(user_id: int, application_id: int) -> list[tuple[str, str, QuerySet]]:
+    """Return the token queries as (name, expected index, queryset) tuples."""
+    AccessToken = get_access_token_model()
+    RefreshToken = get_refresh_token_model()
+    owned = {'user_id': user_id, 'application_id': application_id}
+    queries = [
+        (
+            'invalidate_sessions',
+            'drfso2_at_user_app_created',
+            AccessToken.objects.filter(**owned),
+        ),
+        (
+            'token_cap_access_tokens',
+            'drfso2_at_user_app_created',
+            AccessToken.objects.filter(**owned).order_by('-created', '-pk'),
+        ),
+        (
+            'purge_expired_access_tokens',
+            'drfso2_at_expires',
+            AccessToken.objects.filter(expires__lt=timezone.now()),
+        ),
+        (
+            'invalidate_refresh_tokens',
+            'drfso2_rt_user_app',
+            RefreshToken.objects.filter(**owned),
+        ),
+    ]
+    connection = connections[router.db_for_read(RefreshToken)]
+    if connection.features.supports_partial_indexes:
+        queries.append(
+            (
+                'token_cap_refresh_tokens',
+                'drfso2_rt_live_user_app',
+                RefreshToken.objects.filter(**owned, revoked__isnull=True).order_by(
+                    '-created', '-pk'
+                ),
+            )
+        )
+    return queries
+
+
+def explain_token_queries(user_id: int = 1, application_id: int = 1) -> list[QueryPlan]:
+    """Return the plans of the token queries.
+
+    PostgreSQL scans small tables sequentially whatever their indexes, so
+    sequential scans are disabled while explaining, to show the index the
+    planner would pick on a large table.
+
+    Args:
+        user_id: User the per-user queries filter on.
+        application_id: Application the per-user queries filter on.
+    """
+    plans = []
+    for name, index, queryset in token_queries(user_id, application_id):
+        with transaction.atomic(using=queryset.db):
+            connection = connections[queryset.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            plans.append(QueryPlan(name, index, queryset.explain()))
+    return plans
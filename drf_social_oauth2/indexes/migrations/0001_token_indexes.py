@@ -0,0 +1,43 @@
+from django.db import migrations, models
+from oauth2_provider.settings import oauth2_settings
+
+from drf_social_oauth2.indexes.operations import AddTokenIndex
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run in a transaction.
+    atomic = False
+
+    # Run after the migrations of django-oauth-toolkit altering the token
+    # tables, so that the columns to index exist in their final form.
+    dependencies = [
+        ('oauth2_provider', '0022_refreshtoken_token_family_index'),
+        migrations.swappable_dependency(oauth2_settings.ACCESS_TOKEN_MODEL),
+        migrations.swappable_dependency(oauth2_settings.REFRESH_TOKEN_MODEL),
+    ]
+
+    operations = [
+        AddTokenIndex(
+            oauth2_settings.ACCESS_TOKEN_MODEL,
+            models.Index(
+                fields=['user', 'application', 'created'],
+                name='drfso2_at_user_app_created',
+            ),
+        ),
+        AddTokenIndex(
+            oauth2_settings.ACCESS_TOKEN_MODEL,
+            models.Index(fields=['expires'], name='drfso2_at_expires'),
+        ),
+        AddTokenIndex(
+            oauth2_settings.REFRESH_TOKEN_MODEL,
+            models.Index(fields=['user', 'application'], name='drfso2_rt_user_app'),
+        ),
+        AddTokenIndex(
+            oauth2_settings.REFRESH_TOKEN_MODEL,
+            models.Index(
+                fields=['user', 'application', 'created'],
+                condition=models.Q(revoked__isnull=True),
+                name='drfso2_rt_live_user_app',
+            ),
+        ),
+    ]
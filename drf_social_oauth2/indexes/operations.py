@@ -0,0 +1,73 @@
+"""
+Migration operation adding an index to a django-oauth-toolkit model.
+"""
+
+from typing import Any
+
+from django.db import models
+from django.db.migrations.operations.base import Operation
+
+
+class AddTokenIndex(Operation):
+    """Create an index on a model of another app.
+
+    Django's AddIndex only targets the models of the migration's own app.
+    The index is added to the state of the model, so that later migrations
+    rebuilding the table, as SQLite does to alter it, recreate the index.
+    On PostgreSQL, outside of a transaction, the index is created and
+    dropped concurrently. Partial indexes are skipped on databases without
+    them.
+
+    Args:
+        model: Label of the model, such as 'oauth2_provider.AccessToken'.
+        index: The index to create.
+    """
+
+    reversible = True
+
+    def __init__(self, model: str, index: models.Index) -> None:
+        self.model = model
+        self.index = index
+
+    def deconstruct(self) -> tuple[str, list[Any], dict[str, Any]]:
+        return self.__class__.__qualname__, [self.model, self.index], {}
+
+    def state_forwards(self, app_label: str, state: Any) -> None:
+        model_app_label, model_name = self.model.split('.')
+        state.add_index(model_app_label, model_name.lower(), self.index)
+
+    def database_forwards(
+        self, app_label: str, schema_editor: Any, from_state: Any, to_state: Any
+    ) -> None:
+        model = to_state.apps.get_model(self.model)
+        if self._applies(schema_editor, model):
+            schema_editor.add_index(model, self.index, **self._options(schema_editor))
+
+    def database_backwards(
+        self, app_label: str, schema_editor: Any, from_state: Any, to_state: Any
+    ) -> None:
+        model = from_state.apps.get_model(self.model)
+        if self._applies(schema_editor, model) and self._exists(schema_editor, model):
+            schema_editor.remove_index(model, self.index, **self._options(schema_editor))
+
+    def describe(self) -> str:
+        return f'Create index {self.index.name} on {self.model}'
+
+    def _applies(self, schema_editor: Any, model: type[models.Model]) -> bool:
+        connection = schema_editor.connection
+        if self.index.condition is not None and not connection.features.supports_partial_indexes:
+            return False
+        return self.allow_migrate_model(connection.alias, model)
+
+    def _exists(self, schema_editor: Any, model: type[models.Model]) -> bool:
+        # Indexes skipped or dropped since cannot be removed.
+        connection = schema_editor.connection
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        return self.index.name in constraints
+
+    def _options(self, schema_editor: Any) -> dict[str, Any]:
+        connection = schema_editor.connection
+        if connection.vendor == 'postgresql' and not connection.in_atomic_block:
+            return {'concurrently': True}
+        return {}
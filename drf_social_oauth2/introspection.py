@@ -0,0 +1,282 @@
+"""
+Token introspection client for drf-social-oauth2 resource servers.
+
+This module provides an RFC 7662 introspection client that downstream services
+can use to validate tokens issued by drf-social-oauth2 without sharing its
+token database. Results are cached in process, bounded by the token expiry.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from functools import cache
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+from social_core.utils import requests
+
+from drf_social_oauth2 import metrics
+from drf_social_oauth2.settings import (
+    DRFSO2_INTROSPECTION_CACHE_MAX_ENTRIES,
+    DRFSO2_INTROSPECTION_CACHE_SECONDS,
+    DRFSO2_INTROSPECTION_CLIENT_ID,
+    DRFSO2_INTROSPECTION_CLIENT_SECRET,
+    DRFSO2_INTROSPECTION_STALE_SECONDS,
+    DRFSO2_INTROSPECTION_TIMEOUT,
+    DRFSO2_INTROSPECTION_TOKEN,
+    DRFSO2_INTROSPECTION_URL,
+)
+
+log = logging.getLogger(__name__)
+
+
+class IntrospectedUser:
+    """Lightweight user built from an introspection response.
+
+    Resource servers usually do not share the user table with the
+    authorization server, so the claims are exposed as attributes instead
+    of being resolved to a local user row.
+
+    Attributes:
+        username: The username reported by the authorization server.
+        client_id: The client the token was issued to.
+        scope: The space separated scopes granted to the token.
+        claims: The full introspection response.
+    """
+
+    is_active: bool = True
+    is_anonymous: bool = False
+    is_authenticated: bool = True
+
+    def __init__(self, claims: dict[str, Any]) -> None:
+        self.claims = claims
+        self.username: str = claims.get('username') or ''
+        self.client_id: str | None = claims.get('client_id')
+        self.scope: str = claims.get('scope') or ''
+        self.pk = self.id = claims.get('sub') or self.username
+
+    def get_username(self) -> str:
+        return self.username
+
+    def __str__(self) -> str:
+        return self.username
+
+
+class _CacheEntry:
+    """A cached introspection response and its freshness window."""
+
+    __slots__ = ('claims', 'fresh_until', 'stale_until')
+
+    def __init__(
+        self, claims: dict[str, Any], fresh_until: float, stale_until: float
+    ) -> None:
+        self.claims = claims
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class _Call:
+    """An in-flight introspection request shared by concurrent callers."""
+
+    __slots__ = ('event', 'claims', 'error')
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.claims: dict[str, Any] | None = None
+        self.error: Exception | None = None
+
+
+class IntrospectionClient:
+    """Caching RFC 7662 introspection client.
+
+    Active responses are cached per token digest for ``cache_seconds``,
+    never past the ``exp`` claim of the token. Concurrent lookups for the
+    same token share a single outbound request. When ``stale_seconds`` is
+    set, an expired entry keeps being served for that long while a single
+    background request refreshes it.
+
+    Args:
+        url: The introspection endpoint of the authorization server.
+        client_id: Client ID used for HTTP Basic authentication.
+        client_secret: Client secret used for HTTP Basic authentication.
+        token: Bearer token with the ``introspection`` scope, used when no
+            client credentials are given.
+        timeout: Timeout in seconds for the introspection request.
+        cache_seconds: Maximum time an active response is cached.
+        stale_seconds: Time an expired entry may be served while it is
+            being revalidated. 0 disables stale-while-revalidate.
+        max_entries: Maximum number of cached tokens.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        client_id: str | None = None,
+        client_secret: str | None = None,
+        token: str | None = None,
+        timeout: float = 5.0,
+        cache_seconds: int = 60,
+        stale_seconds: int = 0,
+        max_entries: int = 10000,
+    ) -> None:
+        self.url = url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token = token
+        self.timeout = timeout
+        self.cache_seconds = cache_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._cache: dict[str, _CacheEntry] = {}
+        self._inflight: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def introspect(self, token: str) -> dict[str, Any]:
+        """Return the introspection response for a token.
+
+        Args:
+            token: The bearer token presented by the client.
+
+        Returns:
+            The introspection response. ``active`` is False for unknown,
+            revoked or expired tokens.
+
+        Raises:
+            requests.RequestException: When the authorization server cannot
+                be reached or answers with an error status.
+        """
+        key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+        now = time.time()
+
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is not None:
+            if now < entry.fresh_until:
+                metrics.CACHE_REQUESTS.inc(cache='introspection', result='hit')
+                return entry.claims
+            if now < entry.stale_until:
+                metrics.CACHE_REQUESTS.inc(cache='introspection', result='stale')
+                self._revalidate(key, token)
+                return entry.claims
+
+        metrics.CACHE_REQUESTS.inc(cache='introspection', result='miss')
+        return self._load(key, token)
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._cache.clear()
+
+    def _load(self, key: str, token: str) -> dict[str, Any]:
+        """Fetch a response, sharing the request with concurrent callers."""
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+
+        if leader:
+            self._run(key, token, call)
+        else:
+            call.event.wait(self.timeout)
+
+        if call.error is not None:
+            raise call.error
+        if call.claims is None:
+            raise requests.Timeout('Timed out waiting for token introspection.')
+        return call.claims
+
+    def _revalidate(self, key: str, token: str) -> None:
+        """Refresh a stale entry in the background unless already running."""
+        with self._lock:
+            if key in self._inflight:
+                return
+            call = self._inflight[key] = _Call()
+
+        threading.Thread(
+            target=self._run,
+            args=(key, token, call),
+            name='drfso2-introspection',
+            daemon=True,
+        ).start()
+
+    def _run(self, key: str, token: str, call: _Call) -> None:
+        try:
+            call.claims = self._fetch(token)
+        except Exception as e:
+            log.debug('Token introspection failed: %s', e)
+            call.error = e
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if call.claims is not None:
+                    self._store(key, call.claims)
+            call.event.set()
+
+    def _fetch(self, token: str) -> dict[str, Any]:
+        """Call the introspection endpoint."""
+        auth = None
+        headers = {}
+        if self.client_id and self.client_secret:
+            auth = (self.client_id, self.client_secret)
+        elif self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+
+        response = requests.post(
+            self.url,
+            data={'token': token, 'token_type_hint': 'access_token'},
+            auth=auth,
+            headers=headers,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _store(self, key: str, claims: dict[str, Any]) -> None:
+        """Cache an active response. Must be called with the lock held."""
+        if not claims.get('active'):
+            self._cache.pop(key, None)
+            return
+
+        now = time.time()
+        expires_at = float(claims.get('exp') or now + self.cache_seconds)
+        fresh_until = min(now + self.cache_seconds, expires_at)
+        if fresh_until <= now:
+            self._cache.pop(key, None)
+            return
+
+        if key not in self._cache and len(self._cache) >= self.max_entries:
+            self._evict(now)
+        stale_until = min(fresh_until + self.stale_seconds, expires_at)
+        self._cache[key] = _CacheEntry(claims, fresh_until, stale_until)
+
+    def _evict(self, now: float) -> None:
+        """Drop unusable entries, then the oldest ones, to make room."""
+        for key in [k for k, e in self._cache.items() if e.stale_until <= now]:
+            del self._cache[key]
+        while len(self._cache) >= self.max_entries:
+            del self._cache[next(iter(self._cache))]
+
+
+@cache
+def get_introspection_client() -> IntrospectionClient:
+    """Return the process-wide introspection client built from settings.
+
+    Raises:
+        ImproperlyConfigured: If DRFSO2_INTROSPECTION_URL is not set.
+    """
+    if not DRFSO2_INTROSPECTION_URL:
+        raise ImproperlyConfigured(
+            'DRFSO2_INTROSPECTION_URL must be set to use IntrospectionAuthentication.'
+        )
+    return IntrospectionClient(
+        DRFSO2_INTROSPECTION_URL,
+        client_id=DRFSO2_INTROSPECTION_CLIENT_ID,
+        client_secret=DRFSO2_INTROSPECTION_CLIENT_SECRET,
+        token=DRFSO2_INTROSPECTION_TOKEN,
+        timeout=DRFSO2_INTROSPECTION_TIMEOUT,
+        cache_seconds=DRFSO2_INTROSPECTION_CACHE_SECONDS,
+        stale_seconds=DRFSO2_INTROSPECTION_STALE_SECONDS,
+        max_entries=DRFSO2_INTROSPECTION_CACHE_MAX_ENTRIES,
+    )
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from oauth2_provider.models import get_application_model
+
+from drf_social_oauth2.settings import (
+    DRFSO2_REFRESH_TOKEN_CHAIN_TAIL,
+    DRFSO2_REFRESH_TOKEN_COMPACTION_BATCH,
+)
+from drf_social_oauth2.token_compaction import compact_refresh_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete the old revoked refresh tokens of rotated chains"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tail",
+            type=int,
+            default=DRFSO2_REFRESH_TOKEN_CHAIN_TAIL,
+            help="Revoked tokens kept per chain for reuse detection",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DRFSO2_REFRESH_TOKEN_COMPACTION_BATCH,
+            help="Maximum tokens deleted by one query",
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=0, help="Seconds to wait between batches"
+        )
+
+    def handle(self, *args, **options):
+        reclaimed = compact_refresh_tokens(
+            options["tail"], options["batch_size"], options["sleep"]
+        )
+        applications = get_application_model().objects.in_bulk(list(reclaimed))
+        for application_id, deleted in reclaimed.most_common():
+            application = applications.get(application_id)
+            name = application.client_id if application else application_id
+            self.stdout.write(f"{name}: {deleted} refresh tokens deleted")
+        self.stdout.write(f"Total: {sum(reclaimed.values())} refresh tokens deleted")
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from drf_social_oauth2.indexes.explain import explain_token_queries
+
+
+class Command(BaseCommand):
+    help = "Print the plans of the token queries served by drf_social_oauth2.indexes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, default=1, help="User id to filter on")
+        parser.add_argument(
+            "--application", type=int, default=1, help="Application id to filter on"
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help=(
+                "Fail if a query does not use its index. Only meaningful on "
+                "PostgreSQL, after ANALYZE on populated tables"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        plans = explain_token_queries(options["user"], options["application"])
+        for plan in plans:
+            self.stdout.write(f"{plan.name} (expects {plan.index}):")
+            self.stdout.write(plan.plan)
+            self.stdout.write("")
+
+        missed = [plan.name for plan in plans if not plan.uses_index]
+        if options["check"] and missed:
+            raise CommandError(
+                f"Queries not using their index: {', '.join(missed)}. "
+                "Is drf_social_oauth2.indexes installed and migrated?"
+            )
@@ -0,0 +1,359 @@
+"""
+Prometheus-style metrics for drf-social-oauth2.
+
+This module keeps per-process counters and histograms for the package
+endpoints, the social backends and the caches, and renders them in the
+Prometheus text exposition format. Metrics are collected only when
+DRFSO2_METRICS_ENABLED is True; otherwise every metric is a no-op object
+and views are left undecorated, so nothing is measured.
+
+Exposed metrics:
+    drfso2_request_duration_seconds{endpoint, status}: Endpoint latency.
+    drfso2_request_db_queries{endpoint}: Database queries per request.
+    drfso2_stage_duration_seconds{endpoint, stage}: Latency of the steps of
+        a request, such as serializer validation or token saving.
+    drfso2_backend_duration_seconds{backend}: Latency of social backend
+        do_auth calls.
+    drfso2_provider_errors_total{backend, error}: Failed provider calls.
+    drfso2_provider_retries_total{backend, kind}: Retried and hedged
+        provider requests.
+    drfso2_cache_requests_total{cache, result}: Cache lookups by result.
+    drfso2_sliding_expiry_extensions_total: Access tokens whose expiry was
+        extended by sliding expiry.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from functools import wraps
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Any
+
+from django.db import connection
+from rest_framework.exceptions import APIException
+
+from drf_social_oauth2.settings import DRFSO2_METRICS_ENABLED
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUERY_BUCKETS: tuple[float, ...] = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'),
+        )
+        for name, value in labels.items()
+    )
+    return '{' + pairs + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Timer:
+    """Context manager observing the elapsed time into a histogram."""
+
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram: 'Histogram', labels: dict[str, str]) -> None:
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> '_Timer':
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.histogram.observe(perf_counter() - self.started, **self.labels)
+
+
+class Metric(ABC):
+    """Base class for labelled metrics."""
+
+    type: str = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}.'
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def expose(self) -> list[str]:
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type}',
+        ]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.extend(self._samples(dict(zip(self.labelnames, key, strict=True)), value))
+        return lines
+
+    @abstractmethod
+    def _samples(self, labels: dict[str, str], value: Any) -> list[str]:
+        """Return the exposition lines of the value of one label set."""
+
+
+class Counter(Metric):
+    """A monotonically increasing counter."""
+
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self, labels: dict[str, str], value: float) -> list[str]:
+        return [f'{self.name}{_format_labels(labels)} {_format_value(value)}']
+
+
+class Histogram(Metric):
+    """A histogram with cumulative buckets, a sum and a count."""
+
+    type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels: Any) -> _Timer:
+        """Return a context manager observing the duration of its block."""
+        return _Timer(self, labels)
+
+    def count(self, **labels: Any) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def _samples(self, labels: dict[str, str], state: list[Any]) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state[0], strict=True):
+            cumulative += count
+            bucket_labels = {**labels, 'le': _format_value(float(bound))}
+            lines.append(f'{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}')
+        lines.append(f'{self.name}_sum{_format_labels(labels)} {_format_value(state[1])}')
+        lines.append(f'{self.name}_count{_format_labels(labels)} {state[2]}')
+        return lines
+
+
+class NoopMetric:
+    """Stand-in for every metric when metrics are disabled."""
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        pass
+
+    def observe(self, value: float, **labels: Any) -> None:
+        pass
+
+    def time(self, **labels: Any) -> AbstractContextManager:
+        return nullcontext()
+
+
+NOOP = NoopMetric()
+
+
+class Registry:
+    """A collection of metrics rendered together.
+
+    Args:
+        enabled: When False, the factories return NOOP and nothing is kept.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._metrics: list[Metric] = []
+
+    def counter(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter | NoopMetric:
+        if not self.enabled:
+            return NOOP
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram | NoopMetric:
+        if not self.enabled:
+            return NOOP
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def expose(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.expose())
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+registry = Registry(enabled=DRFSO2_METRICS_ENABLED)
+
+REQUEST_LATENCY = registry.histogram(
+    'drfso2_request_duration_seconds',
+    'Latency of drf-social-oauth2 endpoints.',
+    ('endpoint', 'status'),
+)
+REQUEST_QUERIES = registry.histogram(
+    'drfso2_request_db_queries',
+    'Database queries executed per request.',
+    ('endpoint',),
+    buckets=QUERY_BUCKETS,
+)
+STAGE_LATENCY = registry.histogram(
+    'drfso2_stage_duration_seconds',
+    'Latency of the steps of a request.',
+    ('endpoint', 'stage'),
+)
+BACKEND_LATENCY = registry.histogram(
+    'drfso2_backend_duration_seconds',
+    'Latency of social backend do_auth calls.',
+    ('backend',),
+)
+PROVIDER_ERRORS = registry.counter(
+    'drfso2_provider_errors_total',
+    'Social provider calls that failed.',
+    ('backend', 'error'),
+)
+PROVIDER_RETRIES = registry.counter(
+    'drfso2_provider_retries_total',
+    'Social provider requests sent again, by kind (retry or hedge).',
+    ('backend', 'kind'),
+)
+CACHE_REQUESTS = registry.counter(
+    'drfso2_cache_requests_total',
+    'Cache lookups by cache and result (hit, stale or miss).',
+    ('cache', 'result'),
+)
+PASSWORD_HASHING_LATENCY = registry.histogram(
+    'drfso2_password_hashing_duration_seconds',
+    'Time password hashing spent waiting for the pool and hashing.',
+    ('stage',),
+)
+PASSWORD_POOL_REJECTIONS = registry.counter(
+    'drfso2_password_pool_rejections_total',
+    'Password checks rejected because the hashing pool was full.',
+)
+SLIDING_EXPIRY_EXTENSIONS = registry.counter(
+    'drfso2_sliding_expiry_extensions_total',
+    'Access tokens whose expiry was extended by sliding expiry.',
+)
+
+
+@contextmanager
+def count_queries() -> Iterator[list[int]]:
+    """Count the queries run on the default database inside the block.
+
+    Yields:
+        A one item list holding the running count.
+    """
+    queries = [0]
+
+    def wrapper(execute: Callable, sql: str, params: Any, many: bool, context: Any) -> Any:
+        queries[0] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield queries
+
+
+def instrument(endpoint: str) -> Callable:
+    """Decorate a view handler to record latency and query counts.
+
+    When metrics are disabled the handler is returned unchanged. Async
+    handlers only record latency, as their queries run in other threads.
+
+    Args:
+        endpoint: The endpoint label, usually the URL name.
+    """
+    def decorator(function: Callable) -> Callable:
+        if not DRFSO2_METRICS_ENABLED:
+            return function
+
+        if iscoroutinefunction(function):
+            @wraps(function)
+            async def async_wrapper(view: Any, request: Any, *args: Any, **kwargs: Any) -> Any:
+                status = '500'
+                started = perf_counter()
+                try:
+                    response = await function(view, request, *args, **kwargs)
+                    status = str(response.status_code)
+                    return response
+                except APIException as e:
+                    status = str(e.status_code)
+                    raise
+                finally:
+                    REQUEST_LATENCY.observe(
+                        perf_counter() - started, endpoint=endpoint, status=status
+                    )
+
+            return async_wrapper
+
+        @wraps(function)
+        def wrapper(view: Any, request: Any, *args: Any, **kwargs: Any) -> Any:
+            status = '500'
+            started = perf_counter()
+            with count_queries() as queries:
+                try:
+                    response = function(view, request, *args, **kwargs)
+                    status = str(response.status_code)
+                    return response
+                except APIException as e:
+                    status = str(e.status_code)
+                    raise
+                finally:
+                    REQUEST_LATENCY.observe(
+                        perf_counter() - started, endpoint=endpoint, status=status
+                    )
+                    REQUEST_QUERIES.observe(queries[0], endpoint=endpoint)
+
+        return wrapper
+
+    return decorator
@@ -10,6 +10,7 @@ from typing import Any
 from django.http import HttpRequest
 from oauth2_provider.settings import oauth2_settings
 
+from drf_social_oauth2 import tracing
 from drf_social_oauth2.oauth2_endpoints import SocialTokenServer
 
 
@@ -40,13 +41,14 @@ class KeepRequestCore(oauth2_settings.OAUTH2_BACKEND_CLASS):
         if not isinstance(self.server, SocialTokenServer):
             raise TypeError("server_class must be an instance of 'SocialTokenServer'")
 
+    @tracing.traced('KeepRequestCore.create_token_response')
     def create_token_response(
         self, request: HttpRequest
     ) -> tuple[str, dict, str, int]:
         """Create a token response while preserving the Django request.
 
         A wrapper method that calls create_token_response on the server_class
-        instance after storing the Django request object.
+        instance with the Django request object made available to it.
 
         Args:
             request: The current django.http.HttpRequest object.
@@ -54,5 +56,5 @@ class KeepRequestCore(oauth2_settings.OAUTH2_BACKEND_CLASS):
         Returns:
             A tuple of (url, headers, body, status).
         """
-        self.server.set_request_object(request)
-        return super().create_token_response(request)
+        with self.server.request_object(request):
+            return super().create_token_response(request)
@@ -6,7 +6,9 @@ social authentication token conversion.
 """
 
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any
 
 from django.http import HttpRequest
@@ -15,10 +17,17 @@ from oauthlib.oauth2.rfc6749.endpoints.base import catch_errors_and_unavailabili
 from oauthlib.oauth2.rfc6749.endpoints.token import TokenEndpoint
 from oauthlib.oauth2.rfc6749.tokens import BearerToken
 
+from drf_social_oauth2 import tracing
 from drf_social_oauth2.oauth2_grants import SocialTokenGrant
 
 log = logging.getLogger(__name__)
 
+# The Django request of the token request being handled. A context variable
+# keeps it apart between threads and tasks sharing one server instance.
+_http_request: ContextVar[HttpRequest | None] = ContextVar(
+    'drfso2_http_request', default=None
+)
+
 
 class SocialTokenServer(TokenEndpoint):
     """OAuth2 token endpoint for social authentication token conversion.
@@ -26,8 +35,11 @@ class SocialTokenServer(TokenEndpoint):
     This endpoint handles the conversion of social provider tokens to
     OAuth2 access tokens. Use this with the KeepRequestCore backend class.
 
+    The server keeps no per-request state, so a single instance, with its
+    grant, validator and token handler, can be shared by all requests and
+    threads. The Django request is passed through a context variable.
+
     Attributes:
-        _params: Internal dictionary for storing request parameters.
         request_validator: The OAuth2 request validator instance.
     """
 
@@ -49,7 +61,6 @@ class SocialTokenServer(TokenEndpoint):
             refresh_token_generator: A function to generate a refresh token.
             **kwargs: Extra parameters passed to endpoint constructors.
         """
-        self._params: dict[str, Any] = {}
         self.request_validator = request_validator
         refresh_grant = SocialTokenGrant(request_validator)
         bearer = BearerToken(
@@ -66,10 +77,9 @@ class SocialTokenServer(TokenEndpoint):
         )
 
     def set_request_object(self, request: HttpRequest) -> None:
-        """Store the Django request object for later use.
+        """Store the Django request object for the current context.
 
-        This should be called by the KeepRequestCore backend class before
-        calling create_token_response.
+        Prefer the request_object() context manager, which also clears it.
 
         Args:
             request: The Django HttpRequest object.
@@ -79,19 +89,43 @@ class SocialTokenServer(TokenEndpoint):
         """
         if not isinstance(request, HttpRequest):
             raise TypeError("request must be an instance of 'django.http.HttpRequest'")
-        self._params['http_request'] = request
+        _http_request.set(request)
 
     def pop_request_object(self) -> HttpRequest | None:
-        """Retrieve and remove the stored Django request object.
+        """Retrieve and clear the Django request object of the current context.
 
         This is called internally by create_token_response to fetch the
-        Django request object and clean up the class instance.
+        Django request object.
 
         Returns:
             The stored HttpRequest object, or None if not set.
         """
-        return self._params.pop('http_request', None)
+        request = _http_request.get()
+        _http_request.set(None)
+        return request
+
+    @contextmanager
+    def request_object(self, request: HttpRequest) -> Iterator[None]:
+        """Make the Django request available to create_token_response.
+
+        This is used by the KeepRequestCore backend class around the call
+        to create_token_response.
+
+        Args:
+            request: The Django HttpRequest object.
+
+        Raises:
+            TypeError: If request is not a Django HttpRequest instance.
+        """
+        if not isinstance(request, HttpRequest):
+            raise TypeError("request must be an instance of 'django.http.HttpRequest'")
+        token = _http_request.set(request)
+        try:
+            yield
+        finally:
+            _http_request.reset(token)
 
+    @tracing.traced('SocialTokenServer.create_token_response')
     @catch_errors_and_unavailability
     def create_token_response(
         self,
@@ -6,6 +6,8 @@ social authentication token conversion.
 """
 
 from logging import getLogger
+from time import perf_counter
+from typing import Any
 
 from django.urls import reverse
 from oauthlib.common import Request
@@ -13,10 +15,13 @@ from oauthlib.oauth2.rfc6749 import errors
 from oauthlib.oauth2.rfc6749.grant_types.refresh_token import RefreshTokenGrant
 from social_core.exceptions import MissingBackend, SocialAuthBaseException
 from social_core.utils import requests
-from social_django.utils import load_backend, load_strategy
+from social_django.utils import load_backend
 from social_django.views import NAMESPACE
 
+from drf_social_oauth2 import bulkhead, circuit_breaker, metrics, tracing
+from drf_social_oauth2.provider_calls import apply_policy
 from drf_social_oauth2.settings import DRFSO2_URL_NAMESPACE
+from drf_social_oauth2.strategy import load_strategy
 
 log = getLogger(__name__)
 
@@ -31,6 +36,52 @@ class SocialTokenGrant(RefreshTokenGrant):
         RFC 6749 Section 6: https://tools.ietf.org/html/rfc6749#section-6
     """
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        if metrics.registry.enabled:
+            self.register_token_modifier(self._mark_save_token)
+
+    @staticmethod
+    def _mark_save_token(
+        token: dict[str, Any], token_handler: Any, request: Request
+    ) -> dict[str, Any]:
+        """Token modifier recording when oauthlib is about to save the token."""
+        request.save_token_started = perf_counter()
+        return token
+
+    def create_token_response(
+        self, request: Request, token_handler: Any
+    ) -> tuple[dict[str, str], str, int]:
+        """Create the token response, timing the token save when measured.
+
+        Args:
+            request: The oauthlib Request object.
+            token_handler: The token handler, e.g. a BearerToken instance.
+
+        Returns:
+            A tuple of (headers, body, status).
+        """
+        response = super().create_token_response(request, token_handler)
+        started = getattr(request, 'save_token_started', None)
+        if started is not None:
+            metrics.STAGE_LATENCY.observe(
+                perf_counter() - started, endpoint='convert_token', stage='save_token'
+            )
+        return response
+
+    @staticmethod
+    def _temporarily_unavailable(
+        request: Request, error: str
+    ) -> errors.TemporarilyUnavailableError:
+        """Build the 503 error of a backend that is not called, counting it."""
+        metrics.PROVIDER_ERRORS.inc(backend=request.backend, error=error)
+        return errors.TemporarilyUnavailableError(
+            description=f'The {request.backend} backend is temporarily unavailable.',
+            status_code=503,
+            request=request,
+        )
+
+    @tracing.traced('SocialTokenGrant.validate_token_request')
     def validate_token_request(self, request: Request) -> None:
         """Validate the token conversion request.
 
@@ -53,10 +104,13 @@ class SocialTokenGrant(RefreshTokenGrant):
             InvalidClientError: If client authentication fails.
             InvalidGrantError: If user credentials are invalid or user is inactive.
             AccessDeniedError: If social authentication fails.
+            TemporarilyUnavailableError: If the backend's circuit is open or
+                too many calls to it are in progress.
         """
         # Set defaults to avoid AttributeError later
         request._params.setdefault("backend", None)
         request._params.setdefault("client_secret", None)
+        tracing.set_attributes(backend=request.backend, client_id=request.client_id)
 
         if request.grant_type != 'convert_token':
             raise errors.UnsupportedGrantTypeError(request=request)
@@ -115,15 +169,32 @@ class SocialTokenGrant(RefreshTokenGrant):
                 description='Invalid backend parameter.', request=request
             )
 
+        apply_policy(backend)
+
         # Authenticate with the social backend
         try:
-            user = backend.do_auth(access_token=request.token)
+            with (
+                bulkhead.limit(request.backend),
+                circuit_breaker.guard(request.backend),
+                tracing.span('social.do_auth', backend=request.backend),
+                metrics.BACKEND_LATENCY.time(backend=request.backend),
+            ):
+                user = backend.do_auth(access_token=request.token)
+        except bulkhead.BulkheadFullError:
+            raise self._temporarily_unavailable(request, 'bulkhead_full')
+        except circuit_breaker.CircuitOpenError:
+            raise self._temporarily_unavailable(request, 'circuit_open')
         except requests.HTTPError as e:
+            metrics.PROVIDER_ERRORS.inc(backend=request.backend, error='http')
             raise errors.InvalidRequestError(
                 description=f"Backend responded with HTTP{e.response.status_code}: {e.response.text}.",
                 request=request,
             )
+        except requests.RequestException:
+            metrics.PROVIDER_ERRORS.inc(backend=request.backend, error='connection')
+            raise
         except SocialAuthBaseException as e:
+            metrics.PROVIDER_ERRORS.inc(backend=request.backend, error='auth')
             raise errors.AccessDeniedError(description=str(e), request=request)
 
         if not user:
@@ -135,4 +206,8 @@ class SocialTokenGrant(RefreshTokenGrant):
             raise errors.InvalidGrantError('User inactive or deleted.', request=request)
 
         request.user = user
+        django_request = getattr(request, 'django_request', None)
+        if django_request is not None:
+            # Lets the view build the user payload without loading it again.
+            django_request.token_user = user
         log.debug('Authorizing access to user %r.', request.user)
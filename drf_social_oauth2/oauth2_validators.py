@@ -0,0 +1,175 @@
+"""
+OAuth2 request validators for drf-social-oauth2.
+
+ConvertTokenView and RevokeTokenView identify the client by the client_id
+of the request body and load its Application themselves, then used to pass
+the stored client_secret to oauthlib. With django-oauth-toolkit's hashed
+secrets, authenticating the client then ran the password hasher on every
+request, only to compare the stored hash with itself.
+
+TrustedClientValidator authenticates the client with the Application the
+view loaded, when DRFSO2_TRUST_LOADED_CLIENT is True, and falls back to the
+configured validator otherwise.
+
+PasswordPoolValidator hashes the passwords of the password grant in the
+pool of drf_social_oauth2.password_hashing.
+
+Both derive from TokenCapValidator, which enforces the cap of
+drf_social_oauth2.token_cap on the tokens they save, and TokenCacheValidator,
+which writes them to drf_social_oauth2.token_cache.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+from typing import Any
+
+from django.utils import timezone
+from oauth2_provider.models import Application
+from oauth2_provider.settings import oauth2_settings
+from oauthlib.common import Request
+from oauthlib.oauth2.rfc6749 import errors
+
+from drf_social_oauth2 import password_hashing, token_cache, token_cap
+from drf_social_oauth2.settings import DRFSO2_TRUST_LOADED_CLIENT
+
+# The application loaded by the view handling the current request.
+_trusted_client: ContextVar[Application | None] = ContextVar(
+    'drfso2_trusted_client', default=None
+)
+
+
+@contextmanager
+def trusted_client(application: Application) -> Iterator[None]:
+    """Authenticate ``application`` without its secret inside the block.
+
+    Views call this around the oauthlib call, once they have loaded the
+    application from the client_id of the request. It does nothing when
+    DRFSO2_TRUST_LOADED_CLIENT is False.
+
+    Args:
+        application: The application loaded by the view.
+    """
+    if not DRFSO2_TRUST_LOADED_CLIENT:
+        yield
+        return
+    token = _trusted_client.set(application)
+    try:
+        yield
+    finally:
+        _trusted_client.reset(token)
+
+
+class TokenCacheValidator(oauth2_settings.OAUTH2_VALIDATOR_CLASS):
+    """Validator writing the access tokens it saves to the token cache.
+
+    Subclass of oauth2_settings.OAUTH2_VALIDATOR_CLASS, so any customization
+    of the configured validator is kept.
+    """
+
+    def _save_bearer_token(
+        self, token: dict[str, Any], request: Request, *args: Any, **kwargs: Any
+    ) -> Any:
+        """Save the token, then cache it once the transaction commits.
+
+        Without refresh token rotation, the access token of the refresh
+        token is updated in place, so its previous value is dropped from the
+        cache.
+        """
+        expires = timezone.now() + timedelta(
+            seconds=token.get('expires_in', oauth2_settings.ACCESS_TOKEN_EXPIRE_SECONDS)
+        )
+        previous = getattr(
+            getattr(request, 'refresh_token_instance', None), 'access_token', None
+        )
+        result = super()._save_bearer_token(token, request, *args, **kwargs)
+        if previous is not None:
+            token_cache.forget(previous.token_checksum)
+        if getattr(request, 'resource', None):
+            # Audience-restricted tokens are checked by django-oauth-toolkit.
+            return result
+        token_cache.store(
+            token['access_token'],
+            getattr(request.user, 'pk', None),
+            request.client.pk,
+            token['scope'],
+            expires,
+        )
+        return result
+
+
+class TokenCapValidator(TokenCacheValidator):
+    """Validator evicting the oldest tokens of a user beyond the cap."""
+
+    def _save_bearer_token(
+        self, token: dict[str, Any], request: Request, *args: Any, **kwargs: Any
+    ) -> Any:
+        """Save the token, then evict the tokens beyond the cap.
+
+        Runs in the transaction opened by save_bearer_token.
+        """
+        result = super()._save_bearer_token(token, request, *args, **kwargs)
+        token_cap.enforce(request.user, request.client)
+        return result
+
+
+class TrustedClientValidator(TokenCapValidator):
+    """Validator accepting the client loaded by the view."""
+
+    def authenticate_client(self, request: Request, *args: Any, **kwargs: Any) -> bool:
+        """Authenticate the client of the request.
+
+        The application set with trusted_client() is accepted, without
+        checking the secret, if it matches the client_id of the request and
+        is usable. Otherwise the configured validator authenticates it.
+
+        Args:
+            request: The oauthlib request.
+
+        Returns:
+            True if the client is authenticated.
+        """
+        client = _trusted_client.get()
+        if (
+            client is not None
+            and client.client_id == request.client_id
+            and client.is_usable(request)
+        ):
+            request.client = client
+            return True
+        return super().authenticate_client(request, *args, **kwargs)
+
+
+class PasswordPoolValidator(TokenCapValidator):
+    """Validator hashing the passwords of the password grant in a pool.
+
+    The pool is used by PooledModelBackend, which must be in
+    AUTHENTICATION_BACKENDS.
+    """
+
+    def validate_user(
+        self,
+        username: str,
+        password: str,
+        client: Application,
+        request: Request,
+        *args: Any,
+        **kwargs: Any
+    ) -> bool:
+        """Check the credentials of the user, hashing in the pool.
+
+        Raises:
+            TemporarilyUnavailableError: If the hashing pool is full.
+        """
+        try:
+            with password_hashing.offload():
+                return super().validate_user(
+                    username, password, client, request, *args, **kwargs
+                )
+        except password_hashing.PasswordPoolFullError:
+            raise errors.TemporarilyUnavailableError(
+                description='Too many logins in progress.',
+                status_code=503,
+                request=request,
+            )
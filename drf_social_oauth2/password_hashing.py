@@ -0,0 +1,185 @@
+"""
+Password hashing off the request threads.
+
+Password-grant requests spend most of their time in the password hasher,
+which holds the GIL of the worker process, so CPU-heavy logins starve the
+cheap token and revoke requests served by the same worker. When
+DRFSO2_PASSWORD_POOL_ENABLED is True, PooledModelBackend hashes the
+passwords of the requests to TokenView in a pool of
+DRFSO2_PASSWORD_POOL_WORKERS processes instead.
+
+At most DRFSO2_PASSWORD_POOL_QUEUE_SIZE hashes wait for a free process. A
+request finding the queue full waits up to DRFSO2_PASSWORD_POOL_QUEUE_TIMEOUT
+seconds for room, then gets a 503 'temporarily_unavailable' error.
+
+Example configuration in settings.py:
+    AUTHENTICATION_BACKENDS = [
+        'drf_social_oauth2.password_hashing.PooledModelBackend',
+        ...
+    ]
+    DRFSO2_PASSWORD_POOL_ENABLED = True
+    DRFSO2_PASSWORD_POOL_WORKERS = 4
+"""
+
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from drf_social_oauth2 import hashing_worker, metrics
+from drf_social_oauth2.settings import (
+    DRFSO2_PASSWORD_POOL_ENABLED,
+    DRFSO2_PASSWORD_POOL_QUEUE_SIZE,
+    DRFSO2_PASSWORD_POOL_QUEUE_TIMEOUT,
+    DRFSO2_PASSWORD_POOL_WORKERS,
+)
+
+_offloading: ContextVar[bool] = ContextVar('drfso2_password_offloading', default=False)
+
+
+class PasswordPoolFullError(Exception):
+    """Raised when the hashing queue stays full for the queue timeout."""
+
+    def __init__(self) -> None:
+        super().__init__('Too many passwords waiting to be hashed.')
+
+
+class PasswordHashingPool:
+    """A process pool for password hashing with a bounded queue.
+
+    Args:
+        workers: Number of worker processes.
+        queue_size: Hashes allowed to wait for a free worker.
+        queue_timeout: Seconds a hash may wait for room in the queue.
+    """
+
+    def __init__(
+        self, workers: int = 2, queue_size: int = 16, queue_timeout: float = 0.1
+    ) -> None:
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a hashing function in the pool and return its result.
+
+        The last item of the result must be the hashing time, which is
+        recorded and dropped.
+
+        Raises:
+            PasswordPoolFullError: If the queue stays full for the timeout.
+        """
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            metrics.PASSWORD_POOL_REJECTIONS.inc()
+            raise PasswordPoolFullError()
+        try:
+            future: Future = self.get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        *result, hashing = future.result()
+        metrics.PASSWORD_HASHING_LATENCY.observe(hashing, stage='hash')
+        metrics.PASSWORD_HASHING_LATENCY.observe(
+            time.perf_counter() - started - hashing, stage='wait'
+        )
+        return result[0] if len(result) == 1 else tuple(result)
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        """Return the executor, starting the worker processes on first use."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=hashing_worker.setup_django,
+                    )
+        return self._executor
+
+
+_pool: PasswordHashingPool | None = None
+
+
+def get_pool() -> PasswordHashingPool:
+    """Return the hashing pool built from settings."""
+    global _pool
+    if _pool is None:
+        _pool = PasswordHashingPool(
+            DRFSO2_PASSWORD_POOL_WORKERS,
+            DRFSO2_PASSWORD_POOL_QUEUE_SIZE,
+            DRFSO2_PASSWORD_POOL_QUEUE_TIMEOUT,
+        )
+    return _pool
+
+
+@contextmanager
+def _offload() -> Iterator[None]:
+    token = _offloading.set(True)
+    try:
+        yield
+    finally:
+        _offloading.reset(token)
+
+
+def offload() -> Any:
+    """Return a context manager hashing passwords in the pool inside it.
+
+    A no-op context manager is returned when the pool is disabled.
+    """
+    if not DRFSO2_PASSWORD_POOL_ENABLED:
+        return nullcontext()
+    return _offload()
+
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend hashing passwords in the pool inside offload().
+
+    Outside offload(), for instance for admin logins, it behaves exactly as
+    ModelBackend.
+
+    Raises:
+        PasswordPoolFullError: From authenticate(), if the pool is full.
+    """
+
+    def authenticate(
+        self,
+        request: Any,
+        username: str | None = None,
+        password: str | None = None,
+        **kwargs: Any
+    ) -> Any:
+        if not _offloading.get():
+            return super().authenticate(request, username, password, **kwargs)
+
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway, as ModelBackend does, so a missing user
+            # takes as long as a wrong password.
+            get_pool().run(hashing_worker.hash_password, password)
+            return None
+
+        valid, must_update = get_pool().run(hashing_worker.check, password, user.password)
+        if not valid or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            # What AbstractBaseUser.check_password does for outdated hashes.
+            user.set_password(password)
+            user.save(update_fields=['password'])
+        return user
@@ -0,0 +1,224 @@
+"""
+Social auth pipeline steps for drf-social-oauth2.
+
+Every ``do_auth`` call runs the whole python-social-auth pipeline, which
+writes the association's ``extra_data`` and the user details even for
+returning users. The ``social_user`` step below replaces
+``social_core.pipeline.social_auth.social_user``: it loads the association
+and its user with a single indexed query and, when the association was
+refreshed less than DRFSO2_FAST_PATH_REFRESH_SECONDS ago, ends the pipeline
+with that user, skipping the steps that write. Otherwise the pipeline runs
+as usual, and ``mark_refreshed`` records the refresh.
+
+Two first logins with the same provider account can run the pipeline at
+the same time. The ``create_user`` and ``associate_user`` steps below
+replace the social-core ones so that both requests end with the user of the
+association that was inserted first, relying on the unique constraints of
+the user and UserSocialAuth tables rather than on locks.
+
+Example configuration in settings.py:
+    SOCIAL_AUTH_PIPELINE = drf_social_oauth2.pipeline.PIPELINE
+"""
+
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.db import IntegrityError, connections, router, transaction
+from django.utils import timezone
+from social_core.exceptions import AuthAlreadyAssociated, AuthException
+from social_core.pipeline import user as user_steps
+
+from drf_social_oauth2.settings import DRFSO2_FAST_PATH_REFRESH_SECONDS
+
+PIPELINE: tuple[str, ...] = (
+    'social_core.pipeline.social_auth.social_details',
+    'social_core.pipeline.social_auth.social_uid',
+    'social_core.pipeline.social_auth.auth_allowed',
+    'drf_social_oauth2.pipeline.social_user',
+    'social_core.pipeline.user.get_username',
+    'drf_social_oauth2.pipeline.create_user',
+    'drf_social_oauth2.pipeline.associate_user',
+    'social_core.pipeline.social_auth.load_extra_data',
+    'social_core.pipeline.user.user_details',
+    'drf_social_oauth2.pipeline.mark_refreshed',
+)
+
+
+# Pause before inserting the user again when a concurrent first login holds
+# the conflicting row but has not inserted its association yet.
+RETRY_DELAY: float = 0.05
+
+
+class AccountConflict(AuthException):
+    """Raised when the new user conflicts with an account of another login."""
+
+    def __str__(self) -> str:
+        return 'A user with these details already exists.'
+
+
+def _load_social(backend: Any, uid: str) -> Any:
+    return (
+        backend.strategy.storage.user.objects.select_related('user')
+        .filter(provider=backend.name, uid=str(uid))
+        .first()
+    )
+
+
+def is_fresh(social: Any) -> bool:
+    """Return True if the association was refreshed within the interval."""
+    if not DRFSO2_FAST_PATH_REFRESH_SECONDS or social.modified is None:
+        return False
+    age = timezone.now() - social.modified
+    return age < timedelta(seconds=DRFSO2_FAST_PATH_REFRESH_SECONDS)
+
+
+def social_user(
+    backend: Any, uid: str, user: Any = None, *args: Any, **kwargs: Any
+) -> Any:
+    """Load the association of ``uid``, ending the pipeline if it is fresh.
+
+    A drop-in replacement for social_core.pipeline.social_auth.social_user.
+
+    Returns:
+        The user, which ends the pipeline, when the association exists, is
+        fresh and its user is active; otherwise the same dict as the
+        social-core step.
+
+    Raises:
+        AuthAlreadyAssociated: If the association belongs to another user.
+    """
+    social = _load_social(backend, uid)
+    if social:
+        if user and social.user != user:
+            raise AuthAlreadyAssociated(backend)
+        if not user:
+            user = social.user
+        if user.is_active and is_fresh(social):
+            # What BaseAuth.pipeline would set on a completed pipeline.
+            user.social_user = social
+            user.is_new = False
+            return user
+    return {
+        'social': social,
+        'user': user,
+        'is_new': user is None,
+        'new_association': social is None,
+    }
+
+
+def _insert_user(backend: Any, fields: dict[str, Any]) -> Any:
+    # The storage's create_user, so that customised storages are honoured.
+    # social_django's falls back to an existing user when the insert
+    # conflicts; such conflicts are raised instead, so the returned user was
+    # always inserted by this call.
+    storage = backend.strategy.storage.user
+    using = router.db_for_write(storage.user_model())
+    conflicts: list[IntegrityError] = []
+
+    def record_conflicts(execute: Any, sql: str, params: Any, many: bool, context: Any) -> Any:
+        try:
+            return execute(sql, params, many, context)
+        except IntegrityError as e:
+            conflicts.append(e)
+            raise
+
+    with transaction.atomic(using=using), connections[using].execute_wrapper(record_conflicts):
+        user = storage.create_user(**fields)
+        if conflicts:
+            raise conflicts[0]
+    return user
+
+
+def create_user(
+    strategy: Any, details: dict, backend: Any, uid: str, user: Any = None,
+    *args: Any, **kwargs: Any
+) -> dict[str, Any] | None:
+    """Create the user of a first login, tolerating a concurrent one.
+
+    A drop-in replacement for social_core.pipeline.user.create_user. If the
+    insert conflicts with a row of a concurrent first login of the same
+    account, the user of that login is used. If its association is not
+    there yet, the insert is tried once more after RETRY_DELAY.
+
+    Raises:
+        AccountConflict: If the user conflicts with another account.
+    """
+    if user:
+        return {'is_new': False}
+    fields = {
+        name: kwargs.get(name, details.get(name))
+        for name in backend.setting('USER_FIELDS', user_steps.USER_FIELDS)
+    }
+    if not fields:
+        return None
+    if backend.setting('FORCE_EMAIL_LOWERCASE', False) and fields.get('email'):
+        fields['email'] = fields['email'].lower()
+
+    for attempt in range(2):
+        try:
+            user = _insert_user(backend, dict(fields))
+        except IntegrityError:
+            social = _load_social(backend, uid)
+            if social is not None:
+                return {
+                    'social': social,
+                    'user': social.user,
+                    'is_new': False,
+                    'new_association': False,
+                }
+            if attempt:
+                raise AccountConflict(backend)
+            time.sleep(RETRY_DELAY)
+        else:
+            return {'is_new': True, 'user': user, 'user_inserted': True}
+    return None
+
+
+def associate_user(
+    backend: Any, uid: str, user: Any = None, social: Any = None,
+    *args: Any, **kwargs: Any
+) -> dict[str, Any] | None:
+    """Associate the account with the user, tolerating a concurrent login.
+
+    A drop-in replacement for social_core.pipeline.social_auth.associate_user.
+    When a concurrent first login inserted the association first, its user
+    is used, and the user that create_user has just inserted is deleted.
+
+    Raises:
+        AuthAlreadyAssociated: If the account belongs to another user, and
+            the user of this login was not just inserted.
+    """
+    if not user or social:
+        return None
+    storage = backend.strategy.storage.user
+    try:
+        with transaction.atomic(using=router.db_for_write(storage)):
+            social = storage.create_social_auth(user, uid, backend.name)
+    except IntegrityError:
+        social = _load_social(backend, uid)
+        if social is None:
+            raise
+        if social.user != user:
+            if not kwargs.get('user_inserted'):
+                raise AuthAlreadyAssociated(backend)
+            user.delete()
+        return {
+            'social': social,
+            'user': social.user,
+            'is_new': False,
+            'new_association': False,
+        }
+    return {'social': social, 'user': social.user, 'new_association': True}
+
+
+def mark_refreshed(social: Any = None, *args: Any, **kwargs: Any) -> None:
+    """Record that the pipeline refreshed an existing association.
+
+    load_extra_data only saves when the data changed, so the modification
+    time is bumped here, at most once per refresh interval.
+    """
+    if social is None or is_fresh(social):
+        return
+    social.modified = timezone.now()
+    type(social).objects.filter(pk=social.pk).update(modified=social.modified)
@@ -0,0 +1,162 @@
+"""
+On-demand request profiling for drf-social-oauth2.
+
+When DRFSO2_PROFILING_ENABLED is True, requests to the token endpoints are
+profiled with cProfile if they carry a valid signed profiling header, or if
+they are picked by the DRFSO2_PROFILING_SAMPLE_RATE sampling. Each profile
+is written to DRFSO2_PROFILING_DIR as a ``.prof`` file, readable with
+``pstats`` or snakeviz, next to a ``.json`` file with the endpoint, backend,
+client id, status and duration of the request.
+
+The signed header value is produced with ``sign_profiling_request()``, for
+instance from ``python manage.py shell``, and expires after
+DRFSO2_PROFILING_MAX_AGE seconds.
+
+When profiling is disabled the views are left undecorated.
+"""
+
+import cProfile
+import json
+import logging
+import os
+import random
+import re
+import tempfile
+import time
+import uuid
+from collections.abc import Callable
+from functools import wraps
+from typing import Any
+
+from django.core import signing
+
+from drf_social_oauth2.settings import (
+    DRFSO2_PROFILING_DIR,
+    DRFSO2_PROFILING_ENABLED,
+    DRFSO2_PROFILING_HEADER,
+    DRFSO2_PROFILING_MAX_AGE,
+    DRFSO2_PROFILING_SAMPLE_RATE,
+    DRFSO2_PROFILING_SECRET,
+)
+
+log = logging.getLogger(__name__)
+
+SIGNING_SALT: str = 'drf_social_oauth2.profiling'
+SIGNED_VALUE: str = 'profile'
+
+_META_HEADER: str = 'HTTP_' + DRFSO2_PROFILING_HEADER.upper().replace('-', '_')
+
+
+def _signer() -> signing.TimestampSigner:
+    # Falls back to SECRET_KEY when no dedicated secret is configured.
+    return signing.TimestampSigner(key=DRFSO2_PROFILING_SECRET, salt=SIGNING_SALT)
+
+
+def sign_profiling_request() -> str:
+    """Return a header value requesting a profile, valid for DRFSO2_PROFILING_MAX_AGE."""
+    return _signer().sign(SIGNED_VALUE)
+
+
+def get_trigger(request: Any) -> str | None:
+    """Return why a request should be profiled, or None if it should not.
+
+    Returns:
+        'header' for a valid signed header, 'sample' when picked by the
+        sampling rate, None otherwise.
+    """
+    value = request.META.get(_META_HEADER)
+    if value:
+        try:
+            if _signer().unsign(value, max_age=DRFSO2_PROFILING_MAX_AGE) == SIGNED_VALUE:
+                return 'header'
+        except signing.BadSignature:
+            log.warning('Ignoring profiling header with an invalid or expired signature.')
+    if DRFSO2_PROFILING_SAMPLE_RATE and random.random() < DRFSO2_PROFILING_SAMPLE_RATE:
+        return 'sample'
+    return None
+
+
+def write_profile(
+    profiler: cProfile.Profile, metadata: dict[str, Any], directory: str | None = None
+) -> str:
+    """Write a profile and its metadata, returning the path of the profile.
+
+    Args:
+        profiler: The stopped profiler.
+        metadata: Request details written to a ``.json`` file with the same name.
+        directory: Output directory, DRFSO2_PROFILING_DIR by default.
+    """
+    directory = directory or DRFSO2_PROFILING_DIR or os.path.join(
+        tempfile.gettempdir(), 'drfso2-profiles'
+    )
+    os.makedirs(directory, exist_ok=True)
+    name = '{}-{}-{}-{}'.format(
+        time.strftime('%Y%m%dT%H%M%S', time.gmtime(metadata['timestamp'])),
+        metadata['endpoint'],
+        # The backend comes from the request body; keep it a safe file name.
+        re.sub(r'[^A-Za-z0-9_.-]', '_', str(metadata.get('backend') or 'none'))[:64],
+        uuid.uuid4().hex[:8],
+    )
+    path = os.path.join(directory, name + '.prof')
+    profiler.dump_stats(path)
+    with open(os.path.join(directory, name + '.json'), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return path
+
+
+def profiled(endpoint: str) -> Callable:
+    """Decorate a view handler to profile requests that ask for it.
+
+    When profiling is disabled the handler is returned unchanged.
+
+    Args:
+        endpoint: The endpoint name written in the metadata, usually the URL name.
+    """
+    def decorator(function: Callable) -> Callable:
+        if not DRFSO2_PROFILING_ENABLED:
+            return function
+
+        @wraps(function)
+        def wrapper(view: Any, request: Any, *args: Any, **kwargs: Any) -> Any:
+            trigger = get_trigger(request)
+            if trigger is None:
+                return function(view, request, *args, **kwargs)
+
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is already active in this thread.
+                return function(view, request, *args, **kwargs)
+
+            status = None
+            timestamp = time.time()
+            started = time.perf_counter()
+            try:
+                response = function(view, request, *args, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                profiler.disable()
+                data = request.data if hasattr(request.data, 'get') else {}
+                metadata = {
+                    'endpoint': endpoint,
+                    'backend': data.get('backend'),
+                    'client_id': data.get('client_id'),
+                    'method': request.method,
+                    'path': request.path,
+                    'status': status,
+                    'duration': time.perf_counter() - started,
+                    'timestamp': timestamp,
+                    'trigger': trigger,
+                    'pid': os.getpid(),
+                }
+                try:
+                    path = write_profile(profiler, metadata)
+                    log.info('Wrote %s profile to %s.', endpoint, path)
+                except OSError:
+                    log.exception('Unable to write the %s profile.', endpoint)
+
+        return wrapper
+
+    return decorator
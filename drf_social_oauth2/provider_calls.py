@@ -0,0 +1,286 @@
+"""
+Per-backend timeouts, retries and hedged requests for social provider calls.
+
+social-core sends every provider request with the same timeout and never
+retries. A ProviderCallPolicy wraps the ``request`` method of a loaded
+backend, which every ``do_auth`` and ``user_data`` call goes through, and
+adds:
+
+- separate connect and read timeouts;
+- retries of idempotent requests with jittered exponential backoff, limited
+  by a retry budget so that retries cannot multiply the load on a provider
+  during an outage;
+- optionally, a hedged request sent when the first one is slower than the
+  p95 latency of the backend. Hedges draw from the same retry budget.
+
+Example configuration in settings.py:
+    DRFSO2_PROVIDER_CONNECT_TIMEOUT = 1
+    DRFSO2_PROVIDER_READ_TIMEOUT = 5
+    DRFSO2_PROVIDER_RETRIES = 2
+    DRFSO2_PROVIDER_BACKENDS = {
+        'google-identity': {'read_timeout': 2, 'hedge': True},
+    }
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import Any
+
+from social_core.backends.base import BaseAuth
+
+from drf_social_oauth2 import metrics
+from drf_social_oauth2.circuit_breaker import is_failure
+from drf_social_oauth2.settings import (
+    DRFSO2_PROVIDER_BACKENDS,
+    DRFSO2_PROVIDER_CONNECT_TIMEOUT,
+    DRFSO2_PROVIDER_HEDGE,
+    DRFSO2_PROVIDER_HEDGE_DELAY,
+    DRFSO2_PROVIDER_READ_TIMEOUT,
+    DRFSO2_PROVIDER_RETRIES,
+    DRFSO2_PROVIDER_RETRY_BACKOFF,
+    DRFSO2_PROVIDER_RETRY_BUDGET,
+)
+
+IDEMPOTENT_METHODS: frozenset[str] = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+# Hedged requests run here so the caller can wait on whichever ends first.
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='drfso2-hedge')
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a share of the requests.
+
+    Every request deposits ``ratio`` tokens and every retry or hedge
+    withdraws one. The bucket holds at most ``minimum`` tokens, which also
+    allows a few retries when traffic is low.
+
+    Args:
+        ratio: Retries allowed per request, e.g. 0.1 for 10%.
+        minimum: Capacity of the bucket.
+    """
+
+    def __init__(self, ratio: float, minimum: int = 10) -> None:
+        self.ratio = ratio
+        self.minimum = minimum
+        self._balance = float(minimum)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self._balance + self.ratio, self.minimum)
+
+    def withdraw(self) -> bool:
+        """Take one token, returning False if the budget is spent."""
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class LatencyWindow:
+    """The latencies of the most recent successful requests.
+
+    Args:
+        size: Number of samples kept.
+        min_samples: Samples needed before percentiles are reported.
+    """
+
+    def __init__(self, size: int = 256, min_samples: int = 20) -> None:
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, value: float) -> None:
+        with self._lock:
+            self._samples.append(value)
+
+    def percentile(self, q: float) -> float | None:
+        """Return the ``q`` percentile (0-100), or None with too few samples."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+class ProviderCallPolicy:
+    """Timeouts, retries and hedging for the requests of one backend.
+
+    Args:
+        backend: The social backend name.
+        connect_timeout: Connect timeout in seconds.
+        read_timeout: Read timeout in seconds.
+        retries: Maximum retries of a failed idempotent request.
+        backoff: Base delay in seconds of the exponential backoff. The
+            actual delay is drawn uniformly up to the exponential value.
+        backoff_max: Upper bound of the backoff delay.
+        retry_budget: Retries and hedges allowed per request.
+        hedge: Send a second request when the first is slower than p95.
+        hedge_delay: Delay used until enough latencies are known to compute
+            the p95. When None, no hedge is sent until then.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        retries: int = 0,
+        backoff: float = 0.05,
+        backoff_max: float = 1.0,
+        retry_budget: float = 0.1,
+        hedge: bool = False,
+        hedge_delay: float | None = None,
+    ) -> None:
+        self.backend = backend
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.budget = RetryBudget(retry_budget)
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.latencies = LatencyWindow()
+
+    @property
+    def is_active(self) -> bool:
+        """Return False if the policy would not change any request."""
+        return bool(
+            self.connect_timeout is not None
+            or self.read_timeout is not None
+            or self.retries
+            or self.hedge
+        )
+
+    def apply(self, backend: BaseAuth) -> BaseAuth:
+        """Route the provider requests of a backend instance through the policy."""
+        if self.is_active:
+            default = backend.setting('REQUESTS_TIMEOUT') or backend.setting('URLOPEN_TIMEOUT')
+            timeout = None
+            if self.connect_timeout is not None or self.read_timeout is not None:
+                timeout = (
+                    default if self.connect_timeout is None else self.connect_timeout,
+                    default if self.read_timeout is None else self.read_timeout,
+                )
+            backend.request = partial(self.request, backend.request, timeout)
+        return backend
+
+    def request(
+        self,
+        send: Callable[..., Any],
+        timeout: tuple[float | None, float | None] | None,
+        url: str,
+        method: str = 'GET',
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Send a provider request with the policy applied.
+
+        Args:
+            send: The backend's original ``request`` method.
+            timeout: The (connect, read) timeout, or None for the default.
+            url: The request URL.
+            method: The HTTP method. Only idempotent methods are retried.
+        """
+        if timeout is not None:
+            kwargs.setdefault('timeout', timeout)
+        self.budget.deposit()
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return send(url, method, *args, **kwargs)
+
+        attempt = 0
+        while True:
+            try:
+                return self._send(send, url, method, args, kwargs)
+            except Exception as e:
+                if (
+                    attempt >= self.retries
+                    or not is_failure(e)
+                    or not self.budget.withdraw()
+                ):
+                    raise
+            metrics.PROVIDER_RETRIES.inc(backend=self.backend, kind='retry')
+            time.sleep(random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt)))
+            attempt += 1
+
+    def _timed_send(
+        self, send: Callable[..., Any], url: str, method: str, args: tuple, kwargs: dict
+    ) -> Any:
+        started = time.perf_counter()
+        response = send(url, method, *args, **kwargs)
+        self.latencies.add(time.perf_counter() - started)
+        return response
+
+    def _send(
+        self, send: Callable[..., Any], url: str, method: str, args: tuple, kwargs: dict
+    ) -> Any:
+        delay = self.latencies.percentile(95) if self.hedge else None
+        if delay is None:
+            delay = self.hedge_delay if self.hedge else None
+        if delay is None:
+            return self._timed_send(send, url, method, args, kwargs)
+
+        primary = _executor.submit(
+            self._timed_send, send, url, method, args, _copy_kwargs(kwargs)
+        )
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+        if not self.budget.withdraw():
+            return primary.result()
+
+        metrics.PROVIDER_RETRIES.inc(backend=self.backend, kind='hedge')
+        hedge = _executor.submit(
+            self._timed_send, send, url, method, args, _copy_kwargs(kwargs)
+        )
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The slower request is left to finish in the background.
+                    return future.result()
+        return primary.result()
+
+
+def _copy_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
+    # social-core adds headers in place; concurrent requests need their own.
+    copied = dict(kwargs)
+    if 'headers' in copied:
+        copied['headers'] = dict(copied['headers'])
+    return copied
+
+
+_policies: dict[str, ProviderCallPolicy] = {}
+
+
+def get_policy(backend: str) -> ProviderCallPolicy:
+    """Return the provider call policy of a backend, built from settings."""
+    policy = _policies.get(backend)
+    if policy is None:
+        options: dict[str, Any] = {
+            'connect_timeout': DRFSO2_PROVIDER_CONNECT_TIMEOUT,
+            'read_timeout': DRFSO2_PROVIDER_READ_TIMEOUT,
+            'retries': DRFSO2_PROVIDER_RETRIES,
+            'backoff': DRFSO2_PROVIDER_RETRY_BACKOFF,
+            'retry_budget': DRFSO2_PROVIDER_RETRY_BUDGET,
+            'hedge': DRFSO2_PROVIDER_HEDGE,
+            'hedge_delay': DRFSO2_PROVIDER_HEDGE_DELAY,
+        }
+        options.update(DRFSO2_PROVIDER_BACKENDS.get(backend, {}))
+        policy = _policies[backend] = ProviderCallPolicy(backend, **options)
+    return policy
+
+
+def apply_policy(backend: BaseAuth) -> BaseAuth:
+    """Apply the configured provider call policy to a loaded backend."""
+    return get_policy(backend.name).apply(backend)
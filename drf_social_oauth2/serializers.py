@@ -2,10 +2,17 @@
 Serializers for drf-social-oauth2 API endpoints.
 
 This module provides serializers for validating request data
-in OAuth2 token operations.
+in OAuth2 token operations, and the serializer of the user payload
+returned with converted tokens.
 """
 
-from rest_framework.serializers import CharField, IntegerField, Serializer
+from functools import cache
+
+from django.contrib.auth import get_user_model
+from django.utils.module_loading import import_string
+from rest_framework.serializers import CharField, EmailField, IntegerField, Serializer
+
+from drf_social_oauth2.settings import DRFSO2_USER_SERIALIZER
 
 
 class InvalidateRefreshTokenSerializer(Serializer):
@@ -120,3 +127,45 @@ class DisconnectBackendSerializer(Serializer):
             'invalid': 'association_id must be a valid integer.',
         }
     )
+
+
+class UserPayloadSerializer(Serializer):
+    """Default serializer of the user returned with converted tokens.
+
+    Replace it with DRFSO2_USER_SERIALIZER. When all of its fields read
+    concrete columns of the user model, only those columns are loaded.
+    """
+
+    email = EmailField(read_only=True)
+    first_name = CharField(read_only=True)
+    last_name = CharField(read_only=True)
+
+
+@cache
+def get_user_serializer_class() -> type[Serializer] | None:
+    """Return the DRFSO2_USER_SERIALIZER class, or None to omit the payload."""
+    if DRFSO2_USER_SERIALIZER is None:
+        return None
+    if isinstance(DRFSO2_USER_SERIALIZER, str):
+        return import_string(DRFSO2_USER_SERIALIZER)
+    return DRFSO2_USER_SERIALIZER
+
+
+@cache
+def get_user_fields() -> tuple[str, ...] | None:
+    """Return the user columns read by the user payload serializer.
+
+    Returns:
+        The concrete field names, or None if a field reads anything else,
+        such as a method, a property or a relation, and needs the full row.
+    """
+    serializer_class = get_user_serializer_class()
+    if serializer_class is None:
+        return ()
+    columns = {field.name for field in get_user_model()._meta.concrete_fields}
+    fields = []
+    for field in serializer_class().fields.values():
+        if field.source not in columns:
+            return None
+        fields.append(field.source)
+    return tuple(fields)
@@ -11,6 +11,183 @@ Available settings:
         Default: "drf"
     ACTIVATE_JWT: If True, enables JWT token generation.
         Default: False
+    DRFSO2_FAST_TOKEN_GENERATOR: If True, JWT tokens are generated with
+        generate_fast_token, which draws entropy in bulk and reuses the
+        prepared signing key. Only used when ACTIVATE_JWT is True.
+        Default: False
+    DRFSO2_JWT_SIGNING_KEYS: Asymmetric keys (RS256, ES256, EdDSA, ...) used
+        to sign JWT tokens, see drf_social_oauth2.signing. When set together
+        with ACTIVATE_JWT, tokens carry a 'kid' header and the public keys are
+        published at the JWKS endpoint. Default: []
+    DRFSO2_JWT_ISSUER: The 'iss' claim of the tokens signed with
+        DRFSO2_JWT_SIGNING_KEYS. Defaults to OAUTH2_PROVIDER's
+        OIDC_ISS_ENDPOINT, or else to the origin of the token endpoint.
+        Default: None
+    DRFSO2_JWKS_MAX_AGE: Cache lifetime in seconds of the JWKS response.
+        Default: 3600
+    DRFSO2_METRICS_ENABLED: If True, collects latency, query count, provider
+        error and cache metrics and serves them at the metrics endpoint.
+        Default: False
+    DRFSO2_METRICS_TOKEN: Bearer token required to scrape the metrics
+        endpoint. Default: None (no authentication)
+    DRFSO2_TRACING_ENABLED: If True and opentelemetry-api is installed,
+        emits OpenTelemetry spans across the convert-token pipeline.
+        Default: False
+    DRFSO2_FAST_PATH_REFRESH_SECONDS: With drf_social_oauth2.pipeline.social_user
+        in SOCIAL_AUTH_PIPELINE, associations refreshed less than this many
+        seconds ago skip the rest of the pipeline. 0 disables the fast path.
+        Default: 3600
+    DRFSO2_USER_DATA_CACHE_ENABLED: If True, the provider user data of
+        GoogleIdentityBackend and LinkedInOpenIDUserInfo is cached per token.
+        Default: False
+    DRFSO2_USER_DATA_CACHE: Alias of the Django cache holding user data.
+        Default: 'default'
+    DRFSO2_USER_DATA_CACHE_SECONDS: Maximum lifetime of cached user data,
+        further bounded by the exp or expires_in of the response.
+        Default: 300
+    DRFSO2_USER_DATA_CACHE_ENCRYPT: If True, cached user data is encrypted
+        with a key derived from the token.
+        Default: True
+    DRFSO2_USER_SERIALIZER: Serializer class, or its dotted path, of the
+        user payload added to convert-token responses. None omits it.
+        Default: 'drf_social_oauth2.serializers.UserPayloadSerializer'
+    DRFSO2_SESSIONLESS_STRATEGY: If True, social token authentication,
+        convert-token and disconnect requests keep the social auth state in
+        memory instead of the Django session. Partial pipelines then fail.
+        Default: False
+    DRFSO2_TRUST_LOADED_CLIENT: If True, the convert-token and revoke-token
+        views authenticate the client with the Application they loaded from
+        its client_id, instead of verifying its stored secret.
+        Default: True
+    DRFSO2_PASSWORD_POOL_ENABLED: If True, PooledModelBackend hashes the
+        passwords of password-grant requests to TokenView in a process pool.
+        Default: False
+    DRFSO2_PASSWORD_POOL_WORKERS: Processes of the hashing pool.
+        Default: 2
+    DRFSO2_PASSWORD_POOL_QUEUE_SIZE: Hashes allowed to wait for a process.
+        Default: 16
+    DRFSO2_PASSWORD_POOL_QUEUE_TIMEOUT: Seconds a request may wait for room
+        in the queue before a 503 'temporarily_unavailable' error.
+        Default: 0.1
+    DRFSO2_MAX_TOKENS_PER_USER: Access and refresh tokens a user may hold
+        per application. Issuing a token evicts the oldest beyond the cap.
+        None disables the cap.
+        Default: None
+    DRFSO2_TOKEN_EVICTION_BATCH: Maximum tokens of each kind evicted when
+        issuing one token.
+        Default: 100
+    DRFSO2_TOKEN_CACHE_ENABLED: Write the access tokens issued to the cache,
+        see drf_social_oauth2.token_cache. Default: False
+    DRFSO2_TOKEN_CACHE: Alias of the Django cache holding the token records.
+        Default: 'default'
+    DRFSO2_TOKEN_CACHE_SECONDS: Maximum lifetime of a cached token record.
+        Default: 300
+    DRFSO2_REFRESH_TOKEN_CHAIN_TAIL: Revoked refresh tokens of each rotated
+        chain kept by compact_refresh_tokens for reuse detection. Default: 5
+    DRFSO2_REFRESH_TOKEN_COMPACTION_BATCH: Maximum refresh tokens deleted by
+        one query of compact_refresh_tokens. Default: 1000
+    DRFSO2_SLIDING_EXPIRY_ENABLED: Extend the expiry of access tokens in
+        use, see drf_social_oauth2.sliding_expiry. Default: False
+    DRFSO2_SLIDING_EXPIRY_THRESHOLD: Remaining lifetime, in seconds, below
+        which a token in use is extended. Default: 300
+    DRFSO2_SLIDING_EXPIRY_INTERVAL: Minimum seconds between two extensions
+        of a token. Default: 60
+    DRFSO2_SLIDING_EXPIRY_MAX_AGE: Seconds after its creation beyond which
+        a token is never extended. None extends tokens indefinitely.
+        Default: 604800 (7 days)
+    DRFSO2_SLIDING_EXPIRY_FLUSH_SECONDS: Seconds between two writes of the
+        buffered extensions. Default: 5
+    DRFSO2_SLIDING_EXPIRY_BATCH_SIZE: Maximum tokens extended by one UPDATE,
+        and buffered extensions triggering an early write. Default: 500
+    DRFSO2_ASYNC_EXECUTOR_WORKERS: Threads running the blocking oauthlib and
+        social-core work of the async views. Default: 16
+
+Circuit breaker settings (see drf_social_oauth2.circuit_breaker):
+    DRFSO2_CIRCUIT_BREAKER_ENABLED: If True, convert-token requests fail fast
+        with 'temporarily_unavailable' while a backend's circuit is open.
+        Default: False
+    DRFSO2_CIRCUIT_BREAKER_FAILURE_RATE: Ratio of failed or slow provider
+        calls that opens the circuit. Default: 0.5
+    DRFSO2_CIRCUIT_BREAKER_MINIMUM_CALLS: Calls required in the window before
+        the failure rate is evaluated. Default: 20
+    DRFSO2_CIRCUIT_BREAKER_SLOW_CALL_SECONDS: Provider calls slower than this
+        count as failures. Default: 5
+    DRFSO2_CIRCUIT_BREAKER_WINDOW_SECONDS: Length of the counting window.
+        Default: 60
+    DRFSO2_CIRCUIT_BREAKER_OPEN_SECONDS: Time the circuit stays open before a
+        probe call is let through. Default: 30
+    DRFSO2_CIRCUIT_BREAKER_CACHE: Alias of the Django cache sharing the
+        circuit state between workers. Default: "default"
+    DRFSO2_CIRCUIT_BREAKER_BACKENDS: Per-backend overrides of the options
+        above, keyed by backend name. Default: {}
+
+Profiling settings (see drf_social_oauth2.profiling):
+    DRFSO2_PROFILING_ENABLED: If True, token endpoint requests can be
+        profiled with cProfile. Default: False
+    DRFSO2_PROFILING_SAMPLE_RATE: Share of requests profiled without the
+        signed header, between 0 and 1. Default: 0
+    DRFSO2_PROFILING_HEADER: Header carrying the signed profiling request.
+        Default: "X-DRFSO2-Profile"
+    DRFSO2_PROFILING_SECRET: Key signing the profiling header.
+        Default: None (SECRET_KEY)
+    DRFSO2_PROFILING_MAX_AGE: Lifetime in seconds of a signed header.
+        Default: 300
+    DRFSO2_PROFILING_DIR: Directory the profiles are written to.
+        Default: None (a "drfso2-profiles" directory in the temp directory)
+
+Bulkhead settings (see drf_social_oauth2.bulkhead):
+    DRFSO2_BULKHEAD_ENABLED: If True, concurrent do_auth calls are limited per
+        backend and requests over the limit get a 503. Default: False
+    DRFSO2_BULKHEAD_MAX_CONCURRENT: Concurrent provider calls allowed per
+        backend and process. Default: 10
+    DRFSO2_BULKHEAD_QUEUE_TIMEOUT: Seconds a request may wait for a free
+        slot. Default: 0.5
+    DRFSO2_BULKHEAD_NODE_MAX_CONCURRENT: Concurrent provider calls allowed per
+        backend across the processes sharing DRFSO2_BULKHEAD_CACHE.
+        Default: None (no node limit)
+    DRFSO2_BULKHEAD_CACHE: Alias of the Django cache holding the node
+        counters, usually a cache local to the node. Default: "default"
+    DRFSO2_BULKHEAD_LEASE_SECONDS: Lifetime of a node counter since a slot
+        was last taken, bounding how long slots leaked by killed processes
+        stay taken. Default: 300
+    DRFSO2_BULKHEAD_BACKENDS: Per-backend overrides of the options above,
+        keyed by backend name. Default: {}
+
+Provider call settings (see drf_social_oauth2.provider_calls):
+    DRFSO2_PROVIDER_CONNECT_TIMEOUT: Connect timeout in seconds of social
+        provider requests. Default: None (social-core's REQUESTS_TIMEOUT)
+    DRFSO2_PROVIDER_READ_TIMEOUT: Read timeout in seconds of social provider
+        requests. Default: None (social-core's REQUESTS_TIMEOUT)
+    DRFSO2_PROVIDER_RETRIES: Maximum retries of a failed idempotent provider
+        request. Default: 0
+    DRFSO2_PROVIDER_RETRY_BACKOFF: Base delay in seconds of the jittered
+        exponential backoff between retries. Default: 0.05
+    DRFSO2_PROVIDER_RETRY_BUDGET: Retries and hedged requests allowed per
+        provider request, per process. Default: 0.1
+    DRFSO2_PROVIDER_HEDGE: If True, a second request is sent when the first
+        is slower than the backend's p95 latency. Default: False
+    DRFSO2_PROVIDER_HEDGE_DELAY: Hedge delay in seconds used until the p95
+        latency is known. Default: None (no hedging until then)
+    DRFSO2_PROVIDER_BACKENDS: Per-backend overrides of the options above,
+        keyed by backend name. Default: {}
+
+Token introspection settings (for resource servers using
+IntrospectionAuthentication):
+    DRFSO2_INTROSPECTION_URL: The introspection endpoint of the
+        authorization server. Default: None
+    DRFSO2_INTROSPECTION_CLIENT_ID: Client ID used to authenticate against
+        the introspection endpoint. Default: None
+    DRFSO2_INTROSPECTION_CLIENT_SECRET: Client secret used to authenticate
+        against the introspection endpoint. Default: None
+    DRFSO2_INTROSPECTION_TOKEN: Bearer token with the 'introspection' scope,
+        used when no client credentials are set. Default: None
+    DRFSO2_INTROSPECTION_TIMEOUT: Request timeout in seconds. Default: 5
+    DRFSO2_INTROSPECTION_CACHE_SECONDS: Maximum time an introspection result
+        is cached, never past the token expiry. Default: 60
+    DRFSO2_INTROSPECTION_STALE_SECONDS: Time an expired cache entry may still
+        be served while it is refreshed in the background. Default: 0
+    DRFSO2_INTROSPECTION_CACHE_MAX_ENTRIES: Maximum number of cached tokens.
+        Default: 10000
 
 Refresh Token Rotation settings (via OAUTH2_PROVIDER dict):
     ROTATE_REFRESH_TOKEN: If True, a new refresh token is issued each time
@@ -44,15 +221,236 @@ DRFSO2_PROPRIETARY_BACKEND_NAME: str = getattr(
 DRFSO2_URL_NAMESPACE: str = getattr(settings, 'DRFSO2_URL_NAMESPACE', 'drf')
 
 
-# Configure JWT token generation if enabled
-if getattr(settings, 'ACTIVATE_JWT', False):
-    oauth2_settings.DEFAULTS[
-        'ACCESS_TOKEN_GENERATOR'
-    ] = 'drf_social_oauth2.generate_token'
+# Token introspection for resource servers
+DRFSO2_INTROSPECTION_URL: str | None = getattr(
+    settings, 'DRFSO2_INTROSPECTION_URL', None
+)
+DRFSO2_INTROSPECTION_CLIENT_ID: str | None = getattr(
+    settings, 'DRFSO2_INTROSPECTION_CLIENT_ID', None
+)
+DRFSO2_INTROSPECTION_CLIENT_SECRET: str | None = getattr(
+    settings, 'DRFSO2_INTROSPECTION_CLIENT_SECRET', None
+)
+DRFSO2_INTROSPECTION_TOKEN: str | None = getattr(
+    settings, 'DRFSO2_INTROSPECTION_TOKEN', None
+)
+DRFSO2_INTROSPECTION_TIMEOUT: float = getattr(
+    settings, 'DRFSO2_INTROSPECTION_TIMEOUT', 5
+)
+DRFSO2_INTROSPECTION_CACHE_SECONDS: int = getattr(
+    settings, 'DRFSO2_INTROSPECTION_CACHE_SECONDS', 60
+)
+DRFSO2_INTROSPECTION_STALE_SECONDS: int = getattr(
+    settings, 'DRFSO2_INTROSPECTION_STALE_SECONDS', 0
+)
+DRFSO2_INTROSPECTION_CACHE_MAX_ENTRIES: int = getattr(
+    settings, 'DRFSO2_INTROSPECTION_CACHE_MAX_ENTRIES', 10000
+)
+
+
+# Use the bulk-entropy JWT generator instead of the character based one
+DRFSO2_FAST_TOKEN_GENERATOR: bool = getattr(
+    settings, 'DRFSO2_FAST_TOKEN_GENERATOR', False
+)
+
+# Asymmetric JWT signing keys, see drf_social_oauth2.signing
+DRFSO2_JWT_SIGNING_KEYS: list[dict] = getattr(settings, 'DRFSO2_JWT_SIGNING_KEYS', [])
+DRFSO2_JWT_ISSUER: str | None = getattr(settings, 'DRFSO2_JWT_ISSUER', None)
+
+# Cache lifetime of the JWKS response in seconds
+DRFSO2_JWKS_MAX_AGE: int = getattr(settings, 'DRFSO2_JWKS_MAX_AGE', 3600)
+
+# Prometheus-style metrics, see drf_social_oauth2.metrics
+DRFSO2_METRICS_ENABLED: bool = getattr(settings, 'DRFSO2_METRICS_ENABLED', False)
+DRFSO2_METRICS_TOKEN: str | None = getattr(settings, 'DRFSO2_METRICS_TOKEN', None)
+
+# OpenTelemetry tracing, see drf_social_oauth2.tracing
+DRFSO2_TRACING_ENABLED: bool = getattr(settings, 'DRFSO2_TRACING_ENABLED', False)
+
+# Refresh interval of the pipeline fast path, see drf_social_oauth2.pipeline
+DRFSO2_FAST_PATH_REFRESH_SECONDS: int = getattr(
+    settings, 'DRFSO2_FAST_PATH_REFRESH_SECONDS', 3600
+)
+
+# Provider user data cache, see drf_social_oauth2.user_data_cache
+DRFSO2_USER_DATA_CACHE_ENABLED: bool = getattr(
+    settings, 'DRFSO2_USER_DATA_CACHE_ENABLED', False
+)
+DRFSO2_USER_DATA_CACHE: str = getattr(settings, 'DRFSO2_USER_DATA_CACHE', 'default')
+DRFSO2_USER_DATA_CACHE_SECONDS: int = getattr(
+    settings, 'DRFSO2_USER_DATA_CACHE_SECONDS', 300
+)
+DRFSO2_USER_DATA_CACHE_ENCRYPT: bool = getattr(
+    settings, 'DRFSO2_USER_DATA_CACHE_ENCRYPT', True
+)
+
+# User payload of convert-token responses
+DRFSO2_USER_SERIALIZER: str | type | None = getattr(
+    settings,
+    'DRFSO2_USER_SERIALIZER',
+    'drf_social_oauth2.serializers.UserPayloadSerializer',
+)
+
+# Social auth strategy of the API flows, see drf_social_oauth2.strategy
+DRFSO2_SESSIONLESS_STRATEGY: bool = getattr(
+    settings, 'DRFSO2_SESSIONLESS_STRATEGY', False
+)
+
+# Client authentication of the token views, see drf_social_oauth2.oauth2_validators
+DRFSO2_TRUST_LOADED_CLIENT: bool = getattr(settings, 'DRFSO2_TRUST_LOADED_CLIENT', True)
+
+# Password hashing pool, see drf_social_oauth2.password_hashing
+DRFSO2_PASSWORD_POOL_ENABLED: bool = getattr(
+    settings, 'DRFSO2_PASSWORD_POOL_ENABLED', False
+)
+DRFSO2_PASSWORD_POOL_WORKERS: int = getattr(settings, 'DRFSO2_PASSWORD_POOL_WORKERS', 2)
+DRFSO2_PASSWORD_POOL_QUEUE_SIZE: int = getattr(
+    settings, 'DRFSO2_PASSWORD_POOL_QUEUE_SIZE', 16
+)
+DRFSO2_PASSWORD_POOL_QUEUE_TIMEOUT: float = getattr(
+    settings, 'DRFSO2_PASSWORD_POOL_QUEUE_TIMEOUT', 0.1
+)
+
+# Per-user token cap, see drf_social_oauth2.token_cap
+DRFSO2_MAX_TOKENS_PER_USER: int | None = getattr(
+    settings, 'DRFSO2_MAX_TOKENS_PER_USER', None
+)
+DRFSO2_TOKEN_EVICTION_BATCH: int = getattr(settings, 'DRFSO2_TOKEN_EVICTION_BATCH', 100)
+
+# Write-through token cache, see drf_social_oauth2.token_cache
+DRFSO2_TOKEN_CACHE_ENABLED: bool = getattr(settings, 'DRFSO2_TOKEN_CACHE_ENABLED', False)
+DRFSO2_TOKEN_CACHE: str = getattr(settings, 'DRFSO2_TOKEN_CACHE', 'default')
+DRFSO2_TOKEN_CACHE_SECONDS: int = getattr(settings, 'DRFSO2_TOKEN_CACHE_SECONDS', 300)
+
+# Refresh-token chain compaction, see drf_social_oauth2.token_compaction
+DRFSO2_REFRESH_TOKEN_CHAIN_TAIL: int = getattr(settings, 'DRFSO2_REFRESH_TOKEN_CHAIN_TAIL', 5)
+DRFSO2_REFRESH_TOKEN_COMPACTION_BATCH: int = getattr(
+    settings, 'DRFSO2_REFRESH_TOKEN_COMPACTION_BATCH', 1000
+)
+
+# Sliding access-token expiry, see drf_social_oauth2.sliding_expiry
+DRFSO2_SLIDING_EXPIRY_ENABLED: bool = getattr(
+    settings, 'DRFSO2_SLIDING_EXPIRY_ENABLED', False
+)
+DRFSO2_SLIDING_EXPIRY_THRESHOLD: int = getattr(
+    settings, 'DRFSO2_SLIDING_EXPIRY_THRESHOLD', 300
+)
+DRFSO2_SLIDING_EXPIRY_INTERVAL: int = getattr(
+    settings, 'DRFSO2_SLIDING_EXPIRY_INTERVAL', 60
+)
+DRFSO2_SLIDING_EXPIRY_MAX_AGE: int | None = getattr(
+    settings, 'DRFSO2_SLIDING_EXPIRY_MAX_AGE', 604800
+)
+DRFSO2_SLIDING_EXPIRY_FLUSH_SECONDS: float = getattr(
+    settings, 'DRFSO2_SLIDING_EXPIRY_FLUSH_SECONDS', 5
+)
+DRFSO2_SLIDING_EXPIRY_BATCH_SIZE: int = getattr(
+    settings, 'DRFSO2_SLIDING_EXPIRY_BATCH_SIZE', 500
+)
+
+# Size of the thread pool used by drf_social_oauth2.async_views
+DRFSO2_ASYNC_EXECUTOR_WORKERS: int = getattr(settings, 'DRFSO2_ASYNC_EXECUTOR_WORKERS', 16)
+
+# Per-backend circuit breaker, see drf_social_oauth2.circuit_breaker
+DRFSO2_CIRCUIT_BREAKER_ENABLED: bool = getattr(
+    settings, 'DRFSO2_CIRCUIT_BREAKER_ENABLED', False
+)
+DRFSO2_CIRCUIT_BREAKER_FAILURE_RATE: float = getattr(
+    settings, 'DRFSO2_CIRCUIT_BREAKER_FAILURE_RATE', 0.5
+)
+DRFSO2_CIRCUIT_BREAKER_MINIMUM_CALLS: int = getattr(
+    settings, 'DRFSO2_CIRCUIT_BREAKER_MINIMUM_CALLS', 20
+)
+DRFSO2_CIRCUIT_BREAKER_SLOW_CALL_SECONDS: float = getattr(
+    settings, 'DRFSO2_CIRCUIT_BREAKER_SLOW_CALL_SECONDS', 5
+)
+DRFSO2_CIRCUIT_BREAKER_WINDOW_SECONDS: int = getattr(
+    settings, 'DRFSO2_CIRCUIT_BREAKER_WINDOW_SECONDS', 60
+)
+DRFSO2_CIRCUIT_BREAKER_OPEN_SECONDS: int = getattr(
+    settings, 'DRFSO2_CIRCUIT_BREAKER_OPEN_SECONDS', 30
+)
+DRFSO2_CIRCUIT_BREAKER_CACHE: str = getattr(
+    settings, 'DRFSO2_CIRCUIT_BREAKER_CACHE', 'default'
+)
+DRFSO2_CIRCUIT_BREAKER_BACKENDS: dict[str, dict] = getattr(
+    settings, 'DRFSO2_CIRCUIT_BREAKER_BACKENDS', {}
+)
+
+# On-demand request profiling, see drf_social_oauth2.profiling
+DRFSO2_PROFILING_ENABLED: bool = getattr(settings, 'DRFSO2_PROFILING_ENABLED', False)
+DRFSO2_PROFILING_SAMPLE_RATE: float = getattr(
+    settings, 'DRFSO2_PROFILING_SAMPLE_RATE', 0
+)
+DRFSO2_PROFILING_HEADER: str = getattr(
+    settings, 'DRFSO2_PROFILING_HEADER', 'X-DRFSO2-Profile'
+)
+DRFSO2_PROFILING_SECRET: str | None = getattr(settings, 'DRFSO2_PROFILING_SECRET', None)
+DRFSO2_PROFILING_MAX_AGE: int = getattr(settings, 'DRFSO2_PROFILING_MAX_AGE', 300)
+DRFSO2_PROFILING_DIR: str | None = getattr(settings, 'DRFSO2_PROFILING_DIR', None)
+
+# Per-backend concurrency limits, see drf_social_oauth2.bulkhead
+DRFSO2_BULKHEAD_ENABLED: bool = getattr(settings, 'DRFSO2_BULKHEAD_ENABLED', False)
+DRFSO2_BULKHEAD_MAX_CONCURRENT: int = getattr(
+    settings, 'DRFSO2_BULKHEAD_MAX_CONCURRENT', 10
+)
+DRFSO2_BULKHEAD_QUEUE_TIMEOUT: float = getattr(
+    settings, 'DRFSO2_BULKHEAD_QUEUE_TIMEOUT', 0.5
+)
+DRFSO2_BULKHEAD_NODE_MAX_CONCURRENT: int | None = getattr(
+    settings, 'DRFSO2_BULKHEAD_NODE_MAX_CONCURRENT', None
+)
+DRFSO2_BULKHEAD_CACHE: str = getattr(settings, 'DRFSO2_BULKHEAD_CACHE', 'default')
+DRFSO2_BULKHEAD_LEASE_SECONDS: int = getattr(
+    settings, 'DRFSO2_BULKHEAD_LEASE_SECONDS', 300
+)
+DRFSO2_BULKHEAD_BACKENDS: dict[str, dict] = getattr(
+    settings, 'DRFSO2_BULKHEAD_BACKENDS', {}
+)
+
+# Provider call timeouts, retries and hedging, see drf_social_oauth2.provider_calls
+DRFSO2_PROVIDER_CONNECT_TIMEOUT: float | None = getattr(
+    settings, 'DRFSO2_PROVIDER_CONNECT_TIMEOUT', None
+)
+DRFSO2_PROVIDER_READ_TIMEOUT: float | None = getattr(
+    settings, 'DRFSO2_PROVIDER_READ_TIMEOUT', None
+)
+DRFSO2_PROVIDER_RETRIES: int = getattr(settings, 'DRFSO2_PROVIDER_RETRIES', 0)
+DRFSO2_PROVIDER_RETRY_BACKOFF: float = getattr(
+    settings, 'DRFSO2_PROVIDER_RETRY_BACKOFF', 0.05
+)
+DRFSO2_PROVIDER_RETRY_BUDGET: float = getattr(
+    settings, 'DRFSO2_PROVIDER_RETRY_BUDGET', 0.1
+)
+DRFSO2_PROVIDER_HEDGE: bool = getattr(settings, 'DRFSO2_PROVIDER_HEDGE', False)
+DRFSO2_PROVIDER_HEDGE_DELAY: float | None = getattr(
+    settings, 'DRFSO2_PROVIDER_HEDGE_DELAY', None
+)
+DRFSO2_PROVIDER_BACKENDS: dict[str, dict] = getattr(
+    settings, 'DRFSO2_PROVIDER_BACKENDS', {}
+)
+
+
+def configure_token_generators() -> None:
+    """Point django-oauth-toolkit at the JWT token generators.
+
+    Applied once from DrfSocialOauth2Config.ready() when ACTIVATE_JWT is
+    True, rather than as a side effect of importing this module.
+    """
+    if not getattr(settings, 'ACTIVATE_JWT', False):
+        return
+
+    if DRFSO2_JWT_SIGNING_KEYS:
+        token_generator = 'drf_social_oauth2.signing.generate_signed_token'
+        # Refresh tokens carry no claims, so they do not pass for access tokens.
+        refresh_token_generator = 'drf_social_oauth2.signing.generate_signed_refresh_token'
+    elif DRFSO2_FAST_TOKEN_GENERATOR:
+        token_generator = refresh_token_generator = 'drf_social_oauth2.generate_fast_token'
+    else:
+        token_generator = refresh_token_generator = 'drf_social_oauth2.generate_token'
 
-    oauth2_settings.DEFAULTS[
-        'REFRESH_TOKEN_GENERATOR'
-    ] = 'drf_social_oauth2.generate_token'
+    oauth2_settings.DEFAULTS['ACCESS_TOKEN_GENERATOR'] = token_generator
+    oauth2_settings.DEFAULTS['REFRESH_TOKEN_GENERATOR'] = refresh_token_generator
 
 
 # Refresh Token Rotation Configuration
@@ -0,0 +1,255 @@
+"""
+Asymmetric token signing for drf-social-oauth2.
+
+This module signs JWT tokens with RS256/ES256/EdDSA (and their variants)
+using a set of keys identified by ``kid``. Keys carry an optional activation
+window, so rotation can be scheduled ahead of time, and their public parts
+are published as a JWKS document that resource servers use to verify tokens
+offline.
+
+Access tokens carry the registered claims resource servers check: ``iss``,
+``sub``, ``client_id``, ``scope``, ``iat`` and ``exp``. Refresh tokens only
+carry a random ``token``, so they are not accepted where an access token
+with an expiry is required. A key that stops signing stays published for
+the lifetime of the access tokens it signed last.
+
+Example configuration in settings.py:
+    ACTIVATE_JWT = True
+    DRFSO2_JWT_SIGNING_KEYS = [
+        {
+            'kid': '2026-09',
+            'algorithm': 'RS256',
+            'private_key': RSA_PRIVATE_KEY_PEM,
+            'not_after': '2026-11-01T00:00:00+00:00',
+        },
+        {
+            'kid': '2026-10',
+            'algorithm': 'ES256',
+            'private_key': EC_PRIVATE_KEY_PEM,
+            'not_before': '2026-10-15T00:00:00+00:00',
+        },
+    ]
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from functools import cache
+from secrets import token_urlsafe
+from typing import Any
+from urllib.parse import urlsplit
+
+import jwt
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.dateparse import parse_datetime
+from jwt.algorithms import get_default_algorithms
+from oauth2_provider.settings import oauth2_settings
+
+from drf_social_oauth2.settings import DRFSO2_JWT_ISSUER, DRFSO2_JWT_SIGNING_KEYS
+
+ASYMMETRIC_ALGORITHMS: tuple[str, ...] = (
+    'RS256', 'RS384', 'RS512',
+    'PS256', 'PS384', 'PS512',
+    'ES256', 'ES384', 'ES512',
+    'EdDSA',
+)
+
+
+def _parse_datetime(value: datetime | str | None) -> datetime | None:
+    """Parse an activation bound, treating naive datetimes as UTC."""
+    if value is None:
+        return None
+    parsed = parse_datetime(value) if isinstance(value, str) else value
+    if parsed is None:
+        raise ImproperlyConfigured(f'Invalid signing key datetime: {value!r}.')
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class SigningKey:
+    """A private signing key and its public JWK.
+
+    Args:
+        kid: The key identifier written in the token header.
+        algorithm: One of ASYMMETRIC_ALGORITHMS.
+        private_key: The PEM encoded private key.
+        not_before: When the key starts signing tokens. Keys are published
+            before that, so resource servers learn them ahead of rotation.
+        not_after: When the key stops signing tokens.
+        publish_until: When the key is removed from the JWKS. Defaults to
+            ACCESS_TOKEN_EXPIRE_SECONDS after ``not_after``, so the last
+            tokens it signed can be verified until they expire.
+
+    Raises:
+        ImproperlyConfigured: If the algorithm is unsupported or the key
+            cannot be loaded.
+    """
+
+    def __init__(
+        self,
+        kid: str,
+        algorithm: str,
+        private_key: str | bytes,
+        not_before: datetime | str | None = None,
+        not_after: datetime | str | None = None,
+        publish_until: datetime | str | None = None,
+    ) -> None:
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ImproperlyConfigured(
+                f"Signing key '{kid}' uses unsupported algorithm '{algorithm}'."
+            )
+        algorithm_object = get_default_algorithms().get(algorithm)
+        if algorithm_object is None:
+            raise ImproperlyConfigured(
+                f"Algorithm '{algorithm}' requires the 'cryptography' package."
+            )
+
+        try:
+            self.key = algorithm_object.prepare_key(private_key)
+            jwk: dict[str, Any] = algorithm_object.to_jwk(
+                self.key.public_key(), as_dict=True
+            )
+        except (ValueError, TypeError, jwt.InvalidKeyError) as e:
+            raise ImproperlyConfigured(f"Signing key '{kid}' is invalid: {e}")
+
+        jwk.update(kid=kid, alg=algorithm, use='sig')
+        self.kid = kid
+        self.algorithm = algorithm
+        self.jwk = jwk
+        self.not_before = _parse_datetime(not_before)
+        self.not_after = _parse_datetime(not_after)
+        self.publish_until = _parse_datetime(publish_until)
+        if self.publish_until is None and self.not_after is not None:
+            self.publish_until = self.not_after + timedelta(
+                seconds=oauth2_settings.ACCESS_TOKEN_EXPIRE_SECONDS
+            )
+
+    def is_active(self, now: datetime) -> bool:
+        """Return True if the key may sign tokens at ``now``."""
+        started = self.not_before is None or self.not_before <= now
+        return started and (self.not_after is None or now < self.not_after)
+
+    def is_published(self, now: datetime) -> bool:
+        """Return True if the key belongs in the JWKS at ``now``."""
+        return self.publish_until is None or now < self.publish_until
+
+
+class KeySet:
+    """The configured signing keys.
+
+    The active key with the latest ``not_before`` signs new tokens; every
+    key before its ``publish_until`` is published.
+
+    Args:
+        keys: The signing keys.
+
+    Raises:
+        ImproperlyConfigured: If no key is given or a ``kid`` is repeated.
+    """
+
+    def __init__(self, keys: list[SigningKey]) -> None:
+        if not keys:
+            raise ImproperlyConfigured('At least one signing key is required.')
+        kids = [key.kid for key in keys]
+        if len(kids) != len(set(kids)):
+            raise ImproperlyConfigured('Signing key ids (kid) must be unique.')
+        self.keys = keys
+
+    @classmethod
+    def from_settings(cls, config: list[dict[str, Any]]) -> 'KeySet':
+        """Build a key set from the DRFSO2_JWT_SIGNING_KEYS format."""
+        try:
+            return cls([SigningKey(**key) for key in config])
+        except TypeError as e:
+            raise ImproperlyConfigured(f'Invalid DRFSO2_JWT_SIGNING_KEYS entry: {e}')
+
+    def signing_key(self, now: datetime | None = None) -> SigningKey:
+        """Return the key that signs tokens at ``now``.
+
+        Raises:
+            ImproperlyConfigured: If no key is active.
+        """
+        now = now or datetime.now(tz=timezone.utc)
+        active = [key for key in self.keys if key.is_active(now)]
+        if not active:
+            raise ImproperlyConfigured('No signing key is active.')
+        return max(
+            active,
+            key=lambda key: key.not_before or datetime.min.replace(tzinfo=timezone.utc),
+        )
+
+    def jwks(self, now: datetime | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Return the JWKS document with every published public key."""
+        now = now or datetime.now(tz=timezone.utc)
+        return {'keys': [key.jwk for key in self.keys if key.is_published(now)]}
+
+    def sign(self, payload: dict[str, Any]) -> str:
+        """Sign a payload with the active key, setting ``kid`` in the header."""
+        key = self.signing_key()
+        return jwt.encode(
+            payload, key.key, algorithm=key.algorithm, headers={'kid': key.kid}
+        )
+
+
+@cache
+def get_key_set() -> KeySet:
+    """Return the key set built from DRFSO2_JWT_SIGNING_KEYS.
+
+    Keys are parsed once per process.
+
+    Raises:
+        ImproperlyConfigured: If DRFSO2_JWT_SIGNING_KEYS is empty or invalid.
+    """
+    return KeySet.from_settings(DRFSO2_JWT_SIGNING_KEYS)
+
+
+def _issuer(request: Any) -> str:
+    """Return the ``iss`` claim: the configured issuer or the request origin."""
+    issuer = DRFSO2_JWT_ISSUER or oauth2_settings.OIDC_ISS_ENDPOINT
+    if issuer:
+        return issuer
+    url = urlsplit(request.uri)
+    return f'{url.scheme}://{url.netloc}'
+
+
+def generate_signed_token(request: Any, length: int = 30) -> str:
+    """Generate a non-guessable OAuth JSON Web Token signed asymmetrically.
+
+    Args:
+        request: The oauthlib request the access token is issued for.
+        length: The length of the random token string. Defaults to 30.
+
+    Returns:
+        A JWT-encoded token string carrying the ``kid`` of its signing key,
+        and the issuer, subject, client, scopes and lifetime of the token.
+    """
+    token = token_urlsafe((length * 3 + 3) // 4)[:length]
+    issued_at = int(time.time())
+    expires_in = request.expires_in or oauth2_settings.ACCESS_TOKEN_EXPIRE_SECONDS
+    client = getattr(request, 'client', None)
+    payload: dict[str, Any] = {
+        'token': token,
+        'iss': _issuer(request),
+        'client_id': request.client_id or getattr(client, 'client_id', None),
+        'scope': ' '.join(request.scopes or ()),
+        'iat': issued_at,
+        'exp': issued_at + int(expires_in),
+    }
+    user = getattr(request, 'user', None)
+    if user is not None:
+        payload['sub'] = str(user.pk)
+    return get_key_set().sign(payload)
+
+
+def generate_signed_refresh_token(request: Any, length: int = 30) -> str:
+    """Generate a non-guessable OAuth refresh token signed asymmetrically.
+
+    Args:
+        request: The HTTP request object (unused but required by oauth2_provider).
+        length: The length of the random token string. Defaults to 30.
+
+    Returns:
+        A JWT-encoded token string carrying the ``kid`` of its signing key.
+    """
+    token = token_urlsafe((length * 3 + 3) // 4)[:length]
+    return get_key_set().sign({'token': token})
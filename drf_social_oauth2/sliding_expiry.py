@@ -0,0 +1,186 @@
+"""
+Sliding expiry of access tokens in use.
+
+When DRFSO2_SLIDING_EXPIRY_ENABLED is True, SlidingExpiryAuthentication
+extends the access tokens it authenticates, so that sessions in active use
+do not expire. Writing the token row on every request would make the write
+load follow the request rate, so extensions are coalesced:
+
+- A token is only extended once its remaining lifetime drops below
+  DRFSO2_SLIDING_EXPIRY_THRESHOLD seconds.
+- Extensions are buffered in process and written every
+  DRFSO2_SLIDING_EXPIRY_FLUSH_SECONDS, or once
+  DRFSO2_SLIDING_EXPIRY_BATCH_SIZE tokens are waiting, by one UPDATE per
+  batch setting a common expiry.
+- The UPDATE skips tokens extended less than DRFSO2_SLIDING_EXPIRY_INTERVAL
+  seconds ago, by this or another process, and tokens that would outlive
+  DRFSO2_SLIDING_EXPIRY_MAX_AGE.
+
+Extended tokens expire ACCESS_TOKEN_EXPIRE_SECONDS after the write. The
+threshold must exceed the flush period, or tokens may expire while their
+extension is buffered. Extensions still buffered when a process exits are
+lost, and those tokens expire as issued.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.db import close_old_connections
+from django.utils import timezone
+from oauth2_provider.models import get_access_token_model
+from oauth2_provider.settings import oauth2_settings
+
+from drf_social_oauth2 import metrics
+from drf_social_oauth2.settings import (
+    DRFSO2_SLIDING_EXPIRY_BATCH_SIZE,
+    DRFSO2_SLIDING_EXPIRY_ENABLED,
+    DRFSO2_SLIDING_EXPIRY_FLUSH_SECONDS,
+    DRFSO2_SLIDING_EXPIRY_INTERVAL,
+    DRFSO2_SLIDING_EXPIRY_MAX_AGE,
+    DRFSO2_SLIDING_EXPIRY_THRESHOLD,
+)
+
+log = logging.getLogger(__name__)
+
+
+class ExpiryBuffer:
+    """Buffer of access-token extensions written in batches.
+
+    Args:
+        lifetime: Seconds an extended token stays valid.
+        threshold: Remaining lifetime below which a token is extended.
+        interval: Minimum seconds between two extensions of a token.
+        max_age: Seconds after its creation beyond which a token is not
+            extended, or None.
+        flush_seconds: Seconds between two background writes.
+        batch_size: Maximum tokens per UPDATE, and buffered tokens
+            triggering an immediate write.
+    """
+
+    def __init__(
+        self,
+        lifetime: int,
+        threshold: int = 300,
+        interval: int = 60,
+        max_age: int | None = 604800,
+        flush_seconds: float = 5,
+        batch_size: int = 500,
+    ) -> None:
+        self.lifetime = timedelta(seconds=lifetime)
+        self.threshold = timedelta(seconds=threshold)
+        self.interval = timedelta(seconds=interval)
+        self.max_age = None if max_age is None else timedelta(seconds=max_age)
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self._pending: set[Any] = set()
+        self._lock = threading.Lock()
+        self._flusher: threading.Thread | None = None
+
+    def is_due(self, expires: datetime) -> bool:
+        """Return whether a token expiring at ``expires`` is to be extended."""
+        remaining = expires - timezone.now()
+        return timedelta(0) < remaining < self.threshold
+
+    def touch(self, token: Any) -> bool:
+        """Buffer the extension of a token about to expire.
+
+        Args:
+            token: The access token authenticating the request.
+
+        Returns:
+            True if an extension was buffered.
+        """
+        if not self.is_due(token.expires):
+            return False
+        with self._lock:
+            self._pending.add(token.pk)
+            full = len(self._pending) >= self.batch_size
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._run, name='drfso2-sliding-expiry', daemon=True
+                )
+                self._flusher.start()
+        if full:
+            self.flush()
+        return True
+
+    def flush(self) -> int:
+        """Write the buffered extensions.
+
+        Returns:
+            The number of tokens extended.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        if not pending:
+            return 0
+
+        expires = timezone.now() + self.lifetime
+        tokens = get_access_token_model().objects.filter(
+            expires__lt=expires - self.interval
+        )
+        if self.max_age is not None:
+            tokens = tokens.filter(created__gt=expires - self.max_age)
+        pks = sorted(pending)
+        extended = 0
+        for start in range(0, len(pks), self.batch_size):
+            extended += tokens.filter(
+                pk__in=pks[start:start + self.batch_size]
+            ).update(expires=expires)
+        metrics.SLIDING_EXPIRY_EXTENSIONS.inc(extended)
+        return extended
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_seconds)
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                log.exception('Failed to write sliding token expiries.')
+
+
+_buffer: ExpiryBuffer | None = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer() -> ExpiryBuffer:
+    """Return the extension buffer built from settings."""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = ExpiryBuffer(
+                    oauth2_settings.ACCESS_TOKEN_EXPIRE_SECONDS,
+                    DRFSO2_SLIDING_EXPIRY_THRESHOLD,
+                    DRFSO2_SLIDING_EXPIRY_INTERVAL,
+                    DRFSO2_SLIDING_EXPIRY_MAX_AGE,
+                    DRFSO2_SLIDING_EXPIRY_FLUSH_SECONDS,
+                    DRFSO2_SLIDING_EXPIRY_BATCH_SIZE,
+                )
+    return _buffer
+
+
+def touch(token: Any) -> bool:
+    """Buffer the extension of a token in use, if sliding expiry is enabled.
+
+    Args:
+        token: The access token authenticating the request.
+
+    Returns:
+        True if an extension was buffered.
+    """
+    if not DRFSO2_SLIDING_EXPIRY_ENABLED or token is None:
+        return False
+    return get_buffer().touch(token)
+
+
+def is_due(expires: datetime) -> bool:
+    """Return whether a token expiring at ``expires`` would be extended now.
+
+    Always False when sliding expiry is disabled.
+    """
+    return DRFSO2_SLIDING_EXPIRY_ENABLED and get_buffer().is_due(expires)
@@ -0,0 +1,50 @@
+"""
+Social auth strategies for drf-social-oauth2.
+
+social_django's DjangoStrategy keeps the pipeline state in the Django
+session, so every request authenticated with a social token reads the
+session, and may write it, although bearer and convert-token flows never
+carry a session cookie. When DRFSO2_SESSIONLESS_STRATEGY is True, those flows
+use SessionlessStrategy instead, which keeps that state in memory for the
+current request only, so API nodes can run without the session middleware.
+
+Partial pipelines, which resume in a later request, cannot work without a
+session and must not be used with the sessionless strategy.
+"""
+
+from typing import Any
+
+from social_core.utils import get_strategy
+from social_django.strategy import DjangoStrategy
+from social_django.utils import STORAGE
+from social_django.utils import load_strategy as load_session_strategy
+
+from drf_social_oauth2.settings import DRFSO2_SESSIONLESS_STRATEGY
+
+SESSIONLESS_STRATEGY: str = 'drf_social_oauth2.strategy.SessionlessStrategy'
+
+
+class SessionlessStrategy(DjangoStrategy):
+    """DjangoStrategy whose session is a dict living as long as the strategy.
+
+    Args:
+        storage: The social storage class.
+        request: The Django or DRF request, never read for its session.
+        tpl: The template strategy class.
+    """
+
+    def __init__(self, storage: Any, request: Any = None, tpl: Any = None) -> None:
+        super().__init__(storage, None, tpl)
+        self.request = request
+
+
+def load_strategy(request: Any = None) -> DjangoStrategy:
+    """Return the strategy of the API flows for a request.
+
+    Returns:
+        A SessionlessStrategy when DRFSO2_SESSIONLESS_STRATEGY is True,
+        otherwise the SOCIAL_AUTH_STRATEGY loaded by social_django.
+    """
+    if DRFSO2_SESSIONLESS_STRATEGY:
+        return get_strategy(SESSIONLESS_STRATEGY, STORAGE, request)
+    return load_session_strategy(request)
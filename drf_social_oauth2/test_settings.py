@@ -20,6 +20,7 @@ INSTALLED_APPS = [
     'oauth2_provider',
     'social_django',
     'drf_social_oauth2',
+    'drf_social_oauth2.indexes',
     'rest_framework',
     'rest_framework.authtoken',
 ]
@@ -0,0 +1,186 @@
+"""
+Write-through cache of the access tokens issued by drf-social-oauth2.
+
+When DRFSO2_TOKEN_CACHE_ENABLED is True, every access token issued by
+TokenView and ConvertTokenView is written to the Django cache
+DRFSO2_TOKEN_CACHE once its transaction commits, as a compact record of its
+user id, application id, scopes and expiry. Authentication can then resolve
+a token from the cache, including on the first request after login,
+instead of querying the token table.
+
+Records live at most DRFSO2_TOKEN_CACHE_SECONDS, bounded by the token
+expiry. They are keyed by the SHA-256 checksum django-oauth-toolkit stores
+in ``token_checksum``, so they are dropped whenever an access token row is
+deleted: revocation, InvalidateSessions, the per-user token cap and the
+revocation of a refresh-token family all delete the rows of the tokens
+they invalidate. Refresh tokens are not cached, so deleting them, as
+InvalidateRefreshTokens does, leaves the cache untouched.
+
+Tokens restricted to resources (RFC 8707) are not cached, as their audience
+is checked against each request. A cached token is not checked against
+Application.is_usable(), which the default Application model does not
+override. Expiries extended in place, by sliding expiry, are not written through:
+the cached expiry is then earlier than the stored one, and readers fall
+back to the database once it has passed.
+
+Authentication fills the cache with the tokens it reads from the database,
+for instance those issued before the cache was enabled. Such a fill never
+overwrites a record, and is dropped again if the token row is gone once
+the record is written, so it cannot outlive a revocation committed between
+the read and the write, nor one that runs concurrently with the write.
+"""
+
+import hashlib
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from typing import Any, NamedTuple
+
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from oauth2_provider.models import get_access_token_model
+
+from drf_social_oauth2 import metrics
+from drf_social_oauth2.settings import (
+    DRFSO2_TOKEN_CACHE,
+    DRFSO2_TOKEN_CACHE_ENABLED,
+    DRFSO2_TOKEN_CACHE_SECONDS,
+)
+
+
+class CachedToken(NamedTuple):
+    """The cached record of an access token.
+
+    It offers the scope checks of django-oauth-toolkit's AccessToken, so it
+    can stand for one as ``request.auth``, for instance for TokenHasScope.
+    """
+
+    user_id: Any
+    application_id: Any
+    scope: str
+    expires: datetime
+
+    def is_expired(self) -> bool:
+        return self.expires <= timezone.now()
+
+    def allow_scopes(self, scopes: Any) -> bool:
+        return not scopes or set(scopes).issubset(self.scope.split())
+
+    def is_valid(self, scopes: Any = None) -> bool:
+        return not self.is_expired() and self.allow_scopes(scopes)
+
+
+def checksum(token: str) -> str:
+    """Return the checksum of a token, as django-oauth-toolkit computes it."""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def cache_key(token_checksum: str) -> str:
+    return f'drfso2:token:{token_checksum}'
+
+
+def get(token: str) -> CachedToken | None:
+    """Return the cached record of a token, or None if it is not cached.
+
+    Records of expired tokens are ignored.
+    """
+    if not DRFSO2_TOKEN_CACHE_ENABLED:
+        return None
+    value = caches[DRFSO2_TOKEN_CACHE].get(cache_key(checksum(token)))
+    record = None
+    if value is not None:
+        user_id, application_id, scope, expires = value
+        record = CachedToken(
+            user_id,
+            application_id,
+            scope,
+            datetime.fromtimestamp(expires, tz=dt_timezone.utc),
+        )
+    if record is None or record.is_expired():
+        metrics.CACHE_REQUESTS.inc(cache='token', result='miss')
+        return None
+    metrics.CACHE_REQUESTS.inc(cache='token', result='hit')
+    return record
+
+
+def _ttl(expires: datetime) -> int:
+    """Return the seconds a record expiring at ``expires`` may be cached."""
+    return int(min(float(DRFSO2_TOKEN_CACHE_SECONDS), (expires - timezone.now()).total_seconds()))
+
+
+def store(
+    token: str, user_id: Any, application_id: Any, scope: str, expires: datetime
+) -> None:
+    """Cache the record of an access token once the transaction commits."""
+    if not DRFSO2_TOKEN_CACHE_ENABLED:
+        return
+    ttl = _ttl(expires)
+    if ttl < 1:
+        return
+    key = cache_key(checksum(token))
+    value = (user_id, application_id, scope, expires.timestamp())
+    transaction.on_commit(lambda: caches[DRFSO2_TOKEN_CACHE].set(key, value, ttl))
+
+
+def store_token(access_token: Any) -> None:
+    """Cache the record of a saved AccessToken.
+
+    Tokens restricted to resources (RFC 8707) are not cached, as their
+    audience is checked against the request by django-oauth-toolkit.
+    """
+    if access_token.resource:
+        return
+    store(
+        access_token.token,
+        access_token.user_id,
+        access_token.application_id,
+        access_token.scope,
+        access_token.expires,
+    )
+
+
+def fill(access_token: Any) -> None:
+    """Cache the record of an AccessToken read from the database.
+
+    Unlike store_token(), which caches tokens as they are issued, the record
+    is only added if none is cached, and is dropped again if the token row
+    was deleted in the meantime, so that a concurrent revocation always
+    wins.
+    """
+    if not DRFSO2_TOKEN_CACHE_ENABLED or access_token.resource:
+        return
+    ttl = _ttl(access_token.expires)
+    if ttl < 1:
+        return
+    key = cache_key(checksum(access_token.token))
+    value = (
+        access_token.user_id,
+        access_token.application_id,
+        access_token.scope,
+        access_token.expires.timestamp(),
+    )
+
+    def add() -> None:
+        cache = caches[DRFSO2_TOKEN_CACHE]
+        if not cache.add(key, value, ttl):
+            return
+        # A revocation committed before add() has already run forget(), so
+        # look the row up again; one committed after this lookup runs
+        # forget() after add().
+        if not get_access_token_model().objects.filter(pk=access_token.pk).exists():
+            cache.delete(key)
+
+    transaction.on_commit(add)
+
+
+def forget(token_checksum: str, using: str | None = None) -> None:
+    """Drop the record of a token once the transaction commits."""
+    if not DRFSO2_TOKEN_CACHE_ENABLED or not token_checksum:
+        return
+    key = cache_key(token_checksum)
+    transaction.on_commit(lambda: caches[DRFSO2_TOKEN_CACHE].delete(key), using=using)
+
+
+def forget_deleted(sender: Any, instance: Any, using: str, **kwargs: Any) -> None:
+    """post_delete receiver dropping the record of a deleted access token."""
+    forget(instance.token_checksum, using)
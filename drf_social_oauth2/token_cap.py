@@ -0,0 +1,88 @@
+"""
+Cap on the tokens a user holds per application.
+
+Nothing else limits how many access and refresh tokens a user accumulates
+for an application, so misbehaving clients that log in again and again grow
+the token tables without bound. When DRFSO2_MAX_TOKENS_PER_USER is set,
+every token issued by the token and convert-token endpoints evicts the
+oldest tokens of its user and application beyond the cap, in the
+transaction saving the new token.
+
+Each eviction deletes at most DRFSO2_TOKEN_EVICTION_BATCH rows per table,
+oldest first, by primary key. Over a few issuances an over-cap user is
+brought back to the cap, while no single request deletes an unbounded
+number of rows.
+"""
+
+import logging
+from typing import Any
+
+from oauth2_provider.models import AccessToken, Application, RefreshToken
+
+from drf_social_oauth2.settings import (
+    DRFSO2_MAX_TOKENS_PER_USER,
+    DRFSO2_TOKEN_EVICTION_BATCH,
+)
+
+log = logging.getLogger(__name__)
+
+
+def _evict(queryset: Any, keep: int, batch: int) -> int:
+    newest = list(
+        queryset.order_by('-created', '-pk').values_list('pk', flat=True)[:keep]
+    )
+    stale = list(
+        queryset.exclude(pk__in=newest)
+        .order_by('created', 'pk')
+        .values_list('pk', flat=True)[:batch]
+    )
+    if not stale:
+        return 0
+    deleted, _ = queryset.model.objects.filter(pk__in=stale).delete()
+    return deleted
+
+
+def evict_tokens(user: Any, application: Application, keep: int, batch: int) -> int:
+    """Delete the oldest tokens of a user and application beyond ``keep``.
+
+    Revoked refresh tokens, kept for the reuse detection of rotated tokens,
+    are neither counted nor deleted.
+
+    Args:
+        user: The user the tokens were issued to.
+        application: The application the tokens were issued for.
+        keep: Tokens of each kind to keep.
+        batch: Maximum tokens of each kind deleted by one call.
+
+    Returns:
+        The number of rows deleted.
+    """
+    deleted = _evict(
+        AccessToken.objects.filter(user=user, application=application), keep, batch
+    )
+    deleted += _evict(
+        RefreshToken.objects.filter(
+            user=user, application=application, revoked__isnull=True
+        ),
+        keep,
+        batch,
+    )
+    if deleted:
+        log.debug('Evicted %d tokens of user %r for %r.', deleted, user, application)
+    return deleted
+
+
+def enforce(user: Any, application: Application | None) -> int:
+    """Evict the tokens of a user beyond DRFSO2_MAX_TOKENS_PER_USER.
+
+    Tokens issued without a user, by the client credentials grant, are not
+    capped.
+
+    Returns:
+        The number of rows deleted.
+    """
+    if DRFSO2_MAX_TOKENS_PER_USER is None or user is None or application is None:
+        return 0
+    return evict_tokens(
+        user, application, DRFSO2_MAX_TOKENS_PER_USER, DRFSO2_TOKEN_EVICTION_BATCH
+    )
@@ -0,0 +1,94 @@
+"""
+Compaction of rotated refresh-token chains.
+
+With ROTATE_REFRESH_TOKEN, every refresh revokes the refresh token used and
+issues a new one in the same token family. django-oauth-toolkit keeps the
+revoked tokens until they expire, so that a replayed token is recognized and
+its family revoked, and long-lived sessions build chains of thousands of
+rows.
+
+compact_refresh_tokens() keeps, for each family, the live tokens, the
+DRFSO2_REFRESH_TOKEN_CHAIN_TAIL most recently revoked ones, and the tokens
+still in their REFRESH_TOKEN_GRACE_PERIOD_SECONDS, and deletes the others in
+batches of DRFSO2_REFRESH_TOKEN_COMPACTION_BATCH. Replaying a token of the
+tail still revokes the family; an older token is simply rejected as unknown.
+Tokens issued before token families existed are left alone.
+
+Run it periodically with the compact_refresh_tokens management command.
+"""
+
+import logging
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import Any
+
+from django.db.models import Count
+from django.utils import timezone
+from oauth2_provider.models import get_refresh_token_model
+from oauth2_provider.settings import oauth2_settings
+
+from drf_social_oauth2.settings import (
+    DRFSO2_REFRESH_TOKEN_CHAIN_TAIL,
+    DRFSO2_REFRESH_TOKEN_COMPACTION_BATCH,
+)
+
+log = logging.getLogger(__name__)
+
+
+def _delete(model: Any, rows: list[tuple[Any, Any]], reclaimed: Counter) -> None:
+    model.objects.filter(pk__in=[pk for pk, _ in rows]).delete()
+    reclaimed.update(application_id for _, application_id in rows)
+    log.debug('Deleted %d rotated refresh tokens.', len(rows))
+
+
+def compact_refresh_tokens(
+    tail: int = DRFSO2_REFRESH_TOKEN_CHAIN_TAIL,
+    batch: int = DRFSO2_REFRESH_TOKEN_COMPACTION_BATCH,
+    sleep: float = 0,
+) -> Counter:
+    """Delete the revoked refresh tokens of each family beyond its tail.
+
+    Args:
+        tail: Revoked tokens kept per family for reuse detection.
+        batch: Maximum tokens deleted by one query.
+        sleep: Seconds to wait between two batches.
+
+    Returns:
+        The number of tokens deleted, by application id.
+    """
+    RefreshToken = get_refresh_token_model()
+    revoked = RefreshToken.objects.filter(
+        token_family__isnull=False, revoked__isnull=False
+    )
+    grace_cutoff = timezone.now() - timedelta(
+        seconds=oauth2_settings.REFRESH_TOKEN_GRACE_PERIOD_SECONDS
+    )
+    families = (
+        revoked.order_by()
+        .values('token_family')
+        .annotate(revoked_count=Count('pk'))
+        .filter(revoked_count__gt=tail)
+        .values_list('token_family', flat=True)
+    )
+
+    reclaimed: Counter = Counter()
+    pending: list[tuple[Any, Any]] = []
+    for family in families.iterator():
+        stale = (
+            revoked.filter(token_family=family)
+            .order_by('-revoked', '-pk')
+            .values_list('pk', 'application_id', 'revoked')[tail:]
+        )
+        pending.extend(
+            (pk, application_id)
+            for pk, application_id, revoked_at in stale
+            if revoked_at <= grace_cutoff
+        )
+        while len(pending) >= batch:
+            _delete(RefreshToken, pending[:batch], reclaimed)
+            pending = pending[batch:]
+            time.sleep(sleep)
+    if pending:
+        _delete(RefreshToken, pending, reclaimed)
+    return reclaimed
@@ -0,0 +1,137 @@
+"""
+Optional OpenTelemetry tracing for drf-social-oauth2.
+
+When DRFSO2_TRACING_ENABLED is True and the ``opentelemetry-api`` package is
+installed, the convert-token pipeline emits spans for the view, the oauthlib
+backend and server, the grant validation and the social backend calls.
+Spans carry the ``drfso2.backend``, ``drfso2.client_id`` and
+``drfso2.outcome`` attributes. Otherwise the decorators return the wrapped
+functions unchanged and the helpers do nothing, so tracing adds no overhead.
+"""
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any
+
+from drf_social_oauth2 import __version__
+from drf_social_oauth2.settings import DRFSO2_TRACING_ENABLED
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:  # pragma: no cover - optional dependency
+    propagate = trace = None
+
+ATTRIBUTE_PREFIX: str = 'drfso2.'
+
+_NULL_CONTEXT = nullcontext()
+
+
+def _get_tracer() -> Any:
+    if not DRFSO2_TRACING_ENABLED or trace is None:
+        return None
+    return trace.get_tracer('drf_social_oauth2', __version__)
+
+
+tracer = _get_tracer()
+
+
+def _attributes(attributes: dict[str, Any]) -> dict[str, Any]:
+    return {
+        ATTRIBUTE_PREFIX + key: value
+        for key, value in attributes.items()
+        if value is not None
+    }
+
+
+def span(name: str, **attributes: Any) -> AbstractContextManager:
+    """Return a context manager running its block in a new span.
+
+    Args:
+        name: The span name.
+        **attributes: Attributes set on the span, prefixed with ``drfso2.``.
+    """
+    if tracer is None:
+        return _NULL_CONTEXT
+    return tracer.start_as_current_span(name, attributes=_attributes(attributes))
+
+
+def set_attributes(**attributes: Any) -> None:
+    """Set attributes, prefixed with ``drfso2.``, on the current span."""
+    if tracer is None:
+        return
+    trace.get_current_span().set_attributes(_attributes(attributes))
+
+
+def inject_headers(headers: dict[str, str] | None = None) -> dict[str, str]:
+    """Add the trace context propagation headers for an outgoing request.
+
+    Args:
+        headers: The request headers. A new dict is used when omitted.
+
+    Returns:
+        The headers, unchanged when tracing is disabled.
+    """
+    headers = dict(headers or {})
+    if tracer is not None:
+        propagate.inject(headers)
+    return headers
+
+
+def _record_outcome(current: Any, result: Any) -> None:
+    status = getattr(result, 'status_code', None)
+    if status is None and isinstance(result, tuple) and result:
+        # oauthlib style (..., status) responses
+        status = result[-1] if isinstance(result[-1], int) else None
+    if status is not None:
+        current.set_attribute('http.response.status_code', status)
+    outcome = 'error' if status is not None and status >= 400 else 'ok'
+    current.set_attribute(ATTRIBUTE_PREFIX + 'outcome', outcome)
+
+
+def traced(name: str) -> Callable:
+    """Decorate a function to run in a span recording its outcome.
+
+    The ``drfso2.outcome`` attribute is ``ok`` when the function returns
+    and the exception class name when it raises. Responses with an error
+    status code also set ``drfso2.outcome`` to ``error``. Coroutine
+    functions are awaited inside the span.
+
+    When tracing is disabled the function is returned unchanged.
+
+    Args:
+        name: The span name.
+    """
+    def decorator(function: Callable) -> Callable:
+        if tracer is None:
+            return function
+
+        if iscoroutinefunction(function):
+            @wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with tracer.start_as_current_span(name) as current:
+                    try:
+                        result = await function(*args, **kwargs)
+                    except Exception as e:
+                        current.set_attribute(ATTRIBUTE_PREFIX + 'outcome', type(e).__name__)
+                        raise
+                    _record_outcome(current, result)
+                    return result
+
+            return async_wrapper
+
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.start_as_current_span(name) as current:
+                try:
+                    result = function(*args, **kwargs)
+                except Exception as e:
+                    current.set_attribute(ATTRIBUTE_PREFIX + 'outcome', type(e).__name__)
+                    raise
+                _record_outcome(current, result)
+                return result
+
+        return wrapper
+
+    return decorator
@@ -6,13 +6,15 @@ token generation, conversion, revocation, and session management.
 """
 
 from django.urls import include, re_path
-from oauth2_provider.views import AuthorizationView
+from oauth2_provider.views import AuthorizationView, IntrospectTokenView
 
 from drf_social_oauth2.views import (
     ConvertTokenView,
     DisconnectBackendView,
     InvalidateRefreshTokens,
     InvalidateSessions,
+    JwksView,
+    MetricsView,
     RevokeTokenView,
     TokenView,
 )
@@ -22,6 +24,7 @@ app_name = 'drf'
 urlpatterns = [
     re_path(r'^authorize/?$', AuthorizationView.as_view(), name='authorize'),
     re_path(r'^token/?$', TokenView.as_view(), name='token'),
+    re_path(r'^introspect/?$', IntrospectTokenView.as_view(), name='introspect'),
     re_path('', include('social_django.urls', namespace='social')),
     re_path(r'^convert-token/?$', ConvertTokenView.as_view(), name='convert_token'),
     re_path(r'^revoke-token/?$', RevokeTokenView.as_view(), name='revoke_token'),
@@ -40,4 +43,6 @@ urlpatterns = [
         DisconnectBackendView.as_view(),
         name='disconnect_backend',
     ),
+    re_path(r'^\.well-known/jwks\.json$', JwksView.as_view(), name='jwks'),
+    re_path(r'^metrics/?$', MetricsView.as_view(), name='metrics'),
 ]
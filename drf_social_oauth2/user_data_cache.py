@@ -0,0 +1,148 @@
+"""
+Caching of the user data returned by social providers.
+
+When DRFSO2_USER_DATA_CACHE_ENABLED is True, the ``user_data`` responses of
+GoogleIdentityBackend and LinkedInOpenIDUserInfo are stored in the Django
+cache DRFSO2_USER_DATA_CACHE, so a token verified by one endpoint or node is
+not sent to the provider again while the response is cached. Entries are
+keyed by an HMAC of the backend and the token, and live at most
+DRFSO2_USER_DATA_CACHE_SECONDS, bounded by the ``exp`` or ``expires_in``
+of the response.
+
+With DRFSO2_USER_DATA_CACHE_ENCRYPT, values are encrypted with Fernet under
+a key derived from the token, so entries of a shared cache can only be read
+by someone who holds the token.
+
+Backends of other providers can use the ``cached`` decorator on their own
+``user_data`` method.
+"""
+
+import base64
+import json
+import time
+from collections.abc import Callable
+from functools import wraps
+from typing import Any
+
+from cryptography.fernet import Fernet, InvalidToken
+from django.core.cache import caches
+from django.utils.crypto import salted_hmac
+
+from drf_social_oauth2 import metrics
+from drf_social_oauth2.settings import (
+    DRFSO2_USER_DATA_CACHE,
+    DRFSO2_USER_DATA_CACHE_ENABLED,
+    DRFSO2_USER_DATA_CACHE_ENCRYPT,
+    DRFSO2_USER_DATA_CACHE_SECONDS,
+)
+
+KEY_SALT: str = 'drf_social_oauth2.user_data_cache.key'
+ENCRYPTION_SALT: str = 'drf_social_oauth2.user_data_cache.encryption'
+
+
+def cache_key(backend: str, token: str) -> str:
+    """Return the cache key of a token, which does not reveal the token."""
+    digest = salted_hmac(KEY_SALT, f'{backend}:{token}', algorithm='sha256')
+    return f'drfso2:user_data:{digest.hexdigest()}'
+
+
+def get_ttl(response: dict[str, Any], now: float | None = None) -> int:
+    """Return how long a response may be cached, bounded by its expiry.
+
+    Args:
+        response: The user data returned by the provider.
+        now: The current time as a UNIX timestamp.
+
+    Returns:
+        The number of seconds, 0 if the response must not be cached.
+    """
+    now = time.time() if now is None else now
+    ttl = float(DRFSO2_USER_DATA_CACHE_SECONDS)
+    for claim, remaining in (
+        ('exp', lambda value: float(value) - now),
+        ('expires_in', float),
+    ):
+        if claim in response:
+            try:
+                ttl = min(ttl, remaining(response[claim]))
+            except (TypeError, ValueError):
+                return 0
+    return max(int(ttl), 0)
+
+
+class UserDataCache:
+    """A cache of provider responses keyed by backend and token.
+
+    Args:
+        cache: Alias of the Django cache storing the responses.
+        encrypt: Whether values are encrypted with a key derived from the
+            token.
+    """
+
+    def __init__(self, cache: str = 'default', encrypt: bool = True) -> None:
+        self.cache = caches[cache]
+        self.encrypt = encrypt
+
+    def get(self, backend: str, token: str) -> dict[str, Any] | None:
+        """Return the cached response for a token, or None."""
+        value = self.cache.get(cache_key(backend, token))
+        if value is not None and self.encrypt:
+            try:
+                value = json.loads(self._fernet(token).decrypt(value))
+            except InvalidToken:
+                value = None
+        metrics.CACHE_REQUESTS.inc(
+            cache='user_data', result='miss' if value is None else 'hit'
+        )
+        return value
+
+    def set(self, backend: str, token: str, response: dict[str, Any]) -> None:
+        """Cache the response for a token, unless it has already expired."""
+        ttl = get_ttl(response)
+        if not ttl:
+            return
+        value: Any = response
+        if self.encrypt:
+            value = self._fernet(token).encrypt(json.dumps(response).encode())
+        self.cache.set(cache_key(backend, token), value, timeout=ttl)
+
+    @staticmethod
+    def _fernet(token: str) -> Fernet:
+        secret = salted_hmac(ENCRYPTION_SALT, token, algorithm='sha256').digest()
+        return Fernet(base64.urlsafe_b64encode(secret))
+
+
+_user_data_cache: UserDataCache | None = None
+
+
+def get_user_data_cache() -> UserDataCache:
+    """Return the cache built from settings."""
+    global _user_data_cache
+    if _user_data_cache is None:
+        _user_data_cache = UserDataCache(
+            DRFSO2_USER_DATA_CACHE, DRFSO2_USER_DATA_CACHE_ENCRYPT
+        )
+    return _user_data_cache
+
+
+def cached(user_data: Callable[..., dict[str, Any]]) -> Callable[..., dict[str, Any]]:
+    """Decorate a backend ``user_data`` method to cache its responses.
+
+    Errors raised by the method are not cached. When the cache is disabled
+    the method is returned unchanged.
+    """
+    if not DRFSO2_USER_DATA_CACHE_ENABLED:
+        return user_data
+
+    @wraps(user_data)
+    def wrapper(
+        backend: Any, access_token: str, *args: Any, **kwargs: Any
+    ) -> dict[str, Any]:
+        cache = get_user_data_cache()
+        response = cache.get(backend.name, access_token)
+        if response is None:
+            response = user_data(backend, access_token, *args, **kwargs)
+            cache.set(backend.name, access_token, response)
+        return response
+
+    return wrapper
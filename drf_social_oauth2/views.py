@@ -8,12 +8,16 @@ This module provides API views for OAuth2 token operations including:
 - Backend disconnection
 """
 
+import hmac
 import logging
 from json import loads as json_loads
 from typing import Any
 
 from django.contrib.auth.models import AbstractBaseUser
+from django.core.exceptions import ImproperlyConfigured
 from django.db import IntegrityError
+from django.db.models import QuerySet
+from django.http import Http404, HttpResponse
 from django.urls import reverse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -37,17 +41,33 @@ from rest_framework.status import (
 )
 from rest_framework.views import APIView
 from social_core.exceptions import MissingBackend
-from social_django.utils import load_backend, load_strategy
+from social_django.utils import load_backend
 
+from drf_social_oauth2 import metrics, profiling, tracing
 from drf_social_oauth2.oauth2_backends import KeepRequestCore
 from drf_social_oauth2.oauth2_endpoints import SocialTokenServer
+from drf_social_oauth2.oauth2_validators import (
+    PasswordPoolValidator,
+    TrustedClientValidator,
+    trusted_client,
+)
 from drf_social_oauth2.serializers import (
     ConvertTokenSerializer,
     DisconnectBackendSerializer,
     InvalidateRefreshTokenSerializer,
     InvalidateSessionsSerializer,
     RevokeTokenSerializer,
+    get_user_fields,
+    get_user_serializer_class,
+)
+from drf_social_oauth2.settings import (
+    DRFSO2_JWKS_MAX_AGE,
+    DRFSO2_JWT_SIGNING_KEYS,
+    DRFSO2_METRICS_ENABLED,
+    DRFSO2_METRICS_TOKEN,
 )
+from drf_social_oauth2.signing import get_key_set
+from drf_social_oauth2.strategy import load_strategy
 
 logger = logging.getLogger(__package__)
 
@@ -74,6 +94,16 @@ def get_application(validated_data: dict[str, Any]) -> Application | None:
     return application
 
 
+def user_token_queryset() -> QuerySet[AccessToken]:
+    """Return access tokens joined with the columns of their user that the
+    user payload serializer reads."""
+    queryset = AccessToken.objects.select_related('user')
+    fields = get_user_fields()
+    if fields is not None:
+        queryset = queryset.only('user', *(f'user__{field}' for field in fields))
+    return queryset
+
+
 class CsrfExemptMixin:
     """Mixin that exempts the view from CSRF requirements.
 
@@ -97,10 +127,12 @@ class TokenView(CsrfExemptMixin, OAuthLibMixin, APIView):
     """
 
     server_class = oauth2_settings.OAUTH2_SERVER_CLASS
-    validator_class = oauth2_settings.OAUTH2_VALIDATOR_CLASS
+    validator_class = PasswordPoolValidator
     oauthlib_backend_class = oauth2_settings.OAUTH2_BACKEND_CLASS
     permission_classes = (AllowAny,)
 
+    @metrics.instrument('token')
+    @profiling.profiled('token')
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Handle POST request to generate access tokens.
 
@@ -140,40 +172,95 @@ class ConvertTokenView(CsrfExemptMixin, OAuthLibMixin, APIView):
     """
 
     server_class = SocialTokenServer
-    validator_class = oauth2_settings.OAUTH2_VALIDATOR_CLASS
+    validator_class = TrustedClientValidator
     oauthlib_backend_class = KeepRequestCore
     permission_classes = (AllowAny,)
 
     def get_user(self, access_token: str) -> AbstractBaseUser | None:
         """Retrieve the user associated with an access token.
 
+        Only the user columns read by the user payload serializer are
+        loaded, in the same query as the token, when it allows it.
+
         Args:
             access_token: The access token string.
 
         Returns:
             The user object if found, None otherwise.
         """
-        token = AccessToken.objects.filter(token=access_token).first()
+        token = user_token_queryset().filter(token=access_token).first()
         return token.user if token else None
 
-    def prepare_response(self, data: dict[str, Any]) -> dict[str, Any]:
+    def prepare_response(
+        self, data: dict[str, Any], user: AbstractBaseUser | None = None
+    ) -> dict[str, Any]:
         """Add user information to the response data.
 
         Args:
             data: The response data dictionary.
+            user: The user the token was issued to, if already loaded.
 
         Returns:
             The response data with user information added if available.
         """
-        user = self.get_user(data.get('access_token'))
+        serializer_class = get_user_serializer_class()
+        if serializer_class is None or 'access_token' not in data:
+            return data
+        user = user or self.get_user(data['access_token'])
         if user:
-            data['user'] = {
-                'email': user.email,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-            }
+            data['user'] = serializer_class(user).data
         return data
 
+    def token_error_response(self, exc: Exception) -> Response:
+        """Turn an exception raised while creating the token into a response.
+
+        Must be called from the ``except`` block handling ``exc``.
+
+        Args:
+            exc: The exception raised by create_token_response.
+
+        Returns:
+            Response describing the error.
+        """
+        if isinstance(exc, InvalidClientError):
+            return Response(
+                data={'invalid_client': 'Missing client type.'},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        if isinstance(exc, (MissingClientIdError, InvalidRequestError)):
+            return Response(
+                data={'invalid_request': exc.description},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        if isinstance(exc, UnsupportedGrantTypeError):
+            return Response(
+                data={'unsupported_grant_type': 'Missing grant type.'},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        if isinstance(exc, AccessDeniedError):
+            return Response(
+                {'access_denied': 'The token you provided is invalid or expired.'},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        if isinstance(exc, IntegrityError):
+            if 'email' in str(exc) and 'already exists' in str(exc):
+                return Response(
+                    {'error': 'A user with this email already exists.'},
+                    status=HTTP_400_BAD_REQUEST,
+                )
+            return Response(
+                {'error': 'Database error.'},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        logger.exception('Unexpected error during token conversion')
+        return Response(
+            {'error': 'An unexpected error occurred.'},
+            status=HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    @metrics.instrument('convert_token')
+    @profiling.profiled('convert_token')
+    @tracing.traced('ConvertTokenView.post')
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Handle POST request to convert a social provider token.
 
@@ -191,10 +278,16 @@ class ConvertTokenView(CsrfExemptMixin, OAuthLibMixin, APIView):
                 'client_secret is present in the request data. '
                 'Consider removing it for better security.'
             )
-        serializer = ConvertTokenSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        with metrics.STAGE_LATENCY.time(endpoint='convert_token', stage='serializer'):
+            serializer = ConvertTokenSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+        tracing.set_attributes(
+            backend=serializer.validated_data['backend'],
+            client_id=serializer.validated_data['client_id'],
+        )
 
-        application = get_application(serializer.validated_data)
+        with metrics.STAGE_LATENCY.time(endpoint='convert_token', stage='application'):
+            application = get_application(serializer.validated_data)
         if not application:
             return Response(
                 {"detail": "The application for this client_id does not exist."},
@@ -207,51 +300,18 @@ class ConvertTokenView(CsrfExemptMixin, OAuthLibMixin, APIView):
             request._request.POST[key] = value
 
         try:
-            url, headers, body, status = self.create_token_response(request._request)
-        except InvalidClientError:
-            return Response(
-                data={'invalid_client': 'Missing client type.'},
-                status=HTTP_400_BAD_REQUEST,
-            )
-        except MissingClientIdError as ex:
-            return Response(
-                data={'invalid_request': ex.description},
-                status=HTTP_400_BAD_REQUEST,
-            )
-        except InvalidRequestError as ex:
-            return Response(
-                data={'invalid_request': ex.description},
-                status=HTTP_400_BAD_REQUEST,
-            )
-        except UnsupportedGrantTypeError:
-            return Response(
-                data={'unsupported_grant_type': 'Missing grant type.'},
-                status=HTTP_400_BAD_REQUEST,
-            )
-        except AccessDeniedError:
-            return Response(
-                {'access_denied': 'The token you provided is invalid or expired.'},
-                status=HTTP_400_BAD_REQUEST,
-            )
-        except IntegrityError as e:
-            if 'email' in str(e) and 'already exists' in str(e):
-                return Response(
-                    {'error': 'A user with this email already exists.'},
-                    status=HTTP_400_BAD_REQUEST,
-                )
-            else:
-                return Response(
-                    {'error': 'Database error.'},
-                    status=HTTP_400_BAD_REQUEST,
-                )
-        except Exception:
-            logger.exception('Unexpected error during token conversion')
-            return Response(
-                {'error': 'An unexpected error occurred.'},
-                status=HTTP_500_INTERNAL_SERVER_ERROR,
+            with (
+                metrics.STAGE_LATENCY.time(endpoint='convert_token', stage='token_response'),
+                trusted_client(application),
+            ):
+                url, headers, body, status = self.create_token_response(request._request)
+        except Exception as e:
+            return self.token_error_response(e)
+
+        with metrics.STAGE_LATENCY.time(endpoint='convert_token', stage='prepare_response'):
+            data = self.prepare_response(
+                json_loads(body), getattr(request._request, 'token_user', None)
             )
-
-        data = self.prepare_response(json_loads(body))
         return Response(data, status=status)
 
 
@@ -263,10 +323,12 @@ class RevokeTokenView(CsrfExemptMixin, OAuthLibMixin, APIView):
     """
 
     server_class = oauth2_settings.OAUTH2_SERVER_CLASS
-    validator_class = oauth2_settings.OAUTH2_VALIDATOR_CLASS
+    validator_class = TrustedClientValidator
     oauthlib_backend_class = oauth2_settings.OAUTH2_BACKEND_CLASS
     permission_classes = (IsAuthenticated,)
 
+    @metrics.instrument('revoke_token')
+    @profiling.profiled('revoke_token')
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Handle POST request to revoke a token.
 
@@ -303,7 +365,8 @@ class RevokeTokenView(CsrfExemptMixin, OAuthLibMixin, APIView):
         for key, value in serializer.validated_data.items():
             request._request.POST[key] = value
 
-        url, headers, body, status = self.create_revocation_response(request._request)
+        with trusted_client(application):
+            url, headers, body, status = self.create_revocation_response(request._request)
         return Response(
             data=json_loads(body) if body else '', status=status if body else 204
         )
@@ -326,6 +389,8 @@ class InvalidateSessions(APIView):
         """
         return self.request.user
 
+    @metrics.instrument('invalidate_sessions')
+    @profiling.profiled('invalidate_sessions')
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Handle POST request to invalidate all sessions.
 
@@ -372,6 +437,8 @@ class InvalidateRefreshTokens(APIView):
         """
         return self.request.user
 
+    @metrics.instrument('invalidate_refresh_tokens')
+    @profiling.profiled('invalidate_refresh_tokens')
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Handle POST request to invalidate all refresh tokens.
 
@@ -419,6 +486,8 @@ class DisconnectBackendView(APIView):
         """
         return self.request.user
 
+    @metrics.instrument('disconnect_backend')
+    @profiling.profiled('disconnect_backend')
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Handle POST request to disconnect a social backend.
 
@@ -450,3 +519,76 @@ class DisconnectBackendView(APIView):
             user=self.get_object(), association_id=association_id, **kwargs
         )
         return Response(status=HTTP_204_NO_CONTENT)
+
+
+class JwksView(APIView):
+    """Endpoint publishing the public token signing keys as a JWKS document.
+
+    Resource servers use it to verify tokens signed with
+    DRFSO2_JWT_SIGNING_KEYS offline. Keys scheduled for rotation are
+    published before they start signing, so the response can be cached for
+    DRFSO2_JWKS_MAX_AGE seconds. Returns 404 when no signing key is
+    configured.
+    """
+
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Handle GET request to fetch the JWKS document.
+
+        Args:
+            request: The DRF request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Response containing the published keys.
+        """
+        try:
+            key_set = get_key_set()
+        except ImproperlyConfigured:
+            if not DRFSO2_JWT_SIGNING_KEYS:
+                raise Http404
+            raise
+        response = Response(key_set.jwks())
+        response['Cache-Control'] = f'public, max-age={DRFSO2_JWKS_MAX_AGE}'
+        return response
+
+
+class MetricsView(APIView):
+    """Endpoint exposing the package metrics in the Prometheus text format.
+
+    Returns 404 unless DRFSO2_METRICS_ENABLED is True. When
+    DRFSO2_METRICS_TOKEN is set, scrapers must send it as
+    ``Authorization: Bearer <token>``.
+    """
+
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        """Handle GET request to scrape the metrics.
+
+        Args:
+            request: The DRF request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Plain text response with every metric.
+        """
+        if not DRFSO2_METRICS_ENABLED:
+            raise Http404
+
+        if DRFSO2_METRICS_TOKEN:
+            auth_header: str = request.META.get('HTTP_AUTHORIZATION', '')
+            # compare_digest only accepts ASCII strings, so compare bytes.
+            expected = f'Bearer {DRFSO2_METRICS_TOKEN}'.encode()
+            if not hmac.compare_digest(auth_header.encode(), expected):
+                return HttpResponse(status=401)
+
+        return HttpResponse(
+            metrics.registry.expose(),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
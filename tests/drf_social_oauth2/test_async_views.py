@@ -0,0 +1,93 @@
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import PropertyMock
+
+from asgiref.sync import async_to_sync
+from oauth2_provider.models import AccessToken
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from drf_social_oauth2 import async_urls, async_views
+from drf_social_oauth2.async_views import (
+    AsyncConvertTokenView,
+    AsyncInvalidateSessions,
+    run_blocking,
+)
+from tests.conftest import save
+
+
+def call(view_class, request):
+    response = async_to_sync(view_class.as_view())(request)
+    return response.render()
+
+
+def post(path, data):
+    return APIRequestFactory().post(path, data, format='json')
+
+
+def test_views_are_async():
+    for pattern in async_urls.urlpatterns:
+        view_class = getattr(pattern.callback, 'cls', None)
+        if view_class is not None and view_class.__module__ == async_views.__name__:
+            assert view_class.view_is_async
+
+
+def test_run_blocking_uses_executor():
+    thread_name = async_to_sync(run_blocking)(lambda: threading.current_thread().name)
+
+    assert thread_name.startswith('drfso2-async')
+
+
+def test_convert_token(mocker, user, application):
+    mocker.patch('drf_social_oauth2.oauth2_endpoints.SocialTokenGrant.validate_token_request')
+    request_validator = mocker.Mock()
+    request_validator.save_token = save
+    mocker.patch(
+        'drf_social_oauth2.oauth2_endpoints.SocialTokenGrant.request_validator',
+        new_callable=PropertyMock,
+        return_value=request_validator,
+    )
+
+    response = call(AsyncConvertTokenView, post('/convert-token', {
+        'grant_type': 'convert_token',
+        'backend': 'facebook',
+        'client_id': 'id',
+        'token': 'token',
+    }))
+
+    assert response.status_code == 200
+    assert 'access_token' in response.data
+    assert response.data['user']['email'] == 'test@email.com'
+
+
+def test_convert_token_unknown_application():
+    response = call(AsyncConvertTokenView, post('/convert-token', {
+        'grant_type': 'convert_token',
+        'backend': 'facebook',
+        'client_id': 'unknown',
+        'token': 'token',
+    }))
+
+    assert response.status_code == 400
+
+
+def test_invalidate_sessions(user, application):
+    AccessToken.objects.create(
+        user=user,
+        application=application,
+        token=uuid.uuid4().hex,
+        expires=datetime.now(tz=timezone.utc) + timedelta(hours=1),
+    )
+    request = post('/invalidate-sessions', {'client_id': application.client_id})
+    force_authenticate(request, user=user)
+
+    response = call(AsyncInvalidateSessions, request)
+
+    assert response.status_code == 204
+    assert not AccessToken.objects.filter(user=user, application=application).exists()
+
+
+def test_invalidate_sessions_requires_authentication():
+    response = call(AsyncInvalidateSessions, post('/invalidate-sessions', {'client_id': 'id'}))
+
+    assert response.status_code == 403
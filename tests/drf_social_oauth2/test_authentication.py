@@ -1,8 +1,19 @@
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
 from django.http.request import HttpRequest
-from pytest import raises
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from oauth2_provider.models import AccessToken
+from pytest import fixture, raises
 from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
 
-from drf_social_oauth2.authentication import SocialAuthentication
+from drf_social_oauth2 import sliding_expiry, token_cache
+from drf_social_oauth2.authentication import HybridAuthentication, SocialAuthentication
+from drf_social_oauth2.token_cache import CachedToken
 
 
 def create_request(content: str = 'Bearer'):
@@ -97,3 +108,80 @@ def test_authenticate_header(mocker):
     authenticated = SocialAuthentication()
     text = authenticated.authenticate_header(request)
     assert text == 'Bearer backend realm="api"'
+
+
+@fixture
+def cached(mocker):
+    mocker.patch.object(token_cache, 'DRFSO2_TOKEN_CACHE_ENABLED', True)
+    yield
+    cache.clear()
+
+
+def local_token(user, application, expires_in=3600):
+    return AccessToken.objects.create(
+        user=user,
+        application=application,
+        token=uuid.uuid4().hex,
+        scope='read',
+        expires=timezone.now() + timedelta(seconds=expires_in),
+    )
+
+
+def bearer(credentials):
+    return APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {credentials}')
+
+
+def test_hybrid_authenticates_local_token(mocker, user, application):
+    load_backend = mocker.patch('drf_social_oauth2.authentication.load_backend')
+    access = local_token(user, application)
+
+    assert HybridAuthentication().authenticate(bearer(access.token)) == (user, access)
+    load_backend.assert_not_called()
+
+
+def test_hybrid_caches_local_token(cached, user, application):
+    access = local_token(user, application)
+    HybridAuthentication().authenticate(bearer(access.token))
+
+    with CaptureQueriesContext(connection) as queries:
+        authenticated, auth = HybridAuthentication().authenticate(bearer(access.token))
+
+    assert authenticated == user
+    assert isinstance(auth, CachedToken)
+    assert auth.is_valid(['read'])
+    assert len(queries) == 1
+
+
+def test_hybrid_checks_tokens_due_for_extension(mocker, cached, user, application):
+    access = local_token(user, application, expires_in=100)
+    HybridAuthentication().authenticate(bearer(access.token))
+    mocker.patch.object(sliding_expiry, 'DRFSO2_SLIDING_EXPIRY_ENABLED', True)
+    touch = mocker.patch.object(sliding_expiry.get_buffer(), 'touch')
+
+    assert HybridAuthentication().authenticate(bearer(access.token)) == (user, access)
+    touch.assert_called_once_with(access)
+
+
+def test_hybrid_unknown_local_token(mocker):
+    load_backend = mocker.patch('drf_social_oauth2.authentication.load_backend')
+
+    assert HybridAuthentication().authenticate(bearer(uuid.uuid4().hex)) is None
+    load_backend.assert_not_called()
+
+
+def test_hybrid_sends_provider_token_to_backend(mocker, user):
+    load_backend = mocker.patch('drf_social_oauth2.authentication.load_backend')
+    load_backend.return_value.do_auth.return_value = user
+    request = bearer('facebook token')
+    request.session = None
+
+    assert HybridAuthentication().authenticate(request) == (user, 'token')
+    load_backend.return_value.do_auth.assert_called_once_with(access_token='token')
+
+
+def test_hybrid_malformed_header():
+    assert HybridAuthentication().authenticate(create_request('JWT token')) is None
+    with raises(AuthenticationFailed):
+        HybridAuthentication().authenticate(create_request('Bearer'))
+    with raises(AuthenticationFailed):
+        HybridAuthentication().authenticate(create_request('Bearer facebook to ken'))
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+from django.conf import settings
+from oauth2_provider import settings as oauth2_settings
+
+from drf_social_oauth2.backends import DjangoOAuth2, LazyReverse
+from drf_social_oauth2.settings import configure_token_generators
+
+
+def test_import_does_not_load_urlconf():
+    code = (
+        'import sys, django; django.setup(); '
+        'import drf_social_oauth2.backends; '
+        'assert settings_urlconf not in sys.modules, "URLconf loaded on import"'
+    ).replace('settings_urlconf', repr(settings.ROOT_URLCONF))
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_lazy_reverse_resolves_once(mocker):
+    reverse = mocker.patch('drf_social_oauth2.backends.reverse', return_value='/auth/token/')
+
+    class Backend:
+        url = LazyReverse('token')
+
+    assert Backend.url == '/auth/token/'
+    assert Backend().url == '/auth/token/'
+    reverse.assert_called_once_with('drf:token')
+
+
+def test_django_oauth2_urls_are_descriptors():
+    assert isinstance(DjangoOAuth2.__dict__['AUTHORIZATION_URL'], LazyReverse)
+    assert isinstance(DjangoOAuth2.__dict__['ACCESS_TOKEN_URL'], LazyReverse)
+
+
+def test_configure_token_generators(mocker):
+    defaults = mocker.patch.dict(oauth2_settings.DEFAULTS)
+
+    configure_token_generators()
+    assert defaults['ACCESS_TOKEN_GENERATOR'] is None
+
+    mocker.patch.object(settings, 'ACTIVATE_JWT', True, create=True)
+    configure_token_generators()
+    assert defaults['ACCESS_TOKEN_GENERATOR'] == 'drf_social_oauth2.generate_token'
+    assert defaults['REFRESH_TOKEN_GENERATOR'] == 'drf_social_oauth2.generate_token'
+
+
+def test_configure_signed_token_generators(mocker):
+    defaults = mocker.patch.dict(oauth2_settings.DEFAULTS)
+    mocker.patch.object(settings, 'ACTIVATE_JWT', True, create=True)
+    mocker.patch('drf_social_oauth2.settings.DRFSO2_JWT_SIGNING_KEYS', [{'kid': 'rsa'}])
+
+    configure_token_generators()
+
+    assert defaults['ACCESS_TOKEN_GENERATOR'] == 'drf_social_oauth2.signing.generate_signed_token'
+    assert (
+        defaults['REFRESH_TOKEN_GENERATOR']
+        == 'drf_social_oauth2.signing.generate_signed_refresh_token'
+    )
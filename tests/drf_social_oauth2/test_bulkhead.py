@@ -0,0 +1,143 @@
+import threading
+from json import loads
+from uuid import uuid4
+
+from pytest import raises
+
+from drf_social_oauth2 import bulkhead
+from drf_social_oauth2.bulkhead import Bulkhead, BulkheadFullError
+from drf_social_oauth2.oauth2_endpoints import SocialTokenServer
+
+
+def name():
+    # A unique backend name keeps the shared cache counters apart between tests.
+    return f'backend-{uuid4()}'
+
+
+def test_process_limit():
+    limited = Bulkhead(name(), max_concurrent=1, queue_timeout=0.01)
+
+    with limited.limit():
+        with raises(BulkheadFullError):
+            with limited.limit():
+                pass
+
+    # The slot is released once the call ends.
+    with limited.limit():
+        pass
+
+
+def test_waits_for_a_slot():
+    limited = Bulkhead(name(), max_concurrent=1, queue_timeout=5)
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with limited.limit():
+            entered.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    entered.wait(5)
+    threading.Timer(0.05, release.set).start()
+
+    with limited.limit():
+        pass
+    thread.join()
+
+
+def test_node_limit_is_shared_through_cache():
+    backend = name()
+    first = Bulkhead(backend, max_concurrent=5, queue_timeout=0.05, node_max_concurrent=1)
+    # Another process on the node has its own semaphore but the same counter.
+    second = Bulkhead(backend, max_concurrent=5, queue_timeout=0.05, node_max_concurrent=1)
+
+    with first.limit():
+        with raises(BulkheadFullError):
+            with second.limit():
+                pass
+
+    with second.limit():
+        pass
+    assert first.cache.get(first._key) == 0
+
+
+def test_node_counter_lease_is_renewed(mocker):
+    limited = Bulkhead(name(), queue_timeout=0.05, node_max_concurrent=2, lease_seconds=30)
+    touch = mocker.spy(limited.cache, 'touch')
+
+    with limited.limit():
+        with limited.limit():
+            pass
+
+    assert touch.call_args_list == [mocker.call(limited._key, 30)] * 2
+
+
+def test_node_counter_does_not_go_negative():
+    limited = Bulkhead(name(), queue_timeout=0.01, node_max_concurrent=1)
+
+    with limited.limit():
+        # The counter expired and another process created a new one.
+        limited.cache.set(limited._key, 0)
+
+    assert limited.cache.get(limited._key) == 0
+    with limited.limit():
+        with raises(BulkheadFullError):
+            with Bulkhead(limited.backend, node_max_concurrent=1, queue_timeout=0.01).limit():
+                pass
+
+
+def test_expiring_node_counter_respects_queue_timeout(mocker):
+    limited = Bulkhead(name(), queue_timeout=0.01, node_max_concurrent=1)
+    mocker.patch.object(limited.cache, 'incr', side_effect=ValueError)
+
+    with raises(BulkheadFullError):
+        with limited.limit():
+            pass
+
+
+def test_slots_are_released_on_error():
+    limited = Bulkhead(name(), max_concurrent=1, queue_timeout=0.01, node_max_concurrent=1)
+
+    with raises(ValueError):
+        with limited.limit():
+            raise ValueError()
+
+    with limited.limit():
+        pass
+
+
+def test_disabled_limit_is_noop(mocker):
+    get_bulkhead = mocker.patch.object(bulkhead, 'get_bulkhead')
+
+    with bulkhead.limit('facebook'):
+        pass
+
+    get_bulkhead.assert_not_called()
+
+
+def test_full_bulkhead_fails_fast(mocker):
+    mocker.patch.object(bulkhead, 'DRFSO2_BULKHEAD_ENABLED', True)
+    limited = Bulkhead(name(), max_concurrent=1, queue_timeout=0.01)
+    mocker.patch.object(bulkhead, 'get_bulkhead', return_value=limited)
+
+    mocker.patch('drf_social_oauth2.oauth2_grants.reverse')
+    backend = mocker.patch('drf_social_oauth2.oauth2_grants.load_backend')
+    server = SocialTokenServer(request_validator=mocker.Mock())
+
+    with limited.limit():
+        _, body, status = server.create_token_response(
+            uri='/auth/convert-token',
+            http_method='POST',
+            body={
+                'grant_type': 'convert_token',
+                'backend': limited.backend,
+                'client_id': 'code',
+                'token': 'token',
+            },
+        )
+
+    assert status == 503
+    assert loads(body)['error'] == 'temporarily_unavailable'
+    backend.return_value.do_auth.assert_not_called()
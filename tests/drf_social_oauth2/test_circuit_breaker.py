@@ -0,0 +1,134 @@
+from json import loads
+from uuid import uuid4
+
+from pytest import fixture, raises
+from requests import ConnectionError, HTTPError, Response
+
+from drf_social_oauth2 import circuit_breaker
+from drf_social_oauth2.circuit_breaker import CircuitBreaker, CircuitOpenError, is_failure
+from drf_social_oauth2.oauth2_endpoints import SocialTokenServer
+
+
+@fixture
+def breaker():
+    # A unique backend name keeps the shared cache state apart between tests.
+    return CircuitBreaker(f'backend-{uuid4()}', minimum_calls=4, failure_rate=0.5)
+
+
+def http_error(status):
+    response = Response()
+    response.status_code = status
+    return HTTPError(response=response)
+
+
+def call(breaker, exception=None):
+    with breaker.guard():
+        if exception is not None:
+            raise exception
+
+
+def fail(breaker, times=1):
+    for _ in range(times):
+        with raises(ConnectionError):
+            call(breaker, ConnectionError())
+
+
+def test_is_failure():
+    assert is_failure(ConnectionError())
+    assert is_failure(http_error(503))
+    assert not is_failure(http_error(401))
+    assert not is_failure(ValueError())
+
+
+def test_opens_on_failure_rate(breaker):
+    call(breaker)
+    fail(breaker, 2)
+    # Below minimum_calls the rate is not evaluated.
+    assert breaker.state == 'closed'
+
+    fail(breaker)
+    assert breaker.state == 'open'
+    with raises(CircuitOpenError):
+        call(breaker)
+
+
+def test_client_errors_keep_circuit_closed(breaker):
+    for _ in range(5):
+        with raises(HTTPError):
+            call(breaker, http_error(400))
+
+    assert breaker.state == 'closed'
+
+
+def test_slow_calls_count_as_failures(breaker):
+    breaker.slow_call_seconds = 0
+    for _ in range(4):
+        call(breaker)
+
+    assert breaker.state == 'open'
+
+
+def test_state_is_shared_between_instances(breaker):
+    fail(breaker, 4)
+
+    other = CircuitBreaker(breaker.backend)
+    assert other.state == 'open'
+
+
+def test_half_open_probe_closes_circuit(breaker):
+    breaker.open_seconds = 0
+    fail(breaker, 4)
+    assert breaker.state == 'half-open'
+
+    with breaker.guard():
+        # Only one probe is let through at a time.
+        with raises(CircuitOpenError):
+            call(breaker)
+
+    assert breaker.state == 'closed'
+    call(breaker)
+
+
+def test_failed_probe_reopens_circuit(breaker):
+    breaker.open_seconds = 0
+    fail(breaker, 4)
+    breaker.open_seconds = 30
+
+    fail(breaker)
+
+    assert breaker.state == 'open'
+
+
+def test_disabled_guard_is_noop(mocker):
+    get_circuit_breaker = mocker.patch.object(circuit_breaker, 'get_circuit_breaker')
+
+    with circuit_breaker.guard('facebook'):
+        pass
+
+    get_circuit_breaker.assert_not_called()
+
+
+def test_open_circuit_fails_fast(mocker):
+    mocker.patch.object(circuit_breaker, 'DRFSO2_CIRCUIT_BREAKER_ENABLED', True)
+    breaker = CircuitBreaker(f'backend-{uuid4()}', minimum_calls=1)
+    mocker.patch.object(circuit_breaker, 'get_circuit_breaker', return_value=breaker)
+    fail(breaker)
+
+    mocker.patch('drf_social_oauth2.oauth2_grants.reverse')
+    backend = mocker.patch('drf_social_oauth2.oauth2_grants.load_backend')
+    server = SocialTokenServer(request_validator=mocker.Mock())
+
+    _, body, status = server.create_token_response(
+        uri='/auth/convert-token',
+        http_method='POST',
+        body={
+            'grant_type': 'convert_token',
+            'backend': breaker.backend,
+            'client_id': 'code',
+            'token': 'token',
+        },
+    )
+
+    assert status == 503
+    assert loads(body)['error'] == 'temporarily_unavailable'
+    backend.return_value.do_auth.assert_not_called()
@@ -0,0 +1,183 @@
+import uuid
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, models
+from django.db.migrations.loader import MigrationLoader
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, RefreshToken
+from pytest import fixture, mark
+
+from drf_social_oauth2.indexes.explain import explain_token_queries
+from drf_social_oauth2.indexes.operations import AddTokenIndex
+
+migration = import_module('drf_social_oauth2.indexes.migrations.0001_token_indexes')
+
+postgresql_only = mark.skipif(
+    connection.vendor != 'postgresql',
+    reason='Only the PostgreSQL planner is checked against the indexes.',
+)
+
+
+@fixture
+def schema_editor(mocker):
+    editor = mocker.MagicMock()
+    editor.connection.alias = 'default'
+    editor.connection.vendor = 'postgresql'
+    editor.connection.in_atomic_block = False
+    editor.connection.features.supports_partial_indexes = True
+    editor.connection.introspection.get_constraints.return_value = {'drfso2_test': {}}
+    return editor
+
+
+def operation(condition=None):
+    return AddTokenIndex(
+        'oauth2_provider.RefreshToken',
+        models.Index(fields=['user'], condition=condition, name='drfso2_test'),
+    )
+
+
+def states(mocker):
+    state = mocker.MagicMock()
+    return state, state
+
+
+@fixture
+def seeded(application):
+    """Token rows for the planner to weigh the indexes against."""
+    owner = User.objects.create_user(username=f'owner-{uuid.uuid4().hex}')
+    expires = timezone.now() + timedelta(hours=1)
+    for _ in range(200):
+        access = AccessToken.objects.create(
+            user=owner, application=application, token=uuid.uuid4().hex, expires=expires
+        )
+        RefreshToken.objects.create(
+            user=owner, application=application, token=uuid.uuid4().hex, access_token=access
+        )
+    with connection.cursor() as cursor:
+        cursor.execute(f'ANALYZE {AccessToken._meta.db_table}')
+        cursor.execute(f'ANALYZE {RefreshToken._meta.db_table}')
+    return owner
+
+
+def test_migration_creates_indexes():
+    for op in migration.Migration.operations:
+        model = op.model.split('.')[1]
+        table = AccessToken if model == 'AccessToken' else RefreshToken
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, table._meta.db_table)
+
+        if op.index.condition is not None and not connection.features.supports_partial_indexes:
+            assert op.index.name not in constraints
+            continue
+        assert constraints[op.index.name]['index']
+        assert constraints[op.index.name]['columns'] == [
+            table._meta.get_field(field).column for field in op.index.fields
+        ]
+
+
+def test_indexes_are_in_migration_state():
+    state = MigrationLoader(connection).project_state()
+    # The models declare them too, so makemigrations detects no change.
+    declared = {
+        index.name for model in (AccessToken, RefreshToken) for index in model._meta.indexes
+    }
+
+    for op in migration.Migration.operations:
+        app_label, model = op.model.lower().split('.')
+        names = [index.name for index in state.models[app_label, model].options['indexes']]
+        assert op.index.name in names
+        assert op.index.name in declared
+
+
+@mark.django_db(transaction=True)
+def test_migration_is_reversible():
+    try:
+        call_command('migrate', 'drfso2_indexes', 'zero', verbosity=0)
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, AccessToken._meta.db_table
+            )
+        assert 'drfso2_at_expires' not in constraints
+    finally:
+        call_command('migrate', 'drfso2_indexes', verbosity=0)
+
+    test_migration_creates_indexes()
+
+
+@postgresql_only
+def test_token_queries_use_indexes(seeded, application):
+    plans = explain_token_queries(seeded.pk, application.pk)
+
+    assert plans
+    assert all(plan.uses_index for plan in plans), [plan.plan for plan in plans]
+
+
+@postgresql_only
+def test_explain_command_check(seeded, application):
+    out = StringIO()
+
+    call_command(
+        'explain_token_indexes',
+        '--check',
+        '--user',
+        str(seeded.pk),
+        '--application',
+        str(application.pk),
+        stdout=out,
+    )
+
+    assert 'drfso2_at_expires' in out.getvalue()
+
+
+def test_explain_command_prints_plans():
+    out = StringIO()
+
+    call_command('explain_token_indexes', stdout=out)
+
+    assert 'invalidate_sessions (expects drfso2_at_user_app_created):' in out.getvalue()
+
+
+def test_index_created_concurrently_on_postgresql(mocker, schema_editor):
+    op = operation()
+
+    op.database_forwards('drfso2_indexes', schema_editor, *states(mocker))
+
+    schema_editor.add_index.assert_called_once_with(mocker.ANY, op.index, concurrently=True)
+
+
+def test_index_in_transaction(mocker, schema_editor):
+    schema_editor.connection.in_atomic_block = True
+    op = operation()
+
+    op.database_backwards('drfso2_indexes', schema_editor, *states(mocker))
+
+    schema_editor.remove_index.assert_called_once_with(mocker.ANY, op.index)
+
+
+def test_missing_index_is_not_dropped(mocker, schema_editor):
+    schema_editor.connection.introspection.get_constraints.return_value = {}
+
+    operation().database_backwards('drfso2_indexes', schema_editor, *states(mocker))
+
+    schema_editor.remove_index.assert_not_called()
+
+
+def test_partial_index_skipped_without_support(mocker, schema_editor):
+    schema_editor.connection.features.supports_partial_indexes = False
+
+    operation(models.Q(revoked__isnull=True)).database_forwards(
+        'drfso2_indexes', schema_editor, *states(mocker)
+    )
+
+    schema_editor.add_index.assert_not_called()
+
+
+def test_deconstruct():
+    op = operation()
+
+    assert op.deconstruct() == ('AddTokenIndex', [op.model, op.index], {})
+    assert op.describe() == 'Create index drfso2_test on oauth2_provider.RefreshToken'
@@ -0,0 +1,167 @@
+from inspect import iscoroutinefunction
+
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from oauthlib.common import Request as OAuthRequest
+from pytest import raises
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from drf_social_oauth2 import metrics
+from drf_social_oauth2.oauth2_grants import SocialTokenGrant
+
+
+def test_counter_exposition():
+    registry = metrics.Registry()
+    counter = registry.counter('errors_total', 'Errors.', ('backend', 'error'))
+    counter.inc(backend='facebook', error='http')
+    counter.inc(2, backend='facebook', error='http')
+
+    assert counter.get(backend='facebook', error='http') == 3
+    assert registry.expose().splitlines() == [
+        '# HELP errors_total Errors.',
+        '# TYPE errors_total counter',
+        'errors_total{backend="facebook",error="http"} 3',
+    ]
+
+
+def test_histogram_exposition():
+    registry = metrics.Registry()
+    histogram = registry.histogram('latency_seconds', 'Latency.', ('endpoint',), buckets=(0.1, 1))
+    histogram.observe(0.05, endpoint='token')
+    histogram.observe(0.5, endpoint='token')
+    histogram.observe(5, endpoint='token')
+
+    assert registry.expose().splitlines()[2:] == [
+        'latency_seconds_bucket{endpoint="token",le="0.1"} 1',
+        'latency_seconds_bucket{endpoint="token",le="1.0"} 2',
+        'latency_seconds_bucket{endpoint="token",le="+Inf"} 3',
+        'latency_seconds_sum{endpoint="token"} 5.55',
+        'latency_seconds_count{endpoint="token"} 3',
+    ]
+
+
+def test_label_values_are_escaped():
+    registry = metrics.Registry()
+    registry.counter('c', 'C.', ('name',)).inc(name='a"b\\c')
+
+    assert 'c{name="a\\"b\\\\c"} 1' in registry.expose()
+
+
+def test_wrong_labels():
+    histogram = metrics.Registry().histogram('h', 'H.', ('endpoint',))
+
+    with raises(ValueError):
+        histogram.observe(1, backend='facebook')
+
+
+def test_metric_kinds_must_render_samples():
+    class Gauge(metrics.Metric):
+        type = 'gauge'
+
+    with raises(TypeError):
+        Gauge('g', 'G.')
+
+
+def test_disabled_registry_is_noop():
+    registry = metrics.Registry(enabled=False)
+    histogram = registry.histogram('h', 'H.', ('endpoint',))
+
+    assert histogram is metrics.NOOP
+    with histogram.time(endpoint='token'):
+        pass
+    assert registry.expose() == ''
+
+
+def test_instrument_disabled_returns_handler():
+    def post(view, request):
+        pass
+
+    assert metrics.instrument('token')(post) is post
+
+
+def test_instrument(mocker):
+    registry = metrics.Registry()
+    mocker.patch.object(metrics, 'DRFSO2_METRICS_ENABLED', True)
+    latency = mocker.patch.object(
+        metrics, 'REQUEST_LATENCY', registry.histogram('l', 'L.', ('endpoint', 'status'))
+    )
+    queries = mocker.patch.object(
+        metrics, 'REQUEST_QUERIES', registry.histogram('q', 'Q.', ('endpoint',))
+    )
+
+    @metrics.instrument('token')
+    def post(view, request):
+        return Response(status=201)
+
+    @metrics.instrument('token')
+    def invalid(view, request):
+        raise ValidationError('invalid')
+
+    post(None, None)
+    with raises(ValidationError):
+        invalid(None, None)
+
+    assert latency.count(endpoint='token', status='201') == 1
+    assert latency.count(endpoint='token', status='400') == 1
+    assert queries.count(endpoint='token') == 2
+
+
+def test_instrument_coroutine(mocker):
+    registry = metrics.Registry()
+    mocker.patch.object(metrics, 'DRFSO2_METRICS_ENABLED', True)
+    latency = mocker.patch.object(
+        metrics, 'REQUEST_LATENCY', registry.histogram('l', 'L.', ('endpoint', 'status'))
+    )
+
+    @metrics.instrument('token')
+    async def post(view, request):
+        return Response(status=201)
+
+    assert iscoroutinefunction(post)
+    async_to_sync(post)(None, None)
+
+    assert latency.count(endpoint='token', status='201') == 1
+
+
+def test_grant_times_token_save(mocker):
+    mocker.patch.object(metrics.registry, 'enabled', True)
+    stage = mocker.patch.object(metrics, 'STAGE_LATENCY')
+    grant = SocialTokenGrant(mocker.Mock())
+    assert grant._mark_save_token in grant._token_modifiers
+
+    def create_token_response(self, request, token_handler):
+        for modifier in self._token_modifiers:
+            modifier({}, token_handler, request)
+        return {}, '{}', 200
+
+    mocker.patch(
+        'drf_social_oauth2.oauth2_grants.RefreshTokenGrant.create_token_response',
+        create_token_response,
+    )
+    grant.create_token_response(OAuthRequest('/'), mocker.Mock())
+
+    stage.observe.assert_called_once()
+    assert stage.observe.call_args.kwargs == {'endpoint': 'convert_token', 'stage': 'save_token'}
+
+
+def test_metrics_endpoint_disabled():
+    assert APIClient().get(reverse('metrics')).status_code == 404
+
+
+def test_metrics_endpoint(mocker):
+    registry = metrics.Registry()
+    registry.counter('c', 'C.').inc()
+    mocker.patch('drf_social_oauth2.views.DRFSO2_METRICS_ENABLED', True)
+    mocker.patch('drf_social_oauth2.views.DRFSO2_METRICS_TOKEN', 'scrape')
+    mocker.patch.object(metrics, 'registry', registry)
+    client = APIClient()
+
+    assert client.get(reverse('metrics')).status_code == 401
+    assert client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrapé').status_code == 401
+
+    response = client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape')
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    assert response.content.decode().endswith('c 1\n')
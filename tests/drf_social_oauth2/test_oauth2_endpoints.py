@@ -1,8 +1,10 @@
+import threading
 from datetime import datetime, timezone
 from json import loads
 
 import pytest
 from django.contrib.auth.models import User
+from django.http import HttpRequest
 from oauth2_provider.models import AccessToken, Application
 
 from drf_social_oauth2 import generate_token
@@ -131,3 +133,28 @@ def test_social_token_expired(mocker, user, application):
     assert 'access_token' in data
     # if there is a valid token, the expiry date will be smaller than the number when the token was created.
     assert data['expires_in'] == 3600
+
+
+def test_shared_server_keeps_requests_apart(mocker):
+    """
+    One server instance serves concurrent threads without mixing their requests.
+    """
+    server = SocialTokenServer(request_validator=mocker.Mock())
+    requests = [HttpRequest() for _ in range(2)]
+    barrier = threading.Barrier(2)
+    seen = {}
+
+    def handle(index):
+        with server.request_object(requests[index]):
+            # Both threads have stored their request before either reads it.
+            barrier.wait()
+            seen[index] = server._create_django_request('/').django_request
+
+    threads = [threading.Thread(target=handle, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {0: requests[0], 1: requests[1]}
+    assert server.pop_request_object() is None
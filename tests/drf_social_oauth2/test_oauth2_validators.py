@@ -0,0 +1,67 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.urls import reverse
+from oauth2_provider.models import AccessToken
+from oauthlib.common import Request
+from rest_framework.test import APIClient
+
+from drf_social_oauth2 import oauth2_validators
+from drf_social_oauth2.oauth2_validators import TrustedClientValidator, trusted_client
+
+
+def oauthlib_request(client_id):
+    return Request('/revoke-token', http_method='POST', body={'client_id': client_id})
+
+
+def test_trusted_client_skips_secret_check(mocker, application):
+    check_password = mocker.patch('oauth2_provider.oauth2_validators.check_password')
+    request = oauthlib_request(application.client_id)
+
+    with trusted_client(application):
+        assert TrustedClientValidator().authenticate_client(request)
+
+    assert request.client == application
+    check_password.assert_not_called()
+
+
+def test_other_client_is_authenticated_by_secret(application):
+    request = oauthlib_request('another-id')
+
+    with trusted_client(application):
+        assert not TrustedClientValidator().authenticate_client(request)
+
+
+def test_untrusted_request_is_authenticated_by_secret(application):
+    assert not TrustedClientValidator().authenticate_client(
+        oauthlib_request(application.client_id)
+    )
+
+
+def test_trust_disabled(mocker, application):
+    mocker.patch.object(oauth2_validators, 'DRFSO2_TRUST_LOADED_CLIENT', False)
+
+    with trusted_client(application):
+        assert not TrustedClientValidator().authenticate_client(
+            oauthlib_request(application.client_id)
+        )
+
+
+def test_revoke_token_with_hashed_secret(user, application):
+    assert application.hash_client_secret
+    token = AccessToken.objects.create(
+        user=user,
+        application=application,
+        token=uuid.uuid4().hex,
+        expires=datetime.now(tz=timezone.utc) + timedelta(hours=1),
+    )
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.token}')
+    client.force_authenticate(user=user)
+
+    response = client.post(
+        reverse('revoke_token'), data={'client_id': application.client_id}, format='json'
+    )
+
+    assert response.status_code == 204
+    assert not AccessToken.objects.filter(pk=token.pk).exists()
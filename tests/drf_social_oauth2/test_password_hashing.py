@@ -0,0 +1,80 @@
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from oauthlib.common import Request
+from oauthlib.oauth2.rfc6749.errors import TemporarilyUnavailableError
+from pytest import fixture, raises
+
+from drf_social_oauth2 import hashing_worker, password_hashing
+from drf_social_oauth2.oauth2_validators import PasswordPoolValidator
+from drf_social_oauth2.password_hashing import (
+    PasswordHashingPool,
+    PasswordPoolFullError,
+    PooledModelBackend,
+)
+
+BACKENDS = ['drf_social_oauth2.password_hashing.PooledModelBackend']
+
+
+@fixture(scope='module')
+def pool():
+    pool = PasswordHashingPool(workers=1, queue_size=4, queue_timeout=5)
+    yield pool
+    pool.get_executor().shutdown()
+
+
+@fixture
+def offloaded(mocker, pool):
+    mocker.patch.object(password_hashing, 'DRFSO2_PASSWORD_POOL_ENABLED', True)
+    mocker.patch.object(password_hashing, 'get_pool', return_value=pool)
+    with password_hashing.offload():
+        yield
+
+
+def full_pool():
+    pool = PasswordHashingPool(workers=1, queue_size=0, queue_timeout=0.01)
+    pool._slots.acquire()
+    return pool
+
+
+def test_check_in_pool(pool):
+    encoded = make_password('password')
+
+    assert pool.run(hashing_worker.check, 'password', encoded) == (True, False)
+    assert pool.run(hashing_worker.check, 'wrong', encoded) == (False, False)
+
+
+def test_full_pool_rejects():
+    with raises(PasswordPoolFullError):
+        full_pool().run(hashing_worker.hash_password, 'password')
+
+
+def test_authenticate_in_pool(user, offloaded):
+    backend = PooledModelBackend()
+
+    assert backend.authenticate(None, username='user', password='password') == user
+    assert backend.authenticate(None, username='user', password='wrong') is None
+    assert backend.authenticate(None, username='nobody', password='password') is None
+
+
+def test_authenticate_outside_offload(mocker, user):
+    get_pool = mocker.patch.object(password_hashing, 'get_pool')
+
+    assert PooledModelBackend().authenticate(None, username='user', password='password') == user
+    get_pool.assert_not_called()
+
+
+def test_offload_disabled():
+    with password_hashing.offload():
+        assert not password_hashing._offloading.get()
+
+
+def test_validator_reports_full_pool(mocker, user):
+    mocker.patch.object(password_hashing, 'DRFSO2_PASSWORD_POOL_ENABLED', True)
+    mocker.patch.object(password_hashing, 'get_pool', return_value=full_pool())
+    request = Request('/token', http_method='POST', body={'grant_type': 'password'})
+
+    with override_settings(AUTHENTICATION_BACKENDS=BACKENDS):
+        with raises(TemporarilyUnavailableError) as e:
+            PasswordPoolValidator().validate_user('user', 'password', None, request)
+
+    assert e.value.status_code == 503
@@ -0,0 +1,216 @@
+from datetime import timedelta
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from pytest import fixture, raises
+from social_core.backends.facebook import FacebookOAuth2
+from social_core.exceptions import AuthAlreadyAssociated
+from social_core.pipeline import user as user_steps
+from social_django.models import UserSocialAuth
+from social_django.utils import load_strategy
+
+from drf_social_oauth2 import pipeline
+from drf_social_oauth2.pipeline import (
+    PIPELINE,
+    AccountConflict,
+    associate_user,
+    create_user,
+    mark_refreshed,
+    social_user,
+)
+
+User = get_user_model()
+
+
+@fixture
+def backend():
+    return FacebookOAuth2(load_strategy())
+
+
+@fixture
+def social(user):
+    # A unique uid keeps the associations of the shared database apart.
+    return UserSocialAuth.objects.create(user=user, provider='facebook', uid=str(uuid4()))
+
+
+def age(social, seconds):
+    UserSocialAuth.objects.filter(pk=social.pk).update(
+        modified=timezone.now() - timedelta(seconds=seconds)
+    )
+    social.refresh_from_db()
+
+
+def test_fresh_association_ends_pipeline(backend, social):
+    with CaptureQueriesContext(connection) as queries:
+        result = social_user(backend, social.uid)
+
+    assert len(queries) == 1
+    assert result == social.user
+    assert result.social_user == social
+    assert result.is_new is False
+
+
+def test_stale_association_continues_pipeline(backend, social):
+    age(social, pipeline.DRFSO2_FAST_PATH_REFRESH_SECONDS + 1)
+
+    result = social_user(backend, social.uid)
+
+    assert result == {
+        'social': social,
+        'user': social.user,
+        'is_new': False,
+        'new_association': False,
+    }
+
+
+def test_unknown_association_continues_pipeline(backend):
+    result = social_user(backend, str(uuid4()))
+
+    assert result == {'social': None, 'user': None, 'is_new': True, 'new_association': True}
+
+
+def test_inactive_user_continues_pipeline(backend, social):
+    social.user.is_active = False
+
+    result = social_user(backend, social.uid, user=social.user)
+
+    assert isinstance(result, dict)
+
+
+def test_disabled_fast_path(mocker, backend, social):
+    mocker.patch.object(pipeline, 'DRFSO2_FAST_PATH_REFRESH_SECONDS', 0)
+
+    assert isinstance(social_user(backend, social.uid), dict)
+
+
+def test_association_of_another_user(backend, social):
+    other, _ = User.objects.get_or_create(username='other', email='other@email.com')
+
+    with raises(AuthAlreadyAssociated):
+        social_user(backend, social.uid, user=other)
+
+
+def test_mark_refreshed(social):
+    age(social, pipeline.DRFSO2_FAST_PATH_REFRESH_SECONDS + 1)
+
+    mark_refreshed(social=social)
+
+    social.refresh_from_db()
+    assert pipeline.is_fresh(social)
+
+
+def test_mark_refreshed_skips_fresh_association(social):
+    with CaptureQueriesContext(connection) as queries:
+        mark_refreshed(social=social)
+
+    assert len(queries) == 0
+
+
+def test_fast_path_skips_pipeline_writes(mocker, backend, social):
+    load_extra_data = mocker.patch('social_core.pipeline.social_auth.load_extra_data')
+
+    user = backend.pipeline(
+        PIPELINE,
+        response={'id': social.uid},
+        details={},
+        uid=social.uid,
+    )
+
+    assert user == social.user
+    load_extra_data.assert_not_called()
+
+
+def new_user(username=None):
+    return User.objects.create_user(username=username or f'user-{uuid4()}')
+
+
+def test_create_user(backend):
+    username = f'user-{uuid4()}'
+
+    result = create_user(backend.strategy, {'username': username}, backend, str(uuid4()))
+
+    assert result['is_new'] and result['user_inserted']
+    assert result['user'].username == username
+
+
+def test_create_user_uses_storage(mocker, backend):
+    storage_create_user = mocker.spy(UserSocialAuth, 'create_user')
+    username = f'user-{uuid4()}'
+
+    result = create_user(backend.strategy, {'username': username}, backend, str(uuid4()))
+
+    storage_create_user.assert_called_once_with(username=username, email=None)
+    assert result['user'] == storage_create_user.spy_return
+
+
+def test_create_user_never_returns_an_existing_user(mocker, backend):
+    mocker.patch.object(pipeline, 'RETRY_DELAY', 0)
+    other = new_user()
+    # social_django's create_user falls back to this user on conflicts.
+    storage_create_user = mocker.spy(UserSocialAuth, 'create_user')
+
+    with raises(AccountConflict):
+        create_user(backend.strategy, {'username': other.username}, backend, str(uuid4()))
+
+    assert storage_create_user.spy_return == other
+    assert User.objects.filter(pk=other.pk).exists()
+
+
+def test_create_user_adopts_concurrent_signup(backend):
+    winner = new_user()
+    social = UserSocialAuth.objects.create(user=winner, provider='facebook', uid=str(uuid4()))
+
+    result = create_user(backend.strategy, {'username': winner.username}, backend, social.uid)
+
+    assert result['user'] == winner
+    assert result['social'] == social
+    assert not result['is_new']
+
+
+def test_create_user_conflict_with_another_account(mocker, backend):
+    mocker.patch.object(pipeline, 'RETRY_DELAY', 0)
+    other = new_user()
+
+    with raises(AccountConflict):
+        create_user(backend.strategy, {'username': other.username}, backend, str(uuid4()))
+
+
+def test_associate_user_adopts_concurrent_association(backend):
+    winner, loser = new_user(), new_user()
+    social = UserSocialAuth.objects.create(user=winner, provider='facebook', uid=str(uuid4()))
+
+    result = associate_user(backend, social.uid, user=loser, user_inserted=True)
+
+    assert result['user'] == winner
+    assert result['social'] == social
+    assert not User.objects.filter(pk=loser.pk).exists()
+
+
+def test_associate_user_keeps_existing_users(backend):
+    owner, other = new_user(), new_user()
+    social = UserSocialAuth.objects.create(user=owner, provider='facebook', uid=str(uuid4()))
+
+    with raises(AuthAlreadyAssociated):
+        associate_user(backend, social.uid, user=other)
+
+    assert User.objects.filter(pk=other.pk).exists()
+
+
+def test_concurrent_first_logins_share_the_user(mocker, backend):
+    uid = str(uuid4())
+    username = f'user-{uuid4()}'
+    kwargs = {'response': {'id': uid}, 'details': {'username': username}, 'uid': uid}
+    first = backend.pipeline(PIPELINE, **kwargs)
+
+    # The second login looked the association up before the first one
+    # inserted it, and picked another free username.
+    mocker.patch.object(pipeline, 'social_user', return_value={'social': None, 'user': None})
+    mocker.patch.object(user_steps, 'get_username', return_value={'username': f'{username}-2'})
+    second = backend.pipeline(PIPELINE, **kwargs)
+
+    assert second == first
+    assert UserSocialAuth.objects.filter(provider='facebook', uid=uid).count() == 1
+    assert not User.objects.filter(username=f'{username}-2').exists()
@@ -0,0 +1,94 @@
+import json
+import pstats
+
+from pytest import fixture
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from drf_social_oauth2 import profiling
+
+
+@fixture
+def enabled(mocker, tmp_path):
+    mocker.patch.object(profiling, 'DRFSO2_PROFILING_ENABLED', True)
+    mocker.patch.object(profiling, 'DRFSO2_PROFILING_DIR', str(tmp_path))
+    return tmp_path
+
+
+def make_request(headers=None, backend='facebook'):
+    request = APIRequestFactory().post(
+        '/auth/convert-token',
+        {'backend': backend, 'client_id': 'code'},
+        format='json',
+        headers=headers,
+    )
+    return Request(request, parsers=[JSONParser()])
+
+
+def test_disabled_returns_handler():
+    def post(view, request):
+        pass
+
+    assert profiling.profiled('token')(post) is post
+
+
+def test_signed_header_triggers_profile(enabled):
+    @profiling.profiled('convert_token')
+    def post(view, request):
+        sum(range(1000))
+        return Response(status=200)
+
+    post(None, make_request({'X-DRFSO2-Profile': profiling.sign_profiling_request()}))
+
+    [profile] = enabled.glob('*.prof')
+    [metadata] = enabled.glob('*.json')
+    assert profile.stem == metadata.stem
+    assert '-convert_token-facebook-' in profile.name
+    assert pstats.Stats(str(profile)).total_calls > 0
+
+    metadata = json.loads(metadata.read_text())
+    assert metadata['endpoint'] == 'convert_token'
+    assert metadata['backend'] == 'facebook'
+    assert metadata['client_id'] == 'code'
+    assert metadata['status'] == 200
+    assert metadata['trigger'] == 'header'
+
+
+def test_unsigned_or_expired_header_is_ignored(enabled, mocker):
+    @profiling.profiled('convert_token')
+    def post(view, request):
+        return Response(status=200)
+
+    post(None, make_request({'X-DRFSO2-Profile': 'profile:forged:signature'}))
+
+    mocker.patch.object(profiling, 'DRFSO2_PROFILING_MAX_AGE', -1)
+    post(None, make_request({'X-DRFSO2-Profile': profiling.sign_profiling_request()}))
+
+    assert not list(enabled.iterdir())
+
+
+def test_sampling(enabled, mocker):
+    mocker.patch.object(profiling, 'DRFSO2_PROFILING_SAMPLE_RATE', 0.5)
+    request = make_request()
+
+    mocker.patch('drf_social_oauth2.profiling.random.random', return_value=0.9)
+    assert profiling.get_trigger(request) is None
+
+    mocker.patch('drf_social_oauth2.profiling.random.random', return_value=0.1)
+    assert profiling.get_trigger(request) == 'sample'
+
+
+def test_backend_is_sanitized_in_file_name(enabled, mocker):
+    mocker.patch.object(profiling, 'DRFSO2_PROFILING_SAMPLE_RATE', 1)
+
+    @profiling.profiled('convert_token')
+    def post(view, request):
+        return Response(status=200)
+
+    post(None, make_request(backend='../../etc/passwd'))
+
+    [profile] = enabled.glob('*.prof')
+    assert profile.parent == enabled
+    assert '/' not in profile.name.split('-convert_token-')[1]
@@ -0,0 +1,151 @@
+import threading
+
+from pytest import raises
+from requests import ConnectionError, HTTPError, Response
+from social_core.exceptions import AuthFailed
+
+from drf_social_oauth2.provider_calls import (
+    LatencyWindow,
+    ProviderCallPolicy,
+    RetryBudget,
+)
+
+
+class FakeSend:
+    """Stand-in for BaseAuth.request returning queued results."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def __call__(self, url, method='GET', *args, **kwargs):
+        self.calls.append((method, kwargs))
+        result = self.results.pop(0)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+def http_error(status):
+    response = Response()
+    response.status_code = status
+    return HTTPError(response=response)
+
+
+def wrapped_connection_error():
+    # social-core raises AuthFailed while handling the ConnectionError.
+    try:
+        try:
+            raise ConnectionError()
+        except ConnectionError:
+            raise AuthFailed('google', 'reset')
+    except AuthFailed as e:
+        return e
+
+
+def test_timeouts(mocker):
+    backend = mocker.Mock()
+    backend.setting.return_value = 10
+    backend.request = send = FakeSend('ok')
+
+    ProviderCallPolicy('google', connect_timeout=1).apply(backend)
+    backend.request('https://provider')
+
+    # The unset read timeout falls back to REQUESTS_TIMEOUT.
+    assert send.calls[0][1]['timeout'] == (1, 10)
+
+
+def test_inactive_policy_leaves_backend_untouched(mocker):
+    backend = mocker.Mock()
+    request = backend.request
+
+    ProviderCallPolicy('google').apply(backend)
+
+    assert backend.request is request
+
+
+def test_retries_idempotent_requests(mocker):
+    sleep = mocker.patch('drf_social_oauth2.provider_calls.time.sleep')
+    policy = ProviderCallPolicy('google', retries=2)
+    send = FakeSend(ConnectionError(), wrapped_connection_error(), 'ok')
+
+    assert policy.request(send, None, 'https://provider') == 'ok'
+    assert len(send.calls) == 3
+    assert sleep.call_count == 2
+    assert all(0 <= call.args[0] <= policy.backoff * 2 for call in sleep.call_args_list)
+
+
+def test_client_errors_and_posts_are_not_retried(mocker):
+    mocker.patch('drf_social_oauth2.provider_calls.time.sleep')
+    policy = ProviderCallPolicy('google', retries=2)
+
+    send = FakeSend(http_error(401))
+    with raises(HTTPError):
+        policy.request(send, None, 'https://provider')
+    assert len(send.calls) == 1
+
+    send = FakeSend(ConnectionError())
+    with raises(ConnectionError):
+        policy.request(send, None, 'https://provider', method='POST')
+    assert len(send.calls) == 1
+
+
+def test_retry_budget():
+    budget = RetryBudget(ratio=0.5, minimum=2)
+
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_spent_budget_stops_retries(mocker):
+    mocker.patch('drf_social_oauth2.provider_calls.time.sleep')
+    policy = ProviderCallPolicy('google', retries=5)
+    policy.budget = RetryBudget(ratio=0, minimum=1)
+    send = FakeSend(ConnectionError(), ConnectionError(), 'ok')
+
+    with raises(ConnectionError):
+        policy.request(send, None, 'https://provider')
+    assert len(send.calls) == 2
+
+
+def test_latency_window():
+    window = LatencyWindow(size=100, min_samples=10)
+    for value in range(9):
+        window.add(value)
+    assert window.percentile(95) is None
+
+    for value in range(9, 100):
+        window.add(value)
+    assert window.percentile(95) == 95
+
+
+def test_hedged_request_returns_first_response():
+    policy = ProviderCallPolicy('google', hedge=True, hedge_delay=0.01)
+    release = threading.Event()
+    calls = []
+
+    def send(url, method='GET', *args, **kwargs):
+        calls.append(url)
+        if len(calls) == 1:
+            # The primary request hangs until the hedge has answered.
+            release.wait(5)
+            return 'slow'
+        return 'fast'
+
+    assert policy.request(send, None, 'https://provider') == 'fast'
+    release.set()
+    assert len(calls) == 2
+
+
+def test_no_hedge_without_delay():
+    policy = ProviderCallPolicy('google', hedge=True)
+    send = FakeSend('ok')
+
+    assert policy.request(send, None, 'https://provider') == 'ok'
+    assert len(send.calls) == 1
@@ -0,0 +1,196 @@
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+from oauth2_provider.settings import oauth2_settings
+from oauthlib.common import Request
+from pytest import fixture, raises
+from rest_framework.test import APIClient
+
+from drf_social_oauth2 import signing
+from drf_social_oauth2.signing import (
+    KeySet,
+    SigningKey,
+    generate_signed_refresh_token,
+    generate_signed_token,
+)
+
+
+def pem(private_key):
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+@fixture(scope='module')
+def rsa_pem():
+    return pem(rsa.generate_private_key(public_exponent=65537, key_size=2048))
+
+
+@fixture(scope='module')
+def ec_pem():
+    return pem(ec.generate_private_key(ec.SECP256R1()))
+
+
+@fixture(scope='module')
+def ed_pem():
+    return pem(ed25519.Ed25519PrivateKey.generate())
+
+
+def now():
+    return datetime.now(tz=timezone.utc)
+
+
+def verify(token, jwks):
+    kid = jwt.get_unverified_header(token)['kid']
+    key = jwt.PyJWKSet.from_dict(jwks)[kid]
+    return jwt.decode(token, key.key, algorithms=[key.algorithm_name])
+
+
+def test_sign_and_verify_offline(rsa_pem, ec_pem, ed_pem):
+    for kid, algorithm, private_key in (
+        ('rsa', 'RS256', rsa_pem),
+        ('ec', 'ES256', ec_pem),
+        ('ed', 'EdDSA', ed_pem),
+    ):
+        key_set = KeySet([SigningKey(kid, algorithm, private_key)])
+        token = key_set.sign({'token': 'abc'})
+
+        assert jwt.get_unverified_header(token)['kid'] == kid
+        assert verify(token, key_set.jwks()) == {'token': 'abc'}
+
+
+def test_jwks_contains_only_public_parts(rsa_pem):
+    jwk = KeySet([SigningKey('rsa', 'RS256', rsa_pem)]).jwks()['keys'][0]
+
+    assert jwk['kid'] == 'rsa'
+    assert jwk['alg'] == 'RS256'
+    assert jwk['use'] == 'sig'
+    assert 'd' not in jwk
+
+
+def test_scheduled_rotation(rsa_pem, ec_pem):
+    rotation = now() + timedelta(days=1)
+    key_set = KeySet.from_settings([
+        {'kid': 'old', 'algorithm': 'RS256', 'private_key': rsa_pem,
+         'not_after': rotation + timedelta(days=7)},
+        {'kid': 'new', 'algorithm': 'ES256', 'private_key': ec_pem,
+         'not_before': rotation.isoformat()},
+    ])
+
+    # The upcoming key is published before it starts signing.
+    assert key_set.signing_key().kid == 'old'
+    assert {k['kid'] for k in key_set.jwks()['keys']} == {'old', 'new'}
+
+    assert key_set.signing_key(rotation).kid == 'new'
+
+    # Once retired, the old key stops signing but stays published for the
+    # lifetime of the tokens it signed last.
+    retired = rotation + timedelta(days=7)
+    old = key_set.keys[0]
+    assert not old.is_active(retired)
+    assert {k['kid'] for k in key_set.jwks(retired)['keys']} == {'old', 'new'}
+    grace = timedelta(seconds=oauth2_settings.ACCESS_TOKEN_EXPIRE_SECONDS)
+    assert old.publish_until == retired + grace
+    assert [k['kid'] for k in key_set.jwks(retired + grace)['keys']] == ['new']
+
+
+def test_explicit_publication_end(rsa_pem):
+    retired = now()
+    key = SigningKey(
+        'rsa', 'RS256', rsa_pem, not_after=retired, publish_until=retired + timedelta(days=1)
+    )
+
+    assert not key.is_active(retired)
+    assert key.is_published(retired + timedelta(hours=23))
+    assert not key.is_published(retired + timedelta(days=1))
+
+
+def test_no_active_key(rsa_pem):
+    key_set = KeySet([SigningKey('rsa', 'RS256', rsa_pem, not_before=now() + timedelta(days=1))])
+
+    with raises(ImproperlyConfigured):
+        key_set.signing_key()
+
+
+def test_invalid_configuration(rsa_pem):
+    with raises(ImproperlyConfigured):
+        SigningKey('hs', 'HS256', 'secret')
+    with raises(ImproperlyConfigured):
+        SigningKey('rsa', 'RS256', 'not a key')
+    with raises(ImproperlyConfigured):
+        KeySet([SigningKey('rsa', 'RS256', rsa_pem), SigningKey('rsa', 'RS256', rsa_pem)])
+    with raises(ImproperlyConfigured):
+        KeySet.from_settings([{'kid': 'rsa', 'private_key': rsa_pem}])
+
+
+def token_request(user, application, scopes=('read', 'write'), expires_in=600):
+    request = Request('https://auth.example.com/auth/token', http_method='POST')
+    request.user = user
+    request.client = application
+    request.client_id = application.client_id
+    request.scopes = list(scopes)
+    request.expires_in = expires_in
+    return request
+
+
+def test_generate_signed_token(mocker, ec_pem, user, application):
+    key_set = KeySet([SigningKey('ec', 'ES256', ec_pem)])
+    mocker.patch('drf_social_oauth2.signing.get_key_set', return_value=key_set)
+
+    claims = verify(generate_signed_token(token_request(user, application)), key_set.jwks())
+
+    assert len(claims['token']) == 30
+    assert claims['iss'] == 'https://auth.example.com'
+    assert claims['sub'] == str(user.pk)
+    assert claims['client_id'] == application.client_id
+    assert claims['scope'] == 'read write'
+    assert claims['exp'] - claims['iat'] == 600
+    assert abs(claims['iat'] - now().timestamp()) < 5
+
+
+def test_signed_token_defaults(mocker, ec_pem, application):
+    key_set = KeySet([SigningKey('ec', 'ES256', ec_pem)])
+    mocker.patch('drf_social_oauth2.signing.get_key_set', return_value=key_set)
+    mocker.patch.object(signing, 'DRFSO2_JWT_ISSUER', 'https://issuer.example.com')
+    request = token_request(None, application, scopes=(), expires_in=None)
+    request.client_id = None
+
+    claims = verify(generate_signed_token(request), key_set.jwks())
+
+    assert claims['iss'] == 'https://issuer.example.com'
+    assert claims['client_id'] == application.client_id
+    assert claims['scope'] == ''
+    assert claims['exp'] - claims['iat'] == oauth2_settings.ACCESS_TOKEN_EXPIRE_SECONDS
+    # Tokens issued to a client rather than a user have no subject.
+    assert 'sub' not in claims
+
+
+def test_generate_signed_refresh_token(mocker, ec_pem, user, application):
+    key_set = KeySet([SigningKey('ec', 'ES256', ec_pem)])
+    mocker.patch('drf_social_oauth2.signing.get_key_set', return_value=key_set)
+
+    token = generate_signed_refresh_token(token_request(user, application))
+
+    # Refresh tokens carry no claims a resource server would accept.
+    assert list(verify(token, key_set.jwks())) == ['token']
+
+
+def test_jwks_endpoint(mocker, rsa_pem):
+    key_set = KeySet([SigningKey('rsa', 'RS256', rsa_pem)])
+    mocker.patch('drf_social_oauth2.views.get_key_set', return_value=key_set)
+
+    response = APIClient().get(reverse('jwks'))
+
+    assert response.status_code == 200
+    assert response.json() == key_set.jwks()
+    assert response['Cache-Control'] == 'public, max-age=3600'
+
+
+def test_jwks_endpoint_without_keys():
+    assert APIClient().get(reverse('jwks')).status_code == 404
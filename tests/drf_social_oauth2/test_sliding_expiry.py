@@ -0,0 +1,114 @@
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from oauth2_provider.models import AccessToken
+from pytest import fixture
+from rest_framework.test import APIRequestFactory
+
+from drf_social_oauth2 import sliding_expiry
+from drf_social_oauth2.authentication import SlidingExpiryAuthentication
+from drf_social_oauth2.sliding_expiry import ExpiryBuffer
+
+LIFETIME = 3600
+
+
+@fixture
+def owner():
+    return User.objects.create_user(username=f'owner-{uuid.uuid4().hex}')
+
+
+@fixture
+def buffer():
+    return ExpiryBuffer(LIFETIME, threshold=300, interval=60, flush_seconds=3600)
+
+
+def token(owner, application, expires_in, age=0):
+    access = AccessToken.objects.create(
+        user=owner,
+        application=application,
+        token=uuid.uuid4().hex,
+        expires=timezone.now() + timedelta(seconds=expires_in),
+    )
+    if age:
+        AccessToken.objects.filter(pk=access.pk).update(
+            created=timezone.now() - timedelta(seconds=age)
+        )
+    return access
+
+
+def expiry(access):
+    return AccessToken.objects.get(pk=access.pk).expires - timezone.now()
+
+
+def test_token_about_to_expire_is_extended(owner, application, buffer):
+    tokens = [token(owner, application, 100) for _ in range(3)]
+
+    assert all(buffer.touch(access) for access in tokens)
+    with CaptureQueriesContext(connection) as queries:
+        assert buffer.flush() == 3
+
+    assert len(queries) == 1
+    assert all(expiry(access) > timedelta(seconds=LIFETIME - 10) for access in tokens)
+
+
+def test_repeated_touches_are_coalesced(owner, application, buffer):
+    access = token(owner, application, 100)
+
+    for _ in range(5):
+        buffer.touch(access)
+
+    assert buffer.flush() == 1
+    assert buffer.flush() == 0
+
+
+def test_fresh_and_expired_tokens_are_not_extended(owner, application, buffer):
+    assert not buffer.touch(token(owner, application, 1000))
+    assert not buffer.touch(token(owner, application, -10))
+
+
+def test_recently_extended_token_is_skipped(owner, application):
+    buffer = ExpiryBuffer(LIFETIME, threshold=LIFETIME, interval=60, flush_seconds=3600)
+    access = token(owner, application, LIFETIME - 30)
+
+    assert buffer.touch(access)
+    assert buffer.flush() == 0
+
+
+def test_token_past_max_age_is_not_extended(owner, application):
+    buffer = ExpiryBuffer(LIFETIME, max_age=2 * LIFETIME, flush_seconds=3600)
+    access = token(owner, application, 100, age=2 * LIFETIME)
+
+    assert buffer.touch(access)
+    assert buffer.flush() == 0
+
+
+def test_full_buffer_is_flushed(owner, application):
+    buffer = ExpiryBuffer(LIFETIME, batch_size=2, flush_seconds=3600)
+    first, second = token(owner, application, 100), token(owner, application, 100)
+
+    buffer.touch(first)
+    assert expiry(first) < timedelta(seconds=300)
+    buffer.touch(second)
+
+    assert expiry(first) > timedelta(seconds=LIFETIME - 10)
+    assert expiry(second) > timedelta(seconds=LIFETIME - 10)
+
+
+def test_authentication_buffers_extension(mocker, owner, application, buffer):
+    mocker.patch.object(sliding_expiry, 'DRFSO2_SLIDING_EXPIRY_ENABLED', True)
+    mocker.patch.object(sliding_expiry, 'get_buffer', return_value=buffer)
+    access = token(owner, application, 100)
+    request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access.token}')
+
+    user, auth = SlidingExpiryAuthentication().authenticate(request)
+
+    assert user == owner
+    assert buffer.flush() == 1
+
+
+def test_touch_disabled(owner, application):
+    assert not sliding_expiry.touch(token(owner, application, 100))
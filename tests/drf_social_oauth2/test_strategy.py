@@ -0,0 +1,55 @@
+from django.test import RequestFactory
+from social_django.strategy import DjangoStrategy
+
+from drf_social_oauth2 import strategy
+from drf_social_oauth2.strategy import SessionlessStrategy, load_strategy
+
+
+class NoSessionRequest:
+    """A request failing the test if its session is read."""
+
+    GET = {}
+    POST = {'token': 'token'}
+    method = 'POST'
+
+    @property
+    def session(self):
+        raise AssertionError('The session was read.')
+
+
+def load_sessionless(request):
+    return SessionlessStrategy(strategy.load_session_strategy().storage, request)
+
+
+def test_session_is_never_read():
+    request = NoSessionRequest()
+
+    sessionless = load_sessionless(request)
+
+    assert sessionless.request is request
+    assert sessionless.request_data() == {'token': 'token'}
+
+
+def test_session_values_live_in_memory():
+    sessionless = load_sessionless(RequestFactory().post('/'))
+
+    sessionless.session_set('state', 'value')
+
+    assert sessionless.session_get('state') == 'value'
+    assert sessionless.session_pop('state') == 'value'
+    assert load_sessionless(RequestFactory().post('/')).session_get('state') is None
+
+
+def test_default_strategy():
+    request = RequestFactory().post('/')
+    request.session = {}
+
+    loaded = load_strategy(request)
+
+    assert type(loaded) is DjangoStrategy
+
+
+def test_sessionless_setting(mocker):
+    mocker.patch.object(strategy, 'DRFSO2_SESSIONLESS_STRATEGY', True)
+
+    assert isinstance(load_strategy(NoSessionRequest()), SessionlessStrategy)
@@ -0,0 +1,144 @@
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from oauth2_provider.models import AccessToken
+from oauthlib.common import Request
+from pytest import fixture, raises
+
+from drf_social_oauth2 import token_cache
+from drf_social_oauth2.oauth2_validators import TokenCacheValidator
+
+
+@fixture
+def enabled(mocker):
+    mocker.patch.object(token_cache, 'DRFSO2_TOKEN_CACHE_ENABLED', True)
+    post_delete.connect(
+        token_cache.forget_deleted, sender=AccessToken, dispatch_uid='test_token_cache'
+    )
+    yield
+    post_delete.disconnect(sender=AccessToken, dispatch_uid='test_token_cache')
+    cache.clear()
+
+
+def expires(seconds=3600):
+    return timezone.now() + timedelta(seconds=seconds)
+
+
+def test_store_and_get(enabled):
+    token = uuid.uuid4().hex
+    token_cache.store(token, 1, 2, 'read write', expires())
+
+    record = token_cache.get(token)
+
+    assert (record.user_id, record.application_id, record.scope) == (1, 2, 'read write')
+    assert token_cache.get(uuid.uuid4().hex) is None
+
+
+def test_expired_tokens_are_not_cached(enabled):
+    token = uuid.uuid4().hex
+
+    token_cache.store(token, 1, 2, 'read', expires(-10))
+
+    assert token_cache.get(token) is None
+
+
+def test_record_written_on_commit(enabled):
+    committed, rolled_back = uuid.uuid4().hex, uuid.uuid4().hex
+
+    with transaction.atomic():
+        token_cache.store(committed, 1, 2, 'read', expires())
+        assert token_cache.get(committed) is None
+    with raises(ValueError), transaction.atomic():
+        token_cache.store(rolled_back, 1, 2, 'read', expires())
+        raise ValueError
+
+    assert token_cache.get(committed) is not None
+    assert token_cache.get(rolled_back) is None
+
+
+def test_deleted_token_is_forgotten(enabled, user, application):
+    access = AccessToken.objects.create(
+        user=user, application=application, token=uuid.uuid4().hex, expires=expires()
+    )
+    token_cache.store(access.token, user.pk, application.pk, 'read', access.expires)
+
+    AccessToken.objects.filter(pk=access.pk).delete()
+
+    assert token_cache.get(access.token) is None
+
+
+def test_fill_caches_token(enabled, user, application):
+    access = AccessToken.objects.create(
+        user=user, application=application, token=uuid.uuid4().hex, expires=expires()
+    )
+
+    token_cache.fill(access)
+
+    assert token_cache.get(access.token).user_id == user.pk
+
+
+def test_fill_does_not_overwrite(enabled, user, application):
+    access = AccessToken.objects.create(
+        user=user,
+        application=application,
+        token=uuid.uuid4().hex,
+        scope='read',
+        expires=expires(),
+    )
+    token_cache.store(access.token, user.pk, application.pk, 'read write', access.expires)
+
+    token_cache.fill(access)
+
+    assert token_cache.get(access.token).scope == 'read write'
+
+
+def test_fill_of_token_revoked_after_read(enabled, user, application):
+    access = AccessToken.objects.create(
+        user=user, application=application, token=uuid.uuid4().hex, expires=expires()
+    )
+    # The token is revoked, and its record forgotten, before the fill.
+    AccessToken.objects.filter(pk=access.pk).delete()
+
+    token_cache.fill(access)
+
+    assert token_cache.get(access.token) is None
+
+
+def test_disabled(user):
+    token = uuid.uuid4().hex
+
+    token_cache.store(token, user.pk, 1, 'read', expires())
+
+    assert token_cache.get(token) is None
+
+
+def test_validator_caches_issued_token(enabled, user, application):
+    request = Request('/token', http_method='POST', body={'grant_type': 'password'})
+    request.user = user
+    request.client = application
+    request.scopes = ['read']
+    request.grant_type = 'password'
+    request.refresh_token = None
+    token = uuid.uuid4().hex
+
+    TokenCacheValidator().save_bearer_token(
+        {
+            'access_token': token,
+            'refresh_token': uuid.uuid4().hex,
+            'expires_in': 3600,
+            'scope': 'read',
+        },
+        request,
+    )
+
+    record = token_cache.get(token)
+    assert (record.user_id, record.application_id, record.scope) == (
+        user.pk,
+        application.pk,
+        'read',
+    )
+    assert abs((record.expires - expires()).total_seconds()) < 5
@@ -0,0 +1,97 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth.models import User
+from oauth2_provider.models import AccessToken, RefreshToken
+from oauthlib.common import Request
+from pytest import fixture
+
+from drf_social_oauth2 import token_cap
+from drf_social_oauth2.oauth2_validators import TokenCapValidator
+from drf_social_oauth2.token_cap import enforce, evict_tokens
+
+
+@fixture
+def owner():
+    return User.objects.create_user(username=f'owner-{uuid.uuid4().hex}')
+
+
+def issue(user, application, count):
+    tokens = []
+    for _ in range(count):
+        access = AccessToken.objects.create(
+            user=user,
+            application=application,
+            token=uuid.uuid4().hex,
+            expires=datetime.now(tz=timezone.utc) + timedelta(hours=1),
+        )
+        RefreshToken.objects.create(
+            user=user, application=application, token=uuid.uuid4().hex, access_token=access
+        )
+        tokens.append(access)
+    return tokens
+
+
+def remaining(user, application):
+    return list(
+        AccessToken.objects.filter(user=user, application=application).order_by('pk')
+    )
+
+
+def test_evict_keeps_newest(owner, application):
+    tokens = issue(owner, application, 5)
+
+    evict_tokens(owner, application, keep=2, batch=100)
+
+    assert remaining(owner, application) == tokens[3:]
+    assert RefreshToken.objects.filter(user=owner, application=application).count() == 2
+
+
+def test_evict_is_bounded_by_batch(owner, application):
+    tokens = issue(owner, application, 5)
+
+    assert evict_tokens(owner, application, keep=1, batch=2) > 0
+
+    assert remaining(owner, application) == tokens[2:]
+
+
+def test_revoked_refresh_tokens_are_kept(owner, application):
+    issue(owner, application, 3)
+    revoked = RefreshToken.objects.filter(user=owner).order_by('pk').first()
+    revoked.revoke()
+
+    evict_tokens(owner, application, keep=1, batch=100)
+
+    assert RefreshToken.objects.filter(pk=revoked.pk).exists()
+    assert RefreshToken.objects.filter(user=owner, revoked__isnull=True).count() == 1
+
+
+def test_enforce_without_cap(owner, application):
+    issue(owner, application, 3)
+
+    assert enforce(owner, application) == 0
+    assert len(remaining(owner, application)) == 3
+
+
+def test_validator_enforces_cap(mocker, owner, application):
+    mocker.patch.object(token_cap, 'DRFSO2_MAX_TOKENS_PER_USER', 2)
+    issue(owner, application, 2)
+    request = Request('/token', http_method='POST', body={'grant_type': 'password'})
+    request.user = owner
+    request.client = application
+    request.scopes = ['read']
+    request.grant_type = 'password'
+    request.refresh_token = None
+
+    TokenCapValidator().save_bearer_token(
+        {
+            'access_token': uuid.uuid4().hex,
+            'refresh_token': uuid.uuid4().hex,
+            'expires_in': 3600,
+            'scope': 'read',
+        },
+        request,
+    )
+
+    assert len(remaining(owner, application)) == 2
+    assert RefreshToken.objects.filter(user=owner, application=application).count() == 2
@@ -0,0 +1,100 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from oauth2_provider.models import Application, RefreshToken
+from oauth2_provider.settings import oauth2_settings
+from pytest import fixture
+
+from drf_social_oauth2.token_compaction import compact_refresh_tokens
+
+
+@fixture
+def chain_app(user):
+    return Application.objects.create(
+        user=user,
+        client_type='confidential',
+        authorization_grant_type='password',
+        name='chains',
+        client_id=uuid.uuid4().hex,
+    )
+
+
+def chain(user, application, revoked, family=None, minutes_ago=60):
+    """Create a rotated chain: ``revoked`` old tokens and the live one."""
+    family = family if family is not None else uuid.uuid4()
+    start = timezone.now() - timedelta(minutes=minutes_ago)
+    tokens = [
+        RefreshToken.objects.create(
+            user=user,
+            application=application,
+            token=uuid.uuid4().hex,
+            token_family=family,
+            revoked=start + timedelta(seconds=index),
+        )
+        for index in range(revoked)
+    ]
+    live = RefreshToken.objects.create(
+        user=user, application=application, token=uuid.uuid4().hex, token_family=family
+    )
+    return tokens, live
+
+
+def remaining(tokens):
+    return set(
+        RefreshToken.objects.filter(pk__in=[token.pk for token in tokens]).values_list(
+            'pk', flat=True
+        )
+    )
+
+
+def test_chain_is_compacted_to_its_tail(user, chain_app):
+    revoked, live = chain(user, chain_app, 10)
+
+    reclaimed = compact_refresh_tokens(tail=3, batch=100)
+
+    assert reclaimed[chain_app.pk] == 7
+    assert remaining(revoked + [live]) == {token.pk for token in revoked[-3:] + [live]}
+
+
+def test_compaction_in_batches(user, chain_app):
+    first, _ = chain(user, chain_app, 5)
+    second, _ = chain(user, chain_app, 5)
+
+    reclaimed = compact_refresh_tokens(tail=1, batch=3)
+
+    assert reclaimed[chain_app.pk] == 8
+    assert remaining(first + second) == {first[-1].pk, second[-1].pk}
+
+
+def test_short_chains_and_legacy_tokens_are_kept(user, chain_app):
+    short, live = chain(user, chain_app, 2)
+    legacy = RefreshToken.objects.create(
+        user=user,
+        application=chain_app,
+        token=uuid.uuid4().hex,
+        revoked=timezone.now() - timedelta(days=1),
+    )
+
+    compact_refresh_tokens(tail=2, batch=100)
+
+    assert remaining(short + [live, legacy]) == {t.pk for t in short + [live, legacy]}
+
+
+def test_tokens_in_grace_period_are_kept(mocker, user, chain_app):
+    mocker.patch.object(oauth2_settings, 'REFRESH_TOKEN_GRACE_PERIOD_SECONDS', 3600)
+    revoked, _ = chain(user, chain_app, 4, minutes_ago=1)
+
+    assert compact_refresh_tokens(tail=1, batch=100)[chain_app.pk] == 0
+    assert len(remaining(revoked)) == 4
+
+
+def test_command_reports_per_application(user, chain_app):
+    chain(user, chain_app, 4)
+    out = StringIO()
+
+    call_command('compact_refresh_tokens', '--tail', '1', stdout=out)
+
+    assert f'{chain_app.client_id}: 3 refresh tokens deleted' in out.getvalue()
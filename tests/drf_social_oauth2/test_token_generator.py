@@ -0,0 +1,38 @@
+import jwt
+from django.conf import settings
+from django.test import override_settings
+
+from drf_social_oauth2 import generate_fast_token, generate_token
+
+
+def decode(token, secret=None):
+    return jwt.decode(token, secret or settings.SECRET_KEY, algorithms=['HS256'])
+
+
+def test_generate_token():
+    assert len(decode(generate_token(None))['token']) == 30
+
+
+def test_generate_fast_token_is_a_valid_jwt():
+    token = generate_fast_token(None)
+
+    assert jwt.get_unverified_header(token) == {'alg': 'HS256', 'typ': 'JWT'}
+    assert len(decode(token)['token']) == 30
+
+
+def test_generate_fast_token_length():
+    for length in (1, 16, 30, 64):
+        assert len(decode(generate_fast_token(None, length=length))['token']) == length
+
+
+def test_generate_fast_token_is_unique():
+    tokens = {decode(generate_fast_token(None))['token'] for _ in range(1000)}
+    assert len(tokens) == 1000
+
+
+def test_generate_fast_token_follows_secret_key():
+    with override_settings(SECRET_KEY='another-secret-key'):
+        token = generate_fast_token(None)
+    assert decode(token, 'another-secret-key')
+
+    assert decode(generate_fast_token(None))
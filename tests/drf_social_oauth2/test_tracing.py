@@ -0,0 +1,97 @@
+from asgiref.sync import async_to_sync
+from pytest import fixture, importorskip, raises
+
+from drf_social_oauth2 import tracing
+from drf_social_oauth2.backends import GoogleIdentityBackend
+
+importorskip('opentelemetry.sdk')
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+
+@fixture(scope='function')
+def exporter(mocker):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    mocker.patch.object(tracing, 'tracer', provider.get_tracer('test'))
+    yield exporter
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+def test_disabled_tracing_is_free():
+    def function():
+        pass
+
+    assert tracing.tracer is None
+    assert tracing.traced('name')(function) is function
+    with tracing.span('name', backend='facebook'):
+        tracing.set_attributes(backend='facebook')
+    assert tracing.inject_headers({'Accept': 'json'}) == {'Accept': 'json'}
+
+
+def test_traced_outcome(exporter):
+    tracing.traced('ok')(lambda: Response(200))()
+    tracing.traced('error')(lambda: Response(400))()
+    tracing.traced('oauthlib')(lambda: ({}, '{}', 401))()
+
+    def fail():
+        raise ValueError('boom')
+
+    with raises(ValueError):
+        tracing.traced('raise')(fail)()
+
+    outcomes = {
+        span.name: span.attributes['drfso2.outcome'] for span in exporter.get_finished_spans()
+    }
+    assert outcomes == {'ok': 'ok', 'error': 'error', 'oauthlib': 'error', 'raise': 'ValueError'}
+
+
+def test_traced_coroutine(exporter):
+    @tracing.traced('async')
+    async def post():
+        with tracing.span('social.do_auth'):
+            pass
+        return Response(201)
+
+    assert async_to_sync(post)().status_code == 201
+
+    child, parent = exporter.get_finished_spans()
+    assert parent.name == 'async'
+    assert parent.attributes['drfso2.outcome'] == 'ok'
+    assert child.parent.span_id == parent.context.span_id
+
+
+def test_span_attributes(exporter):
+    @tracing.traced('ConvertTokenView.post')
+    def post():
+        tracing.set_attributes(backend='facebook', client_id='id')
+        with tracing.span('social.do_auth', backend='facebook'):
+            pass
+        return Response(200)
+
+    post()
+
+    do_auth, view = exporter.get_finished_spans()
+    assert do_auth.parent.span_id == view.context.span_id
+    assert do_auth.attributes['drfso2.backend'] == 'facebook'
+    assert view.attributes['drfso2.client_id'] == 'id'
+    assert view.attributes['http.response.status_code'] == 200
+
+
+def test_provider_request_propagates_context(mocker, exporter):
+    get_json = mocker.patch.object(GoogleIdentityBackend, 'get_json', return_value={})
+    backend = GoogleIdentityBackend(strategy=mocker.Mock())
+
+    backend.user_data('id-token')
+
+    (span,) = exporter.get_finished_spans()
+    traceparent = get_json.call_args.kwargs['headers']['traceparent']
+    assert span.name == 'social.user_data'
+    assert format(span.context.trace_id, '032x') in traceparent
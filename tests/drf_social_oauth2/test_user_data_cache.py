@@ -0,0 +1,94 @@
+import json
+from uuid import uuid4
+
+from drf_social_oauth2 import user_data_cache
+from drf_social_oauth2.user_data_cache import UserDataCache, cache_key, get_ttl
+
+
+class FakeBackend:
+    name = 'google-identity'
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    def user_data(self, access_token, *args, **kwargs):
+        self.calls += 1
+        return self.response
+
+
+def token():
+    # A unique token keeps the entries of the shared cache apart between tests.
+    return f'token-{uuid4()}'
+
+
+def test_cache_key_hides_token():
+    key = cache_key('google-identity', 'secret-token')
+
+    assert 'secret-token' not in key
+    assert key != cache_key('linkedin-openidconnect', 'secret-token')
+
+
+def test_ttl_bounded_by_expiry():
+    assert get_ttl({}, now=0) == user_data_cache.DRFSO2_USER_DATA_CACHE_SECONDS
+    assert get_ttl({'exp': '100'}, now=40) == 60
+    assert get_ttl({'expires_in': 30}) == 30
+    assert get_ttl({'exp': 10}, now=40) == 0
+    assert get_ttl({'exp': 'never'}) == 0
+
+
+def test_encrypted_at_rest():
+    cache = UserDataCache(encrypt=True)
+    access_token = token()
+
+    cache.set('google-identity', access_token, {'email': 'test@email.com'})
+
+    stored = cache.cache.get(cache_key('google-identity', access_token))
+    assert b'test@email.com' not in stored
+    assert cache.get('google-identity', access_token) == {'email': 'test@email.com'}
+
+
+def test_plain_values():
+    cache = UserDataCache(encrypt=False)
+    access_token = token()
+
+    cache.set('google-identity', access_token, {'email': 'test@email.com'})
+
+    assert cache.cache.get(cache_key('google-identity', access_token)) == {
+        'email': 'test@email.com'
+    }
+
+
+def test_undecryptable_value_is_a_miss():
+    cache = UserDataCache(encrypt=True)
+    access_token = token()
+    cache.cache.set(cache_key('google-identity', access_token), json.dumps({}).encode())
+
+    assert cache.get('google-identity', access_token) is None
+
+
+def test_expired_response_is_not_cached():
+    cache = UserDataCache()
+    access_token = token()
+
+    cache.set('google-identity', access_token, {'expires_in': 0})
+
+    assert cache.get('google-identity', access_token) is None
+
+
+def test_cached_user_data(mocker):
+    mocker.patch.object(user_data_cache, 'DRFSO2_USER_DATA_CACHE_ENABLED', True)
+    backend = FakeBackend({'email': 'test@email.com'})
+    user_data = user_data_cache.cached(FakeBackend.user_data)
+    access_token = token()
+
+    assert user_data(backend, access_token) == {'email': 'test@email.com'}
+    assert user_data(backend, access_token) == {'email': 'test@email.com'}
+    assert backend.calls == 1
+
+    user_data(backend, token())
+    assert backend.calls == 2
+
+
+def test_disabled_cache_is_noop():
+    assert user_data_cache.cached(FakeBackend.user_data) is FakeBackend.user_data
@@ -2,12 +2,16 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from unittest.mock import PropertyMock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from oauth2_provider.models import AccessToken, RefreshToken
 from pytest import fixture
+from rest_framework.serializers import CharField, EmailField, IntegerField, Serializer
 from rest_framework.test import APIClient
 
-from drf_social_oauth2.views import get_application
+from drf_social_oauth2 import serializers
+from drf_social_oauth2.views import ConvertTokenView, get_application
 from tests.conftest import save
 
 
@@ -297,3 +301,79 @@ def test_invalidate_sessions_endpoint_invalid_application(
     )
 
     assert response.status_code == 400
+
+
+class IdSerializer(Serializer):
+    id = IntegerField(read_only=True)
+    email = EmailField(read_only=True)
+
+
+class FullNameSerializer(Serializer):
+    full_name = CharField(source='get_full_name', read_only=True)
+
+
+@fixture
+def user_serializer(mocker):
+    def configure(value):
+        mocker.patch.object(serializers, 'DRFSO2_USER_SERIALIZER', value)
+        serializers.get_user_serializer_class.cache_clear()
+        serializers.get_user_fields.cache_clear()
+
+    yield configure
+    serializers.get_user_serializer_class.cache_clear()
+    serializers.get_user_fields.cache_clear()
+
+
+@fixture
+def access_token(user, application):
+    return AccessToken.objects.create(
+        user=user, application=application, token=generate_token(), expires=get_expires()
+    )
+
+
+def test_prepare_response_loads_only_serialized_columns(access_token):
+    with CaptureQueriesContext(connection) as queries:
+        data = ConvertTokenView().prepare_response({'access_token': access_token.token})
+
+    assert len(queries) == 1
+    assert 'password' not in queries[0]['sql']
+    assert data['user'] == {'email': 'test@email.com', 'first_name': '', 'last_name': ''}
+
+
+def test_prepare_response_uses_loaded_user(user):
+    with CaptureQueriesContext(connection) as queries:
+        data = ConvertTokenView().prepare_response({'access_token': 'token'}, user)
+
+    assert len(queries) == 0
+    assert data['user']['email'] == 'test@email.com'
+
+
+def test_prepare_response_custom_serializer(user_serializer, access_token):
+    user_serializer('tests.drf_social_oauth2.test_views.IdSerializer')
+
+    data = ConvertTokenView().prepare_response({'access_token': access_token.token})
+
+    assert data['user'] == {'id': access_token.user.pk, 'email': 'test@email.com'}
+
+
+def test_prepare_response_full_row_for_computed_fields(user_serializer, access_token):
+    user_serializer(FullNameSerializer)
+
+    assert serializers.get_user_fields() is None
+    data = ConvertTokenView().prepare_response({'access_token': access_token.token})
+
+    assert data['user'] == {'full_name': ''}
+
+
+def test_prepare_response_without_payload(user_serializer, access_token):
+    user_serializer(None)
+
+    data = ConvertTokenView().prepare_response({'access_token': access_token.token})
+
+    assert 'user' not in data
+
+
+def test_prepare_response_error(user):
+    assert ConvertTokenView().prepare_response({'error': 'invalid_grant'}, user) == {
+        'error': 'invalid_grant'
+    }